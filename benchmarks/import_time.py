@@ -0,0 +1,90 @@
+"""
+Startup benchmark: measure the time taken to import `formulaic` (and use the
+form-validation names) via `python -X importtime` (Python 3.7+), and guard
+against the persistence back-ends (or other costly modules) creeping back
+into that path.
+
+Usage:
+    python benchmarks/import_time.py [--runs N] [--max-ms MS]
+
+Exits non-zero if a guarded module is imported or (if `--max-ms` is given)
+the best cumulative import time exceeds `MS` milliseconds.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+
+# importing `Model`/`Attribute(s)` must not import any of these
+GUARDED_MODULES = (
+    'concurrent.futures',
+    'multiprocessing',
+    'six',
+    'sqlite3',
+)
+
+STATEMENT = 'import formulaic; formulaic.Model; formulaic.StringAttribute'
+
+
+def measure():
+    """
+    Import `formulaic` in a fresh interpreter
+
+    Returns:
+        tuple: a `(total-microseconds, imported-modules)` tuple, the modules
+            are `(cumulative-microseconds, name)` tuples
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    environ = dict(os.environ, PYTHONPATH=root)
+    output = subprocess.check_output(
+        [sys.executable, '-X', 'importtime', '-c', STATEMENT],
+        stderr=subprocess.STDOUT,
+        env=environ,
+    ).decode('utf-8')
+    modules = []
+    total = 0
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        indent = len(name) - len(name.lstrip())
+        name = name.strip()
+        modules.append((int(cumulative), name))
+        # the submodules are imported lazily (after `formulaic` itself), as
+        # such every top-level `formulaic` entry counts toward the total
+        if indent == 1 and name.split('.')[0] == 'formulaic':
+            total += int(cumulative)
+    return (total, modules)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split(
+        '\n\n')[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-ms', type=float, default=None)
+    args = parser.parse_args()
+    if sys.version_info < (3, 7):
+        sys.exit('-X importtime requires Python 3.7+')
+    results = [measure() for _ in range(args.runs)]
+    totals = sorted(total for total, _ in results)
+    _, modules = results[-1]
+    print('import formulaic: best {:.2f} ms, median {:.2f} ms ({} runs)'.format(
+        totals[0] / 1000.0, totals[len(totals) // 2] / 1000.0, args.runs))
+    for cumulative, name in sorted(modules, reverse=True)[:10]:
+        print('  {:>10.2f} ms  {}'.format(cumulative / 1000.0, name))
+    failed = False
+    names = set(name for _, name in modules)
+    for name in GUARDED_MODULES:
+        if name in names:
+            print('FAIL: {} was imported'.format(name))
+            failed = True
+    if args.max_ms is not None and totals[0] / 1000.0 > args.max_ms:
+        print('FAIL: {:.2f} ms exceeds {:.2f} ms'.format(totals[0] / 1000.0,
+            args.max_ms))
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,23 +1,96 @@
 __version__ = '0.0.1.dev1'
 
 
-from formulaic.attributes import (
-    Attribute,
-    BooleanAttribute,
-    FloatAttribute,
-    IntegerAttribute,
-    LongAttribute,
-    StringAttribute,
-    TextAttribute,
-    UUIDAttribute,
-)
-from formulaic.formatters import Formatter
-from formulaic.models import Model
-from formulaic.persistors import (
-    Persistor,
-    SQLPersistor,
-    SQLitePersistor,
-)
-from formulaic.triggers import Trigger
-from formulaic.types import Type
-from formulaic.validators import Validator
+import sys
+
+
+# the public names and the submodules which define them, a submodule is only
+# imported when one of its names is first accessed (see: `__getattr__`)
+_EXPORTS = {
+    'Attribute': 'formulaic.attributes',
+    'BooleanAttribute': 'formulaic.attributes',
+    'DictionaryAttribute': 'formulaic.attributes',
+    'FloatAttribute': 'formulaic.attributes',
+    'IntegerAttribute': 'formulaic.attributes',
+    'LazyModel': 'formulaic.attributes',
+    'LazyModelList': 'formulaic.attributes',
+    'LongAttribute': 'formulaic.attributes',
+    'ModelAttribute': 'formulaic.attributes',
+    'ModelListAttribute': 'formulaic.attributes',
+    'StringAttribute': 'formulaic.attributes',
+    'TextAttribute': 'formulaic.attributes',
+    'UUIDAttribute': 'formulaic.attributes',
+    'ColumnarFile': 'formulaic.columnar',
+    'ColumnarRow': 'formulaic.columnar',
+    'BinaryCodec': 'formulaic.columns',
+    'Codec': 'formulaic.columns',
+    'Deferred': 'formulaic.columns',
+    'JSONCodec': 'formulaic.columns',
+    'Unloaded': 'formulaic.columns',
+    'Constraint': 'formulaic.constraints',
+    'INVALID': 'formulaic.errors',
+    'FieldError': 'formulaic.errors',
+    'FormatError': 'formulaic.errors',
+    'TriggerError': 'formulaic.errors',
+    'ValidationError': 'formulaic.errors',
+    'Formatter': 'formulaic.formatters',
+    'FileJournal': 'formulaic.journals',
+    'Journal': 'formulaic.journals',
+    'Model': 'formulaic.models',
+    'FormParser': 'formulaic.parsers',
+    'MultipartFormParser': 'formulaic.parsers',
+    'URLEncodedFormParser': 'formulaic.parsers',
+    'Pipeline': 'formulaic.pipelines',
+    'PipelineStats': 'formulaic.pipelines',
+    'CachingPersistor': 'formulaic.persistors',
+    'Persistor': 'formulaic.persistors',
+    'SQLPersistor': 'formulaic.persistors',
+    'SQLitePersistor': 'formulaic.persistors',
+    'ShardedSQLitePersistor': 'formulaic.persistors',
+    'Session': 'formulaic.sessions',
+    'SessionStats': 'formulaic.sessions',
+    'Trigger': 'formulaic.triggers',
+    'FrozenList': 'formulaic.types',
+    'InternPool': 'formulaic.types',
+    'Type': 'formulaic.types',
+    'Validator': 'formulaic.validators',
+    'WriterPersistor': 'formulaic.writers',
+    'WriterProcess': 'formulaic.writers',
+}
+
+__all__ = tuple(sorted(_EXPORTS))
+
+
+def __getattr__(name):
+    """
+    Import the submodule which defines the public `name` (on first access)
+
+    Args:
+        name (str): the name
+
+    Returns:
+        mixed: the value
+
+    Raises:
+        AttributeError: if the name is not public
+    """
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(
+            __name__, name))
+    __import__(module_name)
+    value = getattr(sys.modules[module_name], name)
+    # subsequent accesses do not go through `__getattr__`
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
+
+# module `__getattr__` (PEP 562) is not supported prior to Python 3.7
+if sys.version_info < (3, 7):
+    for _name in _EXPORTS:
+        __getattr__(_name)
+    del _name
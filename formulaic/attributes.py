@@ -1,17 +1,24 @@
 __all__ = (
     'Attribute',
     'BooleanAttribute',
+    'DictionaryAttribute',
     'FloatAttribute',
     'IntegerAttribute',
+    'LazyModel',
+    'LazyModelList',
     'LongAttribute',
+    'ModelAttribute',
+    'ModelListAttribute',
     'StringAttribute',
     'TextAttribute',
     'UUIDAttribute',
 )
 
 
+from .columns import Deferred
+from .errors import INVALID, FormatError
 from .formatters import Formatter
-from .types import Type
+from .types import FrozenList, InternPool, Type
 from .validators import Validator
 
 
@@ -20,14 +27,40 @@ class Attribute(object):
     Class representing an "Attribute" of a "Model"
 
     Instance Attributes:
+        codec (Codec): the `Codec` used to encode the value to a column-value
+            (if the `Persistor` was provided the `attribute_metadata`). `list`
+            and `dict` values are encoded as JSON if it is not provided
+        constant_default (bool): if the `default` value is a constant (it was
+            not provided as a callable), in which case it may be shared
         default (mixed): default value for the `Attribute`
+        fingerprint (bool): if changes should be detected by comparing value
+            fingerprints (length and hash, which are cached for `text` and
+            frozen `list` values) before falling back to a full comparison.
+            `list` values are stored as (immutable) `FrozenList(s)` so that
+            their fingerprint stays valid. Two values with a different
+            fingerprint are changed, two values with the same fingerprint are
+            compared in full
         formatter (callable): formatter method for the `Attribute`. This is
             called when setting the `Attribute` value via on the `Model`. If the
             `Attribute` expects a `list` value this method will be mapped to
             each item
+        index (bool): if the `Attribute` should be indexed when the schema is
+            generated by a `Persistor`
+        intern_pool (InternPool): the pool through which the formatted values
+            are de-duplicated (`None` unless `low_cardinality` was provided).
+            Intended for `str[ing]`/`text` values drawn from a small set (e.g.
+            a status or a country-code), every `Model` then shares a single
+            instance of each value. `low_cardinality` may be `True` or the
+            maximum number of pooled values
         required (bool): if the `Attribute` is required
+        try_formatter (callable): the non-raising counterpart of the
+            `formatter` (used by `try_format`), it should return `INVALID` if
+            the value could not be formatted. If it is not provided the
+            `formatter` is called and an error is mapped to `INVALID`
         type: the type of the `Attribute`. This value should be one of the
             constants from `Type`
+        unique (bool): if the `Attribute` should be uniquely indexed when the
+            schema is generated by a `Persistor`
         validator (callable): validator method for the `Attribute`. This is
             called by the `validate` method on the `Model` and should return
             `True` or `False` depending on the validity of the provided `value`.
@@ -35,13 +68,29 @@ class Attribute(object):
             mapped to each item
     """
     def __init__(self, **kwargs):
+        self.codec = kwargs.get('codec')
         default = kwargs.get('default')
+        self.constant_default = not callable(default)
         self.default = default if callable(default) else lambda: default
+        self.fingerprint = kwargs.get('fingerprint') or False
         formatter = kwargs.get('formatter')
         self.formatter = formatter if callable(formatter) else lambda value: \
             value
+        self._identity_formatter = not callable(formatter)
+        self.index = kwargs.get('index') or False
+        low_cardinality = kwargs.get('low_cardinality')
+        if not low_cardinality:
+            self.intern_pool = None
+        elif low_cardinality is True:
+            self.intern_pool = InternPool()
+        else:
+            self.intern_pool = InternPool(max_size=low_cardinality)
         self.required = kwargs.get('required') or False
+        try_formatter = kwargs.get('try_formatter')
+        self.try_formatter = try_formatter if callable(try_formatter) else \
+            self._try_formatter
         self.type = kwargs.get('type')
+        self.unique = kwargs.get('unique') or False
         validator = kwargs.get('validator')
         self.validator = validator if callable(validator) else lambda value: \
             True
@@ -55,17 +104,84 @@ class Attribute(object):
 
         Returns:
             mixed: the formatted [attribute-]value (or `None` if the specified
-                `value` was `None`)
+                `value` was `None`). A `Deferred` (not yet decoded) value is
+                returned as-is, it is formatted once it is decoded. The
+                formatted value is pooled if there is an `intern_pool`
 
         Raises:
             ValueError: if the specified `value` could not be formatted
         """
-        if value is None:
-            return None
+        if value is None or isinstance(value, Deferred):
+            return value
         if self.type == Type.LIST and isinstance(value, Type.LIST):
-            return list(map(self.formatter, value))
+            if not self.fingerprint:
+                return list(map(self.formatter, value))
+            if self._identity_formatter and isinstance(value, FrozenList):
+                return value
+            return FrozenList(map(self.formatter, value))
+        if self.intern_pool is not None:
+            return self.intern_pool.intern(self.formatter(value))
         return self.formatter(value)
 
+    def changed(
+        self,
+        old_value,
+        new_value
+    ):
+        """
+        Determine if the specified `new_value` differs from the specified
+        `old_value` (identical values are never compared)
+
+        Args:
+            old_value (mixed): the old [attribute-]value
+            new_value (mixed): the new [attribute-]value
+
+        Returns:
+            bool: the result
+        """
+        if new_value is old_value:
+            return False
+        if self.fingerprint:
+            old_fingerprint = self._fingerprint(old_value)
+            if old_fingerprint is not None:
+                new_fingerprint = self._fingerprint(new_value)
+                # a different fingerprint proves a change, an equal one may
+                # be a (hash) collision and is confirmed by a full comparison
+                if new_fingerprint is not None and \
+                    new_fingerprint != old_fingerprint:
+                    return True
+        return new_value != old_value
+
+    def try_format(self, value):
+        """
+        Format the specified `value` based on the `Attribute` configuration,
+        without raising if it could not be formatted
+
+        Args:
+            value (mixed): the [attribute-]value
+
+        Returns:
+            mixed: the formatted [attribute-]value (or `None` if the specified
+                `value` was `None`), or `INVALID` if the specified `value` could
+                not be formatted. A subclass which overrides `format` should
+                override this method too
+        """
+        if value is None or isinstance(value, Deferred):
+            return value
+        try_formatter = self.try_formatter
+        if self.type == Type.LIST and isinstance(value, Type.LIST):
+            if self.fingerprint and self._identity_formatter and \
+                isinstance(value, FrozenList):
+                return value
+            items = list(map(try_formatter, value))
+            if any(item is INVALID for item in items):
+                return INVALID
+            return FrozenList(items) if self.fingerprint else items
+        value = try_formatter(value)
+        if value is INVALID or self.intern_pool is None:
+            return value
+        return self.intern_pool.intern(value)
+
     def validate(self, value):
         """
         Validate the specified `value` based on the `Attribute` configuration
@@ -74,8 +190,11 @@ class Attribute(object):
             value (mixed): the [attribute-]value
 
         Returns:
-            bool: the result
+            bool: the result (a `Deferred` value is validated once it is
+                decoded)
         """
+        if isinstance(value, Deferred):
+            return True
         if self.required and not value:
             return False
         if not value:
@@ -84,6 +203,38 @@ class Attribute(object):
             return all(map(self.validator, value))
         return self.validator(value)
 
+    def _fingerprint(self, value):
+        """
+        Compute the fingerprint (length and hash) of the specified `value`
+
+        Args:
+            value (mixed): the [attribute-]value
+
+        Returns:
+            tuple: the fingerprint, or `None` if the `value` has no length or
+                is not hashable
+        """
+        try:
+            return (len(value), hash(value))
+        except TypeError:
+            return None
+
+    def _try_formatter(self, value):
+        """
+        Format the specified `value` with the `formatter`, mapping an error to
+        `INVALID` (the default `try_formatter`)
+
+        Args:
+            value (mixed): the [attribute-]value
+
+        Returns:
+            mixed: the formatted [attribute-]value, or `INVALID`
+        """
+        try:
+            return self.formatter(value)
+        except Exception:
+            return INVALID
+
 
 class BooleanAttribute(Attribute):
     """
@@ -102,6 +253,24 @@ class BooleanAttribute(Attribute):
         )
 
 
+class DictionaryAttribute(Attribute):
+    """
+    Class representing a "[Dictionary]Attribute" of a "Model." This class
+    extends the `Attribute` class and applies the default configuration for
+    `formatter`, `type` and `validator`
+    """
+    def __init__(self, **kwargs):
+        super(DictionaryAttribute, self).__init__(
+            **dict(
+                kwargs,
+                formatter=Formatter.dictionary,
+                try_formatter=Formatter.try_dictionary,
+                type=Type.DICTIONARY,
+                validator=Validator.dictionary,
+            )
+        )
+
+
 class FloatAttribute(Attribute):
     """
     Class representing a "[Float]Attribute" of a "Model." This class extends the
@@ -113,6 +282,7 @@ class FloatAttribute(Attribute):
             **dict(
                 kwargs,
                 formatter=Formatter.float,
+                try_formatter=Formatter.try_float,
                 type=Type.FLOAT,
                 validator=Validator.float,
             )
@@ -130,6 +300,7 @@ class IntegerAttribute(Attribute):
             **dict(
                 kwargs,
                 formatter=Formatter.integer,
+                try_formatter=Formatter.try_integer,
                 type=Type.INTEGER,
                 validator=Validator.integer,
             )
@@ -147,12 +318,179 @@ class LongAttribute(Attribute):
             **dict(
                 kwargs,
                 formatter=Formatter.long,
+                try_formatter=Formatter.try_long,
                 type=Type.LONG,
                 validator=Validator.long,
             )
         )
 
 
+class ModelAttribute(Attribute):
+    """
+    Class representing a "[Model]Attribute" of a "Model" (a nested "Model").
+    The raw (`dict`) value is kept as-is and the child `Model` is only built
+    (formatted and validated) when it is first read, as such a child which is
+    never read costs nothing. `validate` only recurses into a child which has
+    been built (`Model.validate` builds a changed child first)
+
+    Instance Attributes:
+        model_class (type): the `Model` class of the child
+    """
+    def __init__(
+        self,
+        model_class,
+        **kwargs
+    ):
+        super(ModelAttribute, self).__init__(
+            **dict(
+                kwargs,
+                type=Type.DICTIONARY,
+            )
+        )
+        self.model_class = model_class
+
+    def format(self, value):
+        """
+        Wrap the specified `value` (a raw `dict` or a `Model` instance) in a
+        `LazyModel`
+
+        Args:
+            value (mixed): the [attribute-]value
+
+        Returns:
+            LazyModel: the `LazyModel` (or `None` if the specified `value` was
+                `None`)
+
+        Raises:
+            FormatError: if the specified `value` could not be formatted
+        """
+        result = self.try_format(value)
+        if result is INVALID:
+            raise FormatError('Could not convert: {} to a {} value', value,
+                self.model_class.__name__)
+        return result
+
+    def try_format(self, value):
+        """
+        Wrap the specified `value` (a raw `dict` or a `Model` instance) in a
+        `LazyModel`, without raising if it could not be formatted
+
+        Args:
+            value (mixed): the [attribute-]value
+
+        Returns:
+            LazyModel: the `LazyModel` (or `None` if the specified `value` was
+                `None`), or `INVALID` if the specified `value` could not be
+                formatted
+        """
+        if value is None or isinstance(value, (Deferred, LazyModel)):
+            return value
+        if isinstance(value, (dict, self.model_class)):
+            return LazyModel(self.model_class, value)
+        return INVALID
+
+    def validate(self, value):
+        """
+        Validate the specified `value`, recursing into the child `Model` only
+        if it has been built
+
+        Args:
+            value (LazyModel): the [attribute-]value
+
+        Returns:
+            bool: the result
+        """
+        if not super(ModelAttribute, self).validate(value):
+            return False
+        return value is None or isinstance(value, Deferred) or all(
+            model.validate() for model in value.materialized)
+
+
+class ModelListAttribute(Attribute):
+    """
+    Class representing a "[ModelList]Attribute" of a "Model" (a `list` of
+    nested "Model(s)"). The raw (`dict`) items are kept as-is and each child
+    `Model` is only built (formatted and validated) when it is first read, as
+    such the cost is proportional to the number of children read. `validate`
+    only recurses into the children which have been built (`Model.validate`
+    builds the children of a changed value first)
+
+    Instance Attributes:
+        model_class (type): the `Model` class of the children
+    """
+    def __init__(
+        self,
+        model_class,
+        **kwargs
+    ):
+        super(ModelListAttribute, self).__init__(
+            **dict(
+                kwargs,
+                type=Type.LIST,
+            )
+        )
+        self.model_class = model_class
+
+    def format(self, value):
+        """
+        Wrap the specified `value` (a `list` of raw `dict(s)` and/or `Model`
+        instances) in a `LazyModelList`
+
+        Args:
+            value (mixed): the [attribute-]value
+
+        Returns:
+            LazyModelList: the `LazyModelList` (or `None` if the specified
+                `value` was `None`)
+
+        Raises:
+            FormatError: if the specified `value` could not be formatted
+        """
+        result = self.try_format(value)
+        if result is INVALID:
+            raise FormatError('Could not convert: {} to a list of {} values',
+                value, self.model_class.__name__)
+        return result
+
+    def try_format(self, value):
+        """
+        Wrap the specified `value` (a `list` of raw `dict(s)` and/or `Model`
+        instances) in a `LazyModelList`, without raising if it could not be
+        formatted
+
+        Args:
+            value (mixed): the [attribute-]value
+
+        Returns:
+            LazyModelList: the `LazyModelList` (or `None` if the specified
+                `value` was `None`), or `INVALID` if the specified `value` could
+                not be formatted
+        """
+        if value is None or isinstance(value, (Deferred, LazyModelList)):
+            return value
+        if isinstance(value, (list, tuple)) and all(
+            isinstance(item, (dict, self.model_class)) for item in value
+        ):
+            return LazyModelList(self.model_class, value)
+        return INVALID
+
+    def validate(self, value):
+        """
+        Validate the specified `value`, recursing only into the child `Model(s)`
+        which have been built
+
+        Args:
+            value (LazyModelList): the [attribute-]value
+
+        Returns:
+            bool: the result
+        """
+        if not super(ModelListAttribute, self).validate(value):
+            return False
+        return value is None or isinstance(value, Deferred) or all(
+            model.validate() for model in value.materialized)
+
+
 class StringAttribute(Attribute):
     """
     Class representing a "[String]Attribute" of a "Model." This class extends
@@ -202,3 +540,265 @@ class UUIDAttribute(Attribute):
                 validator=Validator.uuid,
             )
         )
+
+
+class LazyModel(object):
+    """
+    Class representing a (single) nested `Model` which is built from its raw
+    `dict` on first access (see: `ModelAttribute`). A change to the built
+    child is reported to the `owner`, which records the attribute as changed
+
+    Instance Attributes:
+        model (lazy-Model, stored as `_model`): the child `Model` instance
+        model_class (type): the `Model` class of the child
+        owner (tuple): the `(model, attribute_name)` of the parent `Model` (set
+            when the child is read from it, `None` until then)
+        raw (dict): the raw `dict` (`None` if a `Model` instance was provided)
+    """
+    __slots__ = ('_model', 'model_class', 'owner', 'raw')
+
+    def __init__(
+        self,
+        model_class,
+        value
+    ):
+        self.model_class = model_class
+        self.owner = None
+        if isinstance(value, dict):
+            self.raw = value
+        else:
+            self.raw = None
+            self._model = _attach(value, self)
+
+    @property
+    def materialized(self):
+        """
+        Get the child `Model` if it has been built
+
+        Returns:
+            tuple (of Model): the built child `Model` (empty if it has not been
+                built)
+        """
+        model = getattr(self, '_model', None)
+        return (model,) if model is not None else ()
+
+    @property
+    def model(self):
+        """
+        Lazy-build and return the child `Model` instance
+
+        Returns:
+            Model: the child `Model` instance
+
+        Raises:
+            ValueError: if any `attribute_value` could not be formatted or is
+                invalid
+        """
+        model = getattr(self, '_model', None)
+        if model is None:
+            model = self._model = _attach(self.model_class(self.raw), self)
+        return model
+
+    def build(self):
+        """
+        Build the child `Model` (if it has not been built) without raising
+
+        Returns:
+            bool: `False` if the raw `dict` could not be formatted or is
+                invalid (the child is then left unbuilt)
+        """
+        if getattr(self, '_model', None) is None:
+            model, errors = self.model_class.try_build(self.raw)
+            if errors:
+                return False
+            self._model = _attach(model, self)
+        return True
+
+    def copy(self, read_only=False):
+        """
+        Create a detached copy (the built child is copied, see: `Model.clone`
+        and `Model.snapshot`)
+
+        Args:
+            read_only (bool): if the child should be copied as a read-only
+                snapshot
+
+        Returns:
+            LazyModel: the copy
+        """
+        model = getattr(self, '_model', None)
+        return type(self)(self.model_class, model._copy(read_only) if model is
+            not None else self.raw)
+
+    def to_raw(self):
+        """
+        Convert the child back to a raw `dict` (the raw `dict` is returned as-is
+        if the child has not been built)
+
+        Returns:
+            dict: the raw `dict`
+        """
+        model = getattr(self, '_model', None)
+        if model is None:
+            return self.raw
+        return _to_raw(model)
+
+    def __reduce__(self):
+        model = getattr(self, '_model', None)
+        return (type(self), (self.model_class, model if model is not None else
+            self.raw))
+
+    def __repr__(self):
+        return '{}({}, {})'.format(type(self).__name__,
+            self.model_class.__name__,
+            'built' if self.materialized else 'raw')
+
+
+class LazyModelList(object):
+    """
+    Class representing a `list` of nested `Model(s)`, each of which is built
+    from its raw `dict` on first access (see: `ModelListAttribute`). Indexing
+    and iteration return `Model` instances. A change to a built child is
+    reported to the `owner`, which records the attribute as changed
+
+    Instance Attributes:
+        model_class (type): the `Model` class of the children
+        owner (tuple): the `(model, attribute_name)` of the parent `Model` (set
+            when the children are read from it, `None` until then)
+    """
+    __slots__ = ('_items', 'model_class', 'owner')
+
+    def __init__(
+        self,
+        model_class,
+        items
+    ):
+        self.model_class = model_class
+        self.owner = None
+        self._items = [
+            item if isinstance(item, dict) else _attach(item, self)
+            for item in items
+        ]
+
+    @property
+    def materialized(self):
+        """
+        Get the child `Model(s)` which have been built
+
+        Returns:
+            list (of Model): the built child `Model(s)`, in order
+        """
+        model_class = self.model_class
+        return [item for item in self._items if isinstance(item, model_class)]
+
+    def build(self):
+        """
+        Build the child `Model(s)` which have not been built without raising
+
+        Returns:
+            bool: `False` if the raw `dict` of a child could not be formatted
+                or is invalid (that child, and those after it, are then left
+                unbuilt)
+        """
+        items = self._items
+        for index, item in enumerate(items):
+            if isinstance(item, dict):
+                model, errors = self.model_class.try_build(item)
+                if errors:
+                    return False
+                items[index] = _attach(model, self)
+        return True
+
+    def copy(self, read_only=False):
+        """
+        Create a detached copy (the built children are copied, see:
+        `Model.clone` and `Model.snapshot`)
+
+        Args:
+            read_only (bool): if the children should be copied as read-only
+                snapshots
+
+        Returns:
+            LazyModelList: the copy
+        """
+        return type(self)(self.model_class, [
+            item if isinstance(item, dict) else item._copy(read_only)
+            for item in self._items
+        ])
+
+    def to_raw(self):
+        """
+        Convert the children back to raw `dict(s)` (the raw `dict` of a child
+        which has not been built is returned as-is)
+
+        Returns:
+            list (of dict): the raw `dict(s)`
+        """
+        return [
+            item if isinstance(item, dict) else _to_raw(item)
+            for item in self._items
+        ]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [
+                self[index]
+                for index in range(*index.indices(len(self._items)))
+            ]
+        item = self._items[index]
+        if isinstance(item, dict):
+            item = self._items[index] = _attach(self.model_class(item), self)
+        return item
+
+    def __iter__(self):
+        for index in range(len(self._items)):
+            yield self[index]
+
+    def __len__(self):
+        return len(self._items)
+
+    def __reduce__(self):
+        return (type(self), (self.model_class, self._items))
+
+    def __repr__(self):
+        return '{}({}, {} items, {} built)'.format(type(self).__name__,
+            self.model_class.__name__, len(self._items),
+            len(self.materialized))
+
+
+def _attach(
+    model,
+    container
+):
+    """
+    Attach the specified (child) `model` to the specified `container`, its
+    changes are then reported to the `owner` of the `container`
+
+    Args:
+        model (Model): the child `Model` instance
+        container (mixed): the `LazyModel` or `LazyModelList` instance
+
+    Returns:
+        Model: the specified `model`
+    """
+    model.__dict__['_container'] = container
+    return model
+
+
+def _to_raw(model):
+    """
+    Convert the specified (child) `Model` to a raw `dict`, recursing into its
+    own nested `Model(s)`
+
+    Args:
+        model (Model): the `Model` instance
+
+    Returns:
+        dict: the raw `dict`
+    """
+    return {
+        attribute_name: attribute_value.to_raw() if isinstance(attribute_value,
+            (LazyModel, LazyModelList)) else attribute_value
+        for attribute_name, attribute_value in
+            model.merged_attribute_data.items()
+    }
@@ -0,0 +1,466 @@
+__all__ = (
+    'ColumnarFile',
+    'ColumnarRow',
+)
+
+
+import mmap
+import os
+import struct
+
+from .attributes import LazyModel, LazyModelList
+from .columns import Deferred
+from .models import _restore
+from .types import Type, text_type
+
+
+_MAGIC = b'FORMCOL1'
+
+# the fixed-width column kinds (key: kind) and the variable-width ones
+_FIXED_WIDTH = {
+    'bool': struct.Struct('<?'),
+    'float64': struct.Struct('<d'),
+    'int64': struct.Struct('<q'),
+}
+_VARIABLE_WIDTH = ('json', 'string')
+
+_BYTE = struct.Struct('<B')
+_LENGTH = struct.Struct('<Q')
+_SPAN = struct.Struct('<QQ')
+
+
+def _align(offset):
+    """
+    Round the specified `offset` up to the next multiple of 8
+
+    Args:
+        offset (int): the offset
+
+    Returns:
+        int: the aligned offset
+    """
+    return (offset + 7) & ~7
+
+
+def _column_kind(attribute):
+    """
+    Determine the column kind of the specified `attribute`
+
+    Args:
+        attribute (Attribute): the `Attribute` instance
+
+    Returns:
+        str: the column kind
+    """
+    if attribute.type == Type.BOOLEAN:
+        return 'bool'
+    if attribute.type in (Type.INTEGER, Type.LONG):
+        return 'int64'
+    if attribute.type == Type.FLOAT:
+        return 'float64'
+    if attribute.type in (Type.STRING, Type.TEXT, Type.UUID):
+        return 'string'
+    return 'json'
+
+
+def _json_default(value):
+    """
+    Convert a (nested) value `json` can not encode
+
+    Args:
+        value (mixed): the value
+
+    Returns:
+        mixed: the converted value
+
+    Raises:
+        TypeError: if the `value` can not be converted
+    """
+    if hasattr(value, 'to_raw'):
+        return value.to_raw()
+    raise TypeError('Can not encode: {!r}'.format(value))
+
+
+class ColumnarFile(object):
+    """
+    Class representing a read-only, columnar snapshot file of `Model` rows
+    (see: `write`). The file is memory-mapped, as such opening it costs the
+    same whatever the number of rows and every process which opens it shares
+    the same (page-cache) memory. Rows are exposed as lazy views
+    (`ColumnarRow`), a value is only read from the file when it is accessed
+
+    The layout follows the `attribute_metadata` of the `Model` class: `bool`,
+    `int[eger]`/`long` and `float` attributes are fixed-width columns,
+    `str[ing]`/`text`/`uuid` attributes are UTF-8 columns indexed by offset and
+    any other attribute (e.g. a `list` or a nested `Model`) is a JSON column
+    indexed by offset. A column with `None` values has a null bit-map
+
+    Instance Attributes:
+        attribute_names (tuple of str): the attribute-names of the columns (in
+            `attribute_metadata` order)
+        file_path (str): the file-path
+        model_class (type): the `Model` class of the rows (`None` if it was not
+            provided, in which case `ColumnarRow.to_model` is not supported)
+        row_count (int): the number of rows
+    """
+    def __init__(
+        self,
+        file_path,
+        model_class=None
+    ):
+        # imported on first use, it is costly to import
+        import json
+        self.file_path = file_path
+        self.model_class = model_class
+        with open(file_path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(_MAGIC)] != _MAGIC:
+            self._mmap.close()
+            raise ValueError('Not a columnar file: {}'.format(file_path))
+        header_length, = _LENGTH.unpack_from(self._mmap, len(_MAGIC))
+        header_offset = len(_MAGIC) + _LENGTH.size
+        header = json.loads(self._mmap[header_offset:header_offset +
+            header_length].decode('utf-8'))
+        self.row_count = header['row_count']
+        self._columns = {
+            column['name']: column
+            for column in header['columns']
+        }
+        self.attribute_names = tuple(
+            column['name']
+            for column in header['columns']
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [
+                ColumnarRow(self, index)
+                for index in range(*index.indices(self.row_count))
+            ]
+        if index < 0:
+            index += self.row_count
+        if not 0 <= index < self.row_count:
+            raise IndexError('Row index out of range: {}'.format(index))
+        return ColumnarRow(self, index)
+
+    def __iter__(self):
+        for index in range(self.row_count):
+            yield ColumnarRow(self, index)
+
+    def __len__(self):
+        return self.row_count
+
+    @classmethod
+    def write(
+        cls,
+        file_path,
+        model_class,
+        rows
+    ):
+        """
+        Write the specified `rows` to a columnar file, laid out from the
+        `attribute_metadata` of the specified `model_class`. The file is
+        written to a temporary file-path and then renamed, as such a reader
+        never sees a partially written file
+
+        Args:
+            file_path (str): the file-path
+            model_class (type): the `Model` class
+            rows (iterable of mixed): the rows, either `Model` instances or
+                `dict(s)` (e.g. the rows of `SQLPersistor.stream`). The values
+                of a `dict` are written as-is (they are not formatted)
+
+        Returns:
+            int: the number of rows written
+
+        Raises:
+            ValueError: if a value does not fit its column (e.g. an `int` which
+                does not fit in 64 bits)
+        """
+        # imported on first use, it is costly to import
+        import json
+        attribute_names = list(model_class.attribute_metadata)
+        kinds = [
+            _column_kind(model_class.attribute_metadata[attribute_name])
+            for attribute_name in attribute_names
+        ]
+        datas = [bytearray() for _ in attribute_names]
+        offsets = [
+            bytearray(_LENGTH.pack(0)) if kind in _VARIABLE_WIDTH else None
+            for kind in kinds
+        ]
+        nulls = [bytearray() for _ in attribute_names]
+        has_nulls = [False] * len(attribute_names)
+        row_count = 0
+        for row in rows:
+            bit = 1 << (row_count & 7)
+            if not row_count & 7:
+                for null in nulls:
+                    null.append(0)
+            for position, attribute_name in enumerate(attribute_names):
+                value = cls._row_value(row, attribute_name)
+                kind = kinds[position]
+                data = datas[position]
+                if value is None:
+                    nulls[position][-1] |= bit
+                    has_nulls[position] = True
+                    if kind in _FIXED_WIDTH:
+                        data.extend(b'\x00' * _FIXED_WIDTH[kind].size)
+                    else:
+                        offsets[position].extend(_LENGTH.pack(len(data)))
+                    continue
+                try:
+                    if kind in _FIXED_WIDTH:
+                        data.extend(_FIXED_WIDTH[kind].pack(value))
+                        continue
+                    if kind == 'string':
+                        value = (value if isinstance(value, text_type) else
+                            text_type(value)).encode('utf-8')
+                    else:
+                        value = json.dumps(value, default=_json_default,
+                            separators=(',', ':')).encode('utf-8')
+                except (struct.error, TypeError) as e:
+                    raise ValueError('Could not write: {!r} to column: {} '
+                        '({})'.format(value, attribute_name, e))
+                data.extend(value)
+                offsets[position].extend(_LENGTH.pack(len(data)))
+            row_count += 1
+        # lay the sections out (each section is 8-byte aligned)
+        columns = []
+        sections = []
+        offset = 0
+        for position, attribute_name in enumerate(attribute_names):
+            column = {
+                'kind': kinds[position],
+                'name': attribute_name,
+                'nulls': None,
+                'offsets': None,
+            }
+            for name, section in (
+                ('nulls', nulls[position] if has_nulls[position] else None),
+                ('offsets', offsets[position]),
+                ('data', datas[position]),
+            ):
+                if section is not None:
+                    column[name] = offset
+                    sections.append((offset, section))
+                    offset = _align(offset + len(section))
+            columns.append(column)
+        header = {
+            'model': '{}.{}'.format(model_class.__module__,
+                model_class.__name__),
+            'row_count': row_count,
+        }
+        # the section offsets are absolute, as such they depend on the length
+        # of the (JSON) header itself: grow it until it is stable
+        base = 0
+        while True:
+            header['columns'] = [
+                dict(column, **{
+                    name: column[name] + base
+                    for name in ('data', 'nulls', 'offsets')
+                    if column[name] is not None
+                })
+                for column in columns
+            ]
+            header_data = json.dumps(header, sort_keys=True).encode('utf-8')
+            header_end = _align(len(_MAGIC) + _LENGTH.size + len(header_data))
+            if header_end <= base:
+                break
+            base = header_end
+        header_data += b' ' * (base - len(_MAGIC) - _LENGTH.size -
+            len(header_data))
+        temporary_file_path = '{}.{}.tmp'.format(file_path, os.getpid())
+        try:
+            with open(temporary_file_path, 'wb') as file:
+                file.write(_MAGIC)
+                file.write(_LENGTH.pack(len(header_data)))
+                file.write(header_data)
+                for offset, section in sections:
+                    file.write(b'\x00' * (base + offset - file.tell()))
+                    file.write(section)
+            getattr(os, 'replace', os.rename)(temporary_file_path, file_path)
+        except Exception:
+            if os.path.exists(temporary_file_path):
+                os.remove(temporary_file_path)
+            raise
+        return row_count
+
+    def close(self):
+        """
+        Close (unmap) the file, the rows may no longer be read
+        """
+        self._mmap.close()
+
+    def get_value(
+        self,
+        index,
+        attribute_name
+    ):
+        """
+        Read a single value from the file
+
+        Args:
+            index (int): the row index
+            attribute_name (str): the attribute-name
+
+        Returns:
+            mixed: the value (the value of a JSON column is the decoded, raw
+                value, e.g. a `dict` for a nested `Model`)
+
+        Raises:
+            KeyError: if there is no column for the `attribute_name`
+        """
+        column = self._columns[attribute_name]
+        data = self._mmap
+        nulls = column['nulls']
+        if nulls is not None and \
+            _BYTE.unpack_from(data, nulls + (index >> 3))[0] & \
+            (1 << (index & 7)):
+            return None
+        kind = column['kind']
+        fixed_width = _FIXED_WIDTH.get(kind)
+        if fixed_width is not None:
+            return fixed_width.unpack_from(data,
+                column['data'] + index * fixed_width.size)[0]
+        start, end = _SPAN.unpack_from(data, column['offsets'] + index * 8)
+        offset = column['data']
+        value = data[offset + start:offset + end].decode('utf-8')
+        if kind == 'json':
+            # imported on first use, it is costly to import
+            import json
+            return json.loads(value)
+        return value
+
+    @staticmethod
+    def _row_value(
+        row,
+        attribute_name
+    ):
+        """
+        Get the (raw) value of an attribute of a row to be written
+
+        Args:
+            row (mixed): the row, a `Model` instance or a `dict`
+            attribute_name (str): the attribute-name
+
+        Returns:
+            mixed: the value
+        """
+        if isinstance(row, dict):
+            value = row.get(attribute_name)
+        else:
+            value = row._stored_attribute_value(attribute_name)
+        if isinstance(value, Deferred):
+            value = value.decode()
+        if isinstance(value, (LazyModel, LazyModelList)):
+            value = value.to_raw()
+        return value
+
+
+class ColumnarRow(object):
+    """
+    Class representing a lazy (read-only) view of a single row of a
+    `ColumnarFile`. It supports the same attribute access as a (read-only)
+    `Model`, each value is read from the file when it is accessed (it is not
+    cached)
+
+    Instance Attributes:
+        file (ColumnarFile): the `ColumnarFile` instance
+        index (int): the row index
+        merged_attribute_data (derived-dict): every value of the row (key:
+            `attribute_name`)
+        read_only (bool): always `True`
+    """
+    __slots__ = ('file', 'index')
+
+    read_only = True
+
+    def __init__(
+        self,
+        file,
+        index
+    ):
+        self.file = file
+        self.index = index
+
+    def __getattr__(self, attribute_name):
+        if attribute_name in ColumnarRow.__slots__ or \
+            attribute_name.startswith('__'):
+            # not set yet (e.g. while unpickling)
+            raise AttributeError(attribute_name)
+        try:
+            return self.file.get_value(self.index, attribute_name)
+        except KeyError:
+            raise AttributeError('Unmapped attribute: {}'.format(
+                attribute_name))
+
+    @property
+    def merged_attribute_data(self):
+        """
+        Get every value of the row (this *is not* memoized)
+
+        Returns:
+            dict: the values (key: `attribute_name`)
+        """
+        return {
+            attribute_name: self.file.get_value(self.index, attribute_name)
+            for attribute_name in self.file.attribute_names
+        }
+
+    def get_attribute_value(self, attribute_name):
+        """
+        Get the value of an attribute
+
+        Args:
+            attribute_name (str): the attribute-name
+
+        Returns:
+            mixed: the attribute-value
+
+        Raises:
+            AttributeError: if there is no column for the `attribute_name`
+        """
+        return self.__getattr__(attribute_name)
+
+    def to_model(self):
+        """
+        Build a read-only `Model` instance (see: `Model.snapshot`) from the
+        row. The values of the fixed-width and UTF-8 columns are taken as-is,
+        the values of the JSON columns are formatted (e.g. a nested `Model`)
+
+        Returns:
+            Model: the `Model` instance
+
+        Raises:
+            RuntimeError: if the `ColumnarFile` has no `model_class`
+            ValueError: if a JSON value could not be formatted
+        """
+        model_class = self.file.model_class
+        if model_class is None:
+            raise RuntimeError
+        attribute_metadata = model_class.attribute_metadata
+        columns = self.file._columns
+        values = []
+        mask = 0
+        # the values are restored in `Model.pickle_positions` order
+        for position, attribute_name in enumerate(sorted(attribute_metadata)):
+            column = columns.get(attribute_name)
+            if column is None:
+                continue
+            value = self.file.get_value(self.index, attribute_name)
+            if column['kind'] == 'json':
+                value = attribute_metadata[attribute_name].format(value)
+            values.append(value)
+            mask |= 1 << position
+        return _restore(model_class, tuple(values), (mask, 0, 0), 0, 2, None,
+            None)
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, self.index)
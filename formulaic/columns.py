@@ -0,0 +1,510 @@
+__all__ = (
+    'BinaryCodec',
+    'Codec',
+    'Deferred',
+    'JSONCodec',
+    'Unloaded',
+)
+
+
+import struct
+import zlib
+
+from .types import integer_types, text_type
+
+
+class Codec(object):
+    """
+    Class providing methods for encoding an attribute-value to a column-value
+    (and back). A `Codec` is configured per `Attribute` (see: `codec`) and is
+    used by a `SQLPersistor` which was provided the `attribute_metadata`
+
+    Class Attributes:
+        COLUMN_TYPE (str): the column-type used when generating DDL
+
+    Instance Attributes:
+        compress_threshold (int): the encoded size (in bytes) from which a
+            value is compressed (`zlib`), `None` never compresses
+    """
+    COLUMN_TYPE = 'TEXT'
+
+    def __init__(self, compress_threshold=None):
+        self.compress_threshold = compress_threshold
+
+    def decode(self, column_value):
+        """
+        Decode the specified `column_value`
+
+        Args:
+            column_value (mixed): the column-value
+
+        Returns:
+            mixed: the attribute-value
+
+        Raises:
+            NotImplementedError: if this method is not overridden by an
+                inheriting class
+        """
+        raise NotImplementedError
+
+    def encode(self, attribute_value):
+        """
+        Encode the specified `attribute_value`
+
+        Args:
+            attribute_value (mixed): the attribute-value
+
+        Returns:
+            mixed: the column-value
+
+        Raises:
+            NotImplementedError: if this method is not overridden by an
+                inheriting class
+        """
+        raise NotImplementedError
+
+    def _compress(self, data):
+        """
+        Compress the specified `data` if it has reached `compress_threshold`
+        (and compression makes it smaller)
+
+        Args:
+            data (bytes): the encoded data
+
+        Returns:
+            bytes: the compressed data, or `None` if it was not compressed
+        """
+        if self.compress_threshold is None or \
+            len(data) < self.compress_threshold:
+            return None
+        compressed_data = zlib.compress(data)
+        return compressed_data if len(compressed_data) < len(data) else None
+
+
+class BinaryCodec(Codec):
+    """
+    Class providing methods for encoding an attribute-value to a compact,
+    tagged binary column-value (`BLOB`). Integers are zig-zag varints, floats
+    are 8-byte doubles and strings, `list(s)` and `dict(s)` are
+    length-prefixed. The first byte holds the flags (bit 0: compressed)
+    """
+    COLUMN_TYPE = 'BLOB'
+
+    def decode(self, column_value):
+        """
+        Decode the specified `column_value`
+
+        Args:
+            column_value (bytes): the column-value
+
+        Returns:
+            mixed: the attribute-value
+
+        Raises:
+            ValueError: if the `column_value` is malformed
+        """
+        data = bytearray(column_value)
+        if data[0] & 1:
+            data = bytearray(zlib.decompress(bytes(data[1:])))
+        else:
+            data = data[1:]
+        attribute_value, position = self._decode(data, 0)
+        if position != len(data):
+            raise ValueError('Trailing data at: {}'.format(position))
+        return attribute_value
+
+    def encode(self, attribute_value):
+        """
+        Encode the specified `attribute_value`
+
+        Args:
+            attribute_value (mixed): the attribute-value (`None`, `bool`, `int`,
+                `float`, `str`, `bytes`, `list`, `tuple` or `dict`, or an
+                object with a `to_raw` method, e.g. a `LazyModel`)
+
+        Returns:
+            bytes: the column-value
+
+        Raises:
+            TypeError: if the `attribute_value` (or an item) can not be encoded
+        """
+        data = bytearray()
+        self._encode(attribute_value, data)
+        data = bytes(data)
+        compressed_data = self._compress(data)
+        if compressed_data is not None:
+            return b'\x01' + compressed_data
+        return b'\x00' + data
+
+    def _decode(
+        self,
+        data,
+        position
+    ):
+        """
+        Decode the value at the specified `position` of the `data`
+
+        Args:
+            data (bytearray): the (uncompressed) data
+            position (int): the position of the tag
+
+        Returns:
+            tuple: a `(value, position)` tuple, `position` is that of the next
+                tag
+        """
+        tag = data[position]
+        position += 1
+        if tag == 0x4e:  # N
+            return (None, position)
+        if tag == 0x54:  # T
+            return (True, position)
+        if tag == 0x46:  # F
+            return (False, position)
+        if tag == 0x69:  # i
+            value, position = self._decode_varint(data, position)
+            return ((value >> 1) ^ -(value & 1), position)
+        if tag == 0x64:  # d
+            return (struct.unpack('>d', bytes(data[position:position + 8]))[0],
+                position + 8)
+        if tag in (0x73, 0x62):  # s, b
+            length, position = self._decode_varint(data, position)
+            value = bytes(data[position:position + length])
+            return (value.decode('utf-8') if tag == 0x73 else value,
+                position + length)
+        if tag == 0x6c:  # l
+            count, position = self._decode_varint(data, position)
+            value = []
+            for _ in range(count):
+                item, position = self._decode(data, position)
+                value.append(item)
+            return (value, position)
+        if tag == 0x6d:  # m
+            count, position = self._decode_varint(data, position)
+            value = {}
+            for _ in range(count):
+                key, position = self._decode(data, position)
+                value[key], position = self._decode(data, position)
+            return (value, position)
+        raise ValueError('Unknown tag: {} at: {}'.format(tag, position - 1))
+
+    def _decode_varint(
+        self,
+        data,
+        position
+    ):
+        """
+        Decode the (unsigned) varint at the specified `position` of the `data`
+
+        Args:
+            data (bytearray): the (uncompressed) data
+            position (int): the position of the varint
+
+        Returns:
+            tuple: a `(value, position)` tuple
+        """
+        value = shift = 0
+        while True:
+            byte = data[position]
+            position += 1
+            value |= (byte & 0x7f) << shift
+            if not byte & 0x80:
+                return (value, position)
+            shift += 7
+
+    def _encode(
+        self,
+        value,
+        data
+    ):
+        """
+        Encode the specified `value`, appending it to the `data`
+
+        Args:
+            value (mixed): the value
+            data (bytearray): the encoded data
+
+        Raises:
+            TypeError: if the `value` (or an item) can not be encoded
+        """
+        if value is None:
+            data.append(0x4e)
+        elif value is True:
+            data.append(0x54)
+        elif value is False:
+            data.append(0x46)
+        elif isinstance(value, integer_types):
+            data.append(0x69)
+            # zig-zag, small negative values stay small
+            self._encode_varint(value << 1 if value >= 0 else
+                (-value << 1) - 1, data)
+        elif isinstance(value, float):
+            data.append(0x64)
+            data.extend(struct.pack('>d', value))
+        elif isinstance(value, text_type):
+            value = value.encode('utf-8')
+            data.append(0x73)
+            self._encode_varint(len(value), data)
+            data.extend(value)
+        elif isinstance(value, bytes):
+            data.append(0x62)
+            self._encode_varint(len(value), data)
+            data.extend(value)
+        elif isinstance(value, (list, tuple)):
+            data.append(0x6c)
+            self._encode_varint(len(value), data)
+            for item in value:
+                self._encode(item, data)
+        elif isinstance(value, dict):
+            data.append(0x6d)
+            self._encode_varint(len(value), data)
+            for key, item in value.items():
+                self._encode(key, data)
+                self._encode(item, data)
+        elif hasattr(value, 'to_raw'):
+            self._encode(value.to_raw(), data)
+        else:
+            raise TypeError('Can not encode: {!r}'.format(value))
+
+    def _encode_varint(
+        self,
+        value,
+        data
+    ):
+        """
+        Encode the specified (unsigned) `value` as a varint, appending it to the
+        `data`
+
+        Args:
+            value (int): the value
+            data (bytearray): the encoded data
+        """
+        while value > 0x7f:
+            data.append((value & 0x7f) | 0x80)
+            value >>= 7
+        data.append(value)
+
+
+class JSONCodec(Codec):
+    """
+    Class providing methods for encoding an attribute-value to a (compact) JSON
+    column-value. A compressed value is stored as bytes (`zlib`), otherwise as
+    text
+    """
+    def decode(self, column_value):
+        """
+        Decode the specified `column_value`
+
+        Args:
+            column_value (mixed): the column-value (text, or compressed bytes)
+
+        Returns:
+            mixed: the attribute-value
+
+        Raises:
+            ValueError: if the `column_value` is malformed
+        """
+        # imported on first use, it is costly to import
+        import json
+        if not isinstance(column_value, text_type):
+            column_value = zlib.decompress(bytes(column_value)).decode('utf-8')
+        return json.loads(column_value)
+
+    def encode(self, attribute_value):
+        """
+        Encode the specified `attribute_value`
+
+        Args:
+            attribute_value (mixed): the attribute-value (objects with a
+                `to_raw` method, e.g. a `LazyModel`, are converted first)
+
+        Returns:
+            mixed: the column-value (text, or compressed bytes)
+
+        Raises:
+            TypeError: if the `attribute_value` (or an item) can not be encoded
+        """
+        # imported on first use, it is costly to import
+        import json
+        column_value = json.dumps(attribute_value, default=self._default,
+            separators=(',', ':'))
+        if self.compress_threshold is not None:
+            compressed_data = self._compress(column_value.encode('utf-8'))
+            if compressed_data is not None:
+                return compressed_data
+        return column_value
+
+    def _default(self, value):
+        """
+        Convert a value `json` can not encode
+
+        Args:
+            value (mixed): the value
+
+        Returns:
+            mixed: the converted value
+
+        Raises:
+            TypeError: if the `value` can not be converted
+        """
+        if hasattr(value, 'to_raw'):
+            return value.to_raw()
+        raise TypeError('Can not encode: {!r}'.format(value))
+
+
+class Deferred(object):
+    """
+    Class representing a loaded column-value which has not been decoded yet.
+    It is decoded (once) when the attribute is first read from the `Model`, a
+    `Deferred` value which is never read is written back as-is
+
+    Instance Attributes:
+        codec (Codec): the `Codec` instance
+        column_value (mixed): the (encoded) column-value
+    """
+    __slots__ = ('_value', 'codec', 'column_value')
+
+    def __init__(
+        self,
+        codec,
+        column_value
+    ):
+        self.codec = codec
+        self.column_value = column_value
+
+    def decode(self):
+        """
+        Decode (once) and return the attribute-value
+
+        Returns:
+            mixed: the attribute-value
+        """
+        if not hasattr(self, '_value'):
+            self._value = self.codec.decode(self.column_value)
+        return self._value
+
+    def __reduce__(self):
+        # the decoded value is not pickled, only the (compact) column-value
+        return (type(self), (self.codec, self.column_value))
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, type(self.codec).__name__)
+
+
+class Unloaded(Deferred):
+    """
+    Class representing a column which was not selected when the row was loaded
+    (see: `Model.page`). It is fetched, together with the other unloaded
+    columns of the same row (in a single query), when the attribute is first
+    read from the `Model`. An `Unloaded` value which is never read is not
+    written back (the column keeps its stored value)
+
+    Instance Attributes:
+        attribute_name (str): the attribute-name
+        row (_UnloadedRow): the (shared) unloaded columns of the row
+    """
+    __slots__ = ('attribute_name', 'row')
+
+    def __init__(
+        self,
+        row,
+        attribute_name
+    ):
+        super(Unloaded, self).__init__(None, None)
+        self.attribute_name = attribute_name
+        self.row = row
+
+    @classmethod
+    def columns(
+        cls,
+        persistor,
+        key_attributes,
+        attribute_names
+    ):
+        """
+        Create an `Unloaded` value for each of the specified `attribute_names`
+        of the row identified by the specified `key_attributes`
+
+        Args:
+            persistor (Persistor): the `Persistor` instance the columns are
+                fetched from
+            key_attributes (dict): the key-attributes of the row
+            attribute_names (iterable of str): the unloaded attribute-names
+
+        Returns:
+            dict: the `Unloaded` values (key: `attribute_name`)
+        """
+        attribute_names = tuple(attribute_names)
+        row = _UnloadedRow(persistor, key_attributes, attribute_names)
+        return {
+            attribute_name: cls(row, attribute_name)
+            for attribute_name in attribute_names
+        }
+
+    def decode(self):
+        """
+        Fetch (once) and return the attribute-value
+
+        Returns:
+            mixed: the attribute-value
+
+        Raises:
+            ValueError: if the row no longer exists, or the column-value could
+                not be decoded
+        """
+        if not hasattr(self, '_value'):
+            attribute_value = self.row.fetch()[self.attribute_name]
+            if isinstance(attribute_value, Deferred):
+                attribute_value = attribute_value.decode()
+            self._value = attribute_value
+        return self._value
+
+    def __reduce__(self):
+        # the `Persistor` (and its connection) can not be pickled
+        raise TypeError('{} can not be pickled, read it first'.format(
+            type(self).__name__))
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, self.attribute_name)
+
+
+class _UnloadedRow(object):
+    """
+    Class representing the unloaded columns of a single row, shared by their
+    `Unloaded` values
+
+    Instance Attributes:
+        attribute_names (tuple of str): the unloaded attribute-names
+        key_attributes (dict): the key-attributes of the row
+        persistor (Persistor): the `Persistor` instance
+    """
+    __slots__ = ('_attributes', 'attribute_names', 'key_attributes',
+        'persistor')
+
+    def __init__(
+        self,
+        persistor,
+        key_attributes,
+        attribute_names
+    ):
+        self.attribute_names = attribute_names
+        self.key_attributes = key_attributes
+        self.persistor = persistor
+
+    def fetch(self):
+        """
+        Fetch (once) the unloaded columns of the row
+
+        Returns:
+            dict: the loaded attributes (key: `attribute_name`)
+
+        Raises:
+            ValueError: if the row no longer exists
+        """
+        if not hasattr(self, '_attributes'):
+            attributes = self.persistor.load(self.key_attributes,
+                self.attribute_names)
+            if attributes is None:
+                raise ValueError('Row no longer exists: {}'.format(
+                    self.key_attributes))
+            self._attributes = attributes
+        return self._attributes
@@ -0,0 +1,58 @@
+__all__ = ('Constraint',)
+
+
+class Constraint(object):
+    """
+    Class representing a (model-level) rule across one or more `Attribute`
+    values (e.g. `end_date` is after `start_date`). The `Constraint` states
+    the attribute-names it depends on, its result is cached on the `Model` and
+    is only re-evaluated (by `Model.validate`) once one of them is set to a
+    different value. As with the `Attribute` validators, a value changed in
+    place (e.g. an item appended to a `list`) is not detected
+
+    Instance Attributes:
+        attribute_names (set of str): the attribute-names upon which the
+            `Constraint` is based
+        message (str): the message describing the rule (defaults to the name of
+            the `predicate`)
+        predicate (callable): the predicate, it is called with the value of
+            each attribute (as keyword arguments) and should return `True` or
+            `False`. It is not called if any of the values is `None`, in which
+            case the `Constraint` holds (as with a SQL `CHECK` constraint)
+    """
+    def __init__(
+        self,
+        attribute_names,
+        predicate,
+        message=None
+    ):
+        assert(attribute_names)
+        self.attribute_names = frozenset(attribute_names)
+        assert(predicate)
+        self.predicate = predicate
+        self.message = message if message is not None else \
+            getattr(predicate, '__name__', None)
+
+    def check(self, model):
+        """
+        Evaluate the `predicate` against the current values of the specified
+        `model`
+
+        Args:
+            model (Model): the `Model` instance
+
+        Returns:
+            bool: the result
+        """
+        attribute_values = {
+            attribute_name: model.get_attribute_value(attribute_name)
+            for attribute_name in self.attribute_names
+        }
+        if any(attribute_value is None for attribute_value in
+            attribute_values.values()):
+            return True
+        return bool(self.predicate(**attribute_values))
+
+    def __repr__(self):
+        return '{}({}, {!r})'.format(type(self).__name__,
+            ', '.join(sorted(self.attribute_names)), self.message)
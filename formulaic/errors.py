@@ -0,0 +1,125 @@
+__all__ = (
+    'FieldError',
+    'FormatError',
+    'INVALID',
+    'TriggerError',
+    'ValidationError',
+)
+
+
+class _Invalid(object):
+    """
+    Class representing the (singleton) sentinel returned by the non-raising
+    methods (e.g. `Attribute.try_format`) in place of a value
+    """
+    def __bool__(self):
+        return False
+
+    __nonzero__ = __bool__
+
+    def __repr__(self):
+        return 'INVALID'
+
+
+INVALID = _Invalid()
+
+
+class FieldError(object):
+    """
+    Class representing an error of a single field (attribute) of a record, or
+    of a `Constraint` which does not hold. The message is only built when it
+    is read
+
+    Class Attributes:
+        CONSTRAINT (str): the error-code for a `Constraint` which does not hold
+        FORMAT (str): the error-code for a value which could not be formatted
+        INVALID (str): the error-code for a value which is invalid
+
+    Instance Attributes:
+        attribute_name (str): the attribute-name (the name of the `Constraint`
+            for a `CONSTRAINT` error)
+        attribute_value (mixed): the (offending) attribute-value (the message
+            of the `Constraint` for a `CONSTRAINT` error)
+        code (str): the error-code
+    """
+    __slots__ = ('attribute_name', 'attribute_value', 'code')
+
+    CONSTRAINT = 'constraint'
+    FORMAT = 'format'
+    INVALID = 'invalid'
+
+    _TEMPLATES = {
+        CONSTRAINT: 'Constraint not satisfied: {} ({})',
+        FORMAT: 'Could not format value: {} for attribute: {}',
+        INVALID: 'Invalid value: {} for attribute: {}',
+    }
+
+    def __init__(
+        self,
+        attribute_name,
+        attribute_value,
+        code
+    ):
+        self.attribute_name = attribute_name
+        self.attribute_value = attribute_value
+        self.code = code
+
+    @property
+    def message(self):
+        """
+        Build and return the message
+
+        Returns:
+            str: the message
+        """
+        return self._TEMPLATES[self.code].format(self.attribute_value,
+            self.attribute_name)
+
+    def __repr__(self):
+        return '{}({!r}, {!r})'.format(type(self).__name__,
+            self.attribute_name, self.code)
+
+    def __str__(self):
+        return self.message
+
+
+class _LazyValueError(ValueError):
+    """
+    Class representing a `ValueError` whose message is built from a template
+    and its arguments only when it is read (constructing the error is cheap)
+    """
+    def __init__(self, template, *args):
+        super(_LazyValueError, self).__init__(template, *args)
+
+    def __str__(self):
+        return self.args[0].format(*self.args[1:])
+
+
+class FormatError(_LazyValueError):
+    """
+    Class representing an error raised when a value could not be formatted
+    """
+
+
+class TriggerError(RuntimeError):
+    """
+    Class representing an error raised when one or more (deferred or
+    dispatched) `Trigger` handlers raised
+
+    Instance Attributes:
+        errors (list of tuples): a `(trigger, error)` tuple for each handler
+            which raised, in the order they ran
+    """
+    def __init__(self, errors):
+        super(TriggerError, self).__init__(errors)
+        self.errors = errors
+
+    def __str__(self):
+        return '{} trigger handler(s) raised, first: {!r}'.format(
+            len(self.errors), self.errors[0][1])
+
+
+class ValidationError(_LazyValueError):
+    """
+    Class representing an error raised when a value is invalid
+    """
@@ -1,17 +1,16 @@
 __all__ = ('Formatter',)
 
 
-import six
-
-
-if six.PY3:
-    long = int
+from .errors import INVALID, FormatError
+from .types import long, text_type
 
 
 class Formatter(object):
     """
     Class providing methods for formatting input (formatting occurs when an
-    attribute is about to be set via a `Model` instance)
+    attribute is about to be set via a `Model` instance). Each method which
+    may raise has a non-raising `try_` counterpart (e.g. `try_integer`) which
+    returns `INVALID` instead, the raising method is built on it
     """
     @classmethod
     def boolean(cls, value):
@@ -25,6 +24,25 @@ class Formatter(object):
         """
         return bool(value)
 
+    @classmethod
+    def dictionary(cls, value):
+        """Cast a value as a `dict[ionary]`
+
+        Parameters:
+            value (mixed): the value
+
+        Returns:
+            dict: the casted result
+
+        Raises:
+            FormatError: if `value` could not be casted
+        """
+        result = cls.try_dictionary(value)
+        if result is INVALID:
+            raise FormatError('Could not convert: {} to a dictionary value',
+                value)
+        return result
+
     @classmethod
     def float(cls, value):
         """Cast a value as a `float`
@@ -36,13 +54,12 @@ class Formatter(object):
             float: the casted result
 
         Raises:
-            ValueError: if `value` could not be casted
+            FormatError: if `value` could not be casted
         """
-        try:
-            return float(value)
-        except Exception:
-            raise ValueError('Could not convert: {} to a float value'.format(
-                value))
+        result = cls.try_float(value)
+        if result is INVALID:
+            raise FormatError('Could not convert: {} to a float value', value)
+        return result
 
     @classmethod
     def lower(cls, value):
@@ -55,13 +72,13 @@ class Formatter(object):
             str/unicode: the lowercased value
 
         Raises:
-            ValueError: if `value` could not be lowercased or is an invalid
+            FormatError: if `value` could not be lowercased or is an invalid
                 `type`
         """
-        try:
-            return value.lower()
-        except Exception:
-            raise ValueError('Could not lowercase value: {}'.format(value))
+        result = cls.try_lower(value)
+        if result is INVALID:
+            raise FormatError('Could not lowercase value: {}', value)
+        return result
 
     @classmethod
     def integer(cls, value):
@@ -74,13 +91,13 @@ class Formatter(object):
             int: the casted result
 
         Raises:
-            ValueError: if `value` could not be casted
+            FormatError: if `value` could not be casted
         """
-        try:
-            return int(value)
-        except Exception:
-            raise ValueError('Could not convert: {} to an integer value'.format(
-                value))
+        result = cls.try_integer(value)
+        if result is INVALID:
+            raise FormatError('Could not convert: {} to an integer value',
+                value)
+        return result
 
     @classmethod
     def long(cls, value):
@@ -93,13 +110,12 @@ class Formatter(object):
             int/long: the casted result
 
         Raises:
-            ValueError: if `value` could not be casted
+            FormatError: if `value` could not be casted
         """
-        try:
-            return long(value)
-        except Exception:
-            raise ValueError('Could not convert: {} to an long value'.format(
-                value))
+        result = cls.try_long(value)
+        if result is INVALID:
+            raise FormatError('Could not convert: {} to an long value', value)
+        return result
 
     @classmethod
     def string(cls, value):
@@ -123,7 +139,103 @@ class Formatter(object):
         Returns:
             str/unicode: the casted result
         """
-        return six.text_type(value)
+        return text_type(value)
+
+    @classmethod
+    def try_dictionary(cls, value):
+        """Cast a value as a `dict[ionary]`, without raising
+
+        Parameters:
+            value (mixed): the value
+
+        Returns:
+            dict: the casted result (or `INVALID` if `value` could not be
+                casted)
+        """
+        try:
+            return dict(value)
+        except Exception:
+            return INVALID
+
+    @classmethod
+    def try_float(cls, value):
+        """Cast a value as a `float`, without raising
+
+        Parameters:
+            value (mixed): the value
+
+        Returns:
+            float: the casted result (or `INVALID` if `value` could not be
+                casted)
+        """
+        try:
+            return float(value)
+        except Exception:
+            return INVALID
+
+    @classmethod
+    def try_integer(cls, value):
+        """Cast a value as an `int[eger]`, without raising
+
+        Parameters:
+            value (mixed): the value
+
+        Returns:
+            int: the casted result (or `INVALID` if `value` could not be
+                casted)
+        """
+        try:
+            return int(value)
+        except Exception:
+            return INVALID
+
+    @classmethod
+    def try_long(cls, value):
+        """Cast a value as a `long`, without raising
+
+        Parameters:
+            value (mixed): the value
+
+        Returns:
+            int/long: the casted result (or `INVALID` if `value` could not be
+                casted)
+        """
+        try:
+            return long(value)
+        except Exception:
+            return INVALID
+
+    @classmethod
+    def try_lower(cls, value):
+        """Lowercase a value, without raising
+
+        Parameters:
+            value (mixed): the value
+
+        Returns:
+            str/unicode: the lowercased value (or `INVALID` if `value` could
+                not be lowercased)
+        """
+        try:
+            return value.lower()
+        except Exception:
+            return INVALID
+
+    @classmethod
+    def try_upper(cls, value):
+        """Uppercase a value, without raising
+
+        Parameters:
+            value (mixed): the value
+
+        Returns:
+            str/unicode: the uppercased value (or `INVALID` if `value` could
+                not be uppercased)
+        """
+        try:
+            return value.upper()
+        except Exception:
+            return INVALID
 
     @classmethod
     def upper(cls, value):
@@ -136,10 +248,10 @@ class Formatter(object):
             str/unicode: the uppercased value
 
         Raises:
-            ValueError: if `value` could not be uppercased or is an invalid
+            FormatError: if `value` could not be uppercased or is an invalid
                 `type`
         """
-        try:
-            return value.upper()
-        except Exception:
-            raise ValueError('Could not uppercase value: {}'.format(value))
+        result = cls.try_upper(value)
+        if result is INVALID:
+            raise FormatError('Could not uppercase value: {}', value)
+        return result
@@ -0,0 +1,307 @@
+__all__ = (
+    'FileJournal',
+    'Journal',
+)
+
+
+import json
+import os
+import threading
+import time
+
+
+def _default(value):
+    """
+    Convert a value `json` can not encode (objects with a `to_raw` method, e.g.
+    a `LazyModel`, are converted to their raw value, others to their `str`
+    representation)
+
+    Args:
+        value (mixed): the value
+
+    Returns:
+        mixed: the converted value
+    """
+    to_raw = getattr(value, 'to_raw', None)
+    if callable(to_raw):
+        return to_raw()
+    return str(value)
+
+
+class Journal(object):
+    """
+    Class providing methods for journaling changes (journaling occurs when the
+    `persist` method is called on a `Model` instance and the `Persistor`
+    succeeded). The changes written in a transaction are staged (keyed by the
+    transaction, e.g. the "Connection" instance) and only appended once it is
+    committed: `commit` must be called after the transaction is committed
+    (`Session.commit` does so) and `rollback` after it is rolled back, as such
+    a rolled back change is never journaled
+    """
+    def __init__(self):
+        self._staged = {}
+        self._staged_lock = threading.Lock()
+
+    def append(
+        self,
+        key_attributes,
+        old_attributes,
+        new_attributes
+    ):
+        """
+        Append a change record
+
+        Args:
+            key_attributes (dict): the key-attributes of the changed `Model`
+            old_attributes (dict): the old-values of the changed attributes
+            new_attributes (dict): the new-values of the changed attributes
+
+        Raises:
+            NotImplementedError: if this method is not overridden by an
+                inheriting class
+        """
+        raise NotImplementedError
+
+    def commit(self, transaction=None):
+        """
+        Append the change records staged in the specified `transaction` (in
+        the order they were staged)
+
+        Args:
+            transaction (mixed): the transaction (`None` commits every staged
+                transaction)
+
+        Returns:
+            int: the number of appended records
+        """
+        records = []
+        for staged_records in self._unstage(transaction):
+            records.extend(staged_records)
+        for key_attributes, old_attributes, new_attributes in records:
+            self.append(key_attributes, old_attributes, new_attributes)
+        return len(records)
+
+    def rollback(self, transaction=None):
+        """
+        Discard the change records staged in the specified `transaction`
+
+        Args:
+            transaction (mixed): the transaction (`None` discards every staged
+                transaction)
+
+        Returns:
+            int: the number of discarded records
+        """
+        return sum(len(records) for records in self._unstage(transaction))
+
+    def stage(
+        self,
+        transaction,
+        key_attributes,
+        old_attributes,
+        new_attributes
+    ):
+        """
+        Stage a change record in the specified `transaction`, it is appended
+        once the `transaction` is committed (see: `commit`)
+
+        Args:
+            transaction (mixed): the transaction (`None` if the change is
+                already committed, in which case it is appended immediately)
+            key_attributes (dict): the key-attributes of the changed `Model`
+            old_attributes (dict): the old-values of the changed attributes
+            new_attributes (dict): the new-values of the changed attributes
+        """
+        if transaction is None:
+            self.append(key_attributes, old_attributes, new_attributes)
+            return
+        with self._staged_lock:
+            self._staged.setdefault(id(transaction), (transaction, []))[1] \
+                .append((key_attributes, old_attributes, new_attributes))
+
+    def _unstage(self, transaction):
+        """
+        Remove the change records staged in the specified `transaction`
+
+        Args:
+            transaction (mixed): the transaction (`None` for every staged
+                transaction)
+
+        Returns:
+            list (of list): the records of each removed transaction
+        """
+        with self._staged_lock:
+            if transaction is None:
+                staged = list(self._staged.values())
+                self._staged.clear()
+            else:
+                staged = [self._staged.pop(id(transaction), (None, []))]
+        return [records for _, records in staged]
+
+
+class FileJournal(Journal):
+    """
+    Class providing methods for journaling changes to local, append-only,
+    segment-rotated files. Each segment is named after the sequence-number of
+    its first record and holds one compact JSON record per line (keys: `s`
+    sequence-number, `t` timestamp, `k` key-attributes, `o` old-values and `n`
+    new-values), as such segments can be tailed or memory-mapped by readers
+
+    Class Attributes:
+        SEGMENT_SUFFIX (str): the segment file-name suffix
+
+    Instance Attributes:
+        directory_path (str): the directory-path of the segments
+        fsync (bool): if each append should be flushed to disk (`os.fsync`)
+        segment_size (int): the size (in bytes) after which a new segment is
+            started
+    """
+    SEGMENT_SUFFIX = '.journal'
+
+    def __init__(
+        self,
+        directory_path,
+        segment_size=64 * 1024 * 1024,
+        fsync=False
+    ):
+        super(FileJournal, self).__init__()
+        self.directory_path = directory_path
+        self.fsync = fsync
+        self.segment_size = segment_size
+        self._lock = threading.Lock()
+        self._segment = None
+        self._sequence = None
+
+    def append(
+        self,
+        key_attributes,
+        old_attributes,
+        new_attributes
+    ):
+        """
+        Append a change record to the current segment (rotating it first, if it
+        has reached `segment_size`)
+
+        Args:
+            key_attributes (dict): the key-attributes of the changed `Model`
+            old_attributes (dict): the old-values of the changed attributes
+            new_attributes (dict): the new-values of the changed attributes
+
+        Returns:
+            int: the sequence-number of the record
+        """
+        with self._lock:
+            if self._sequence is None:
+                self._sequence = self._last_sequence()
+            sequence = self._sequence + 1
+            line = json.dumps(
+                {
+                    's': sequence,
+                    't': time.time(),
+                    'k': key_attributes,
+                    'o': old_attributes,
+                    'n': new_attributes,
+                },
+                default=_default,
+                separators=(',', ':'),
+                sort_keys=True,
+            ).encode('utf-8') + b'\n'
+            segment = self._segment
+            if segment is None or segment.tell() >= self.segment_size:
+                if segment is not None:
+                    segment.close()
+                segment = self._segment = open(
+                    self._segment_path(sequence), 'ab')
+            segment.write(line)
+            segment.flush()
+            if self.fsync:
+                os.fsync(segment.fileno())
+            self._sequence = sequence
+            return sequence
+
+    def close(self):
+        """
+        Close the current segment (a new one is started by the next `append`)
+        """
+        with self._lock:
+            if self._segment is not None:
+                self._segment.close()
+                self._segment = None
+
+    def read(self, after_sequence=0):
+        """
+        Read the change records (in order) which follow the specified
+        `after_sequence`. Segments which only hold older records are skipped
+        without being opened
+
+        Args:
+            after_sequence (int): the sequence-number of the last record
+                already consumed by the reader
+
+        Yields:
+            dict: the next change record
+        """
+        segment_sequences = self._segment_sequences()
+        for index, segment_sequence in enumerate(segment_sequences):
+            if index + 1 < len(segment_sequences) and \
+                segment_sequences[index + 1] <= after_sequence + 1:
+                continue
+            with open(self._segment_path(segment_sequence), 'rb') as segment:
+                for line in segment:
+                    if not line.endswith(b'\n'):
+                        # a partially written (in-flight) record
+                        break
+                    record = json.loads(line.decode('utf-8'))
+                    if record['s'] > after_sequence:
+                        yield record
+
+    def _last_sequence(self):
+        """
+        Recover the sequence-number of the last record from the last segment.
+        A partially written (torn) record at its end is truncated, as such the
+        next record is not appended to the fragment
+
+        Returns:
+            int: the sequence-number (`0` if there are no records)
+        """
+        segment_sequences = self._segment_sequences()
+        if not segment_sequences:
+            return 0
+        sequence = segment_sequences[-1] - 1
+        size = 0
+        with open(self._segment_path(segment_sequences[-1]), 'r+b') as segment:
+            for line in segment:
+                if not line.endswith(b'\n'):
+                    segment.truncate(size)
+                    break
+                sequence = json.loads(line.decode('utf-8'))['s']
+                size += len(line)
+        return sequence
+
+    def _segment_path(self, segment_sequence):
+        """
+        Generate the file-path of the segment starting at the specified
+        `segment_sequence`
+
+        Args:
+            segment_sequence (int): the sequence-number of the first record
+
+        Returns:
+            str: the file-path
+        """
+        return os.path.join(self.directory_path, '%020d%s' % (segment_sequence,
+            self.SEGMENT_SUFFIX))
+
+    def _segment_sequences(self):
+        """
+        List the (first) sequence-numbers of the existing segments
+
+        Returns:
+            list (of int): the sequence-numbers, in order
+        """
+        suffix = self.SEGMENT_SUFFIX
+        return sorted(
+            int(file_name[:-len(suffix)])
+            for file_name in os.listdir(self.directory_path)
+            if file_name.endswith(suffix)
+        )
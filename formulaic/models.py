@@ -1,31 +1,315 @@
 __all__ = ('Model',)
 
 
-from .attributes import Attribute
+import threading
+
+from collections import deque
+from itertools import chain, islice, repeat
+
+from .attributes import Attribute, LazyModel, LazyModelList
+from .columns import Deferred, Unloaded
+from .constraints import Constraint
+from .errors import INVALID, FieldError, TriggerError, ValidationError
 from .triggers import Trigger
+from .types import FrozenList
+
+
+def _build_chunk(model_class, records):
+    """
+    Build a `Model` instance for each of the specified `records`. This is a
+    module-level function so that it can be shipped to pool workers
+
+    Args:
+        model_class (type): the `Model` class
+        records (list of dict): the raw records
+
+    Returns:
+        list (of tuples): a `(model, error)` tuple for each record
+    """
+    results = []
+    for record in records:
+        try:
+            results.append((model_class(record), None))
+        except Exception as e:
+            results.append((None, e))
+    return results
+
+
+def _chunk(iterable, chunk_size):
+    """
+    Split the specified `iterable` into `list(s)` of at most `chunk_size` items
+
+    Args:
+        iterable (iterable): the iterable
+        chunk_size (int): the maximum number of items per chunk
+
+    Yields:
+        list: the next chunk
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _copy_nested(
+    attribute_data,
+    read_only
+):
+    """
+    Copy the nested `Model` values (see: `LazyModel.copy`) of the specified
+    `attribute_data`
+
+    Args:
+        attribute_data (dict): the `Attribute` data `dict`
+        read_only (bool): if the nested `Model(s)` should be copied as
+            read-only snapshots
+
+    Returns:
+        dict: the specified `attribute_data` if it holds no nested `Model`,
+            otherwise a copy of it
+    """
+    copied_attribute_data = None
+    for attribute_name, attribute_value in attribute_data.items():
+        if isinstance(attribute_value, (LazyModel, LazyModelList)):
+            if copied_attribute_data is None:
+                copied_attribute_data = dict(attribute_data)
+            copied_attribute_data[attribute_name] = \
+                attribute_value.copy(read_only)
+    return attribute_data if copied_attribute_data is None else \
+        copied_attribute_data
+
+
+def _raw_attribute_data(attribute_data):
+    """
+    Convert the nested `Model` values of the specified `attribute_data` to
+    their raw `dict(s)` (as of now, see: `LazyModel.to_raw`)
+
+    Args:
+        attribute_data (dict): the `Attribute` data `dict`
+
+    Returns:
+        dict: the converted copy of the `Attribute` data `dict`
+    """
+    return {
+        attribute_name: attribute_value.to_raw() if isinstance(
+            attribute_value, (LazyModel, LazyModelList)) else attribute_value
+        for attribute_name, attribute_value in attribute_data.items()
+    }
+
+
+def _restore(
+    model_class,
+    values,
+    masks,
+    processed_mask,
+    flags,
+    persistor_name,
+    extra_attribute_data
+):
+    """
+    Rebuild a pickled `Model` instance (see: `Model.__reduce__`) without
+    formatting or validating its values. This is a module-level function so
+    that it can be referenced by the pickle
+
+    Args:
+        model_class (type): the `Model` class
+        values (tuple): the values of the `attribute_data`, the
+            `changed_attribute_data` and the `default_attribute_data` (in that
+            order), each in `pickle_positions` order
+        masks (tuple of int): the (position) bit-mask of the attribute-names
+            present in each of the three `dict(s)`
+        processed_mask (int): the (position) bit-mask of the
+            `processed_attributes`
+        flags (int): bit 0 is set if the `Model` was persisted, bit 1 if it is
+            a read-only snapshot
+        persistor_name (str): the name the `Persistor` was registered under
+            (`None` if the `Model` had no registered `Persistor`)
+        extra_attribute_data (dict): the unmapped items of the
+            `attribute_data` (e.g. a generated key), `None` if there were none
+
+    Returns:
+        Model: the `Model` instance
+
+    Raises:
+        KeyError: if no `Persistor` is registered under the `persistor_name`
+    """
+    model = model_class.__new__(model_class)
+    state = model.__dict__
+    # the `pickle_positions` order
+    attribute_names = sorted(model_class.attribute_metadata)
+    values = iter(values)
+    for name, mask in zip(('_attribute_data', '_changed_attribute_data',
+        '_default_attribute_data'), masks):
+        if mask:
+            state[name] = {
+                attribute_name: next(values)
+                for position, attribute_name in enumerate(attribute_names)
+                if mask >> position & 1
+            }
+    if extra_attribute_data:
+        model.stored_attribute_data.update(extra_attribute_data)
+    if processed_mask:
+        state['_processed_attributes'] = set(
+            attribute_name
+            for position, attribute_name in enumerate(attribute_names)
+            if processed_mask >> position & 1
+        )
+    persistor = None
+    if persistor_name is not None:
+        # imported on first use, only a `Model` with a `Persistor` needs it
+        from .persistors import Persistor
+        persistor = Persistor.lookup(persistor_name)
+    state.update(
+        _initialized=True,
+        _journal=None,
+        _persistor=persistor,
+    )
+    if flags & 1:
+        state['_persisted'] = True
+    if flags & 2:
+        state['_read_only'] = True
+    return model
+
+
+def _validate_chunk(model_class, records):
+    """
+    Build and validate a `Model` instance for each of the specified `records`.
+    This is a module-level function so that it can be shipped to pool workers
+
+    Args:
+        model_class (type): the `Model` class
+        records (list of dict): the raw records
+
+    Returns:
+        list (of tuples): a `(result, error)` tuple for each record
+    """
+    return [
+        (model.validate(), None) if error is None else (False, error)
+        for model, error in _build_chunk(model_class, records)
+    ]
+
+
+_UNRESOLVED = object()
+
+# the per-instance state of the deferred/dispatched `Trigger(s)`, it is never
+# shared with a copy
+_TRIGGER_STATE = (
+    '_queued_triggers',
+    '_trigger_condition',
+    '_trigger_draining',
+    '_trigger_errors',
+)
+
+
+class _classproperty(object):
+    """
+    Descriptor providing a read-only property which may be accessed via the
+    class as well as via an instance (the getter is always passed the class)
+    """
+    def __init__(self, getter):
+        self.getter = getter
+        self.__doc__ = getter.__doc__
+
+    def __get__(self, instance, owner):
+        return self.getter(owner)
 
 
-class Model(object):
+class _ModelType(type):
+    """
+    Metaclass of `Model`, the `Constraint(s)` of each `Model` class are
+    compiled (and checked) when the class is created
+    """
+    def __init__(cls, name, bases, namespace):
+        """
+        Compile the `Constraint` meta-data and its dependency graph
+
+        Raises:
+            AttributeError: if a `Constraint` depends on an unmapped attribute
+        """
+        super(_ModelType, cls).__init__(name, bases, namespace)
+        constraint_metadata = {
+            constraint_name: constraint
+            for constraint_name, constraint in namespace.items()
+            if isinstance(constraint, Constraint)
+        }
+        constraint_dependencies = {}
+        for constraint_name, constraint in sorted(constraint_metadata.items()):
+            for attribute_name in sorted(constraint.attribute_names):
+                if not isinstance(namespace.get(attribute_name), Attribute):
+                    raise AttributeError('Unmapped attribute: {} in '
+                        'constraint: {} of model: {}'.format(attribute_name,
+                        constraint_name, name))
+                constraint_dependencies.setdefault(attribute_name,
+                    []).append(constraint_name)
+        cls._constraint_metadata = constraint_metadata
+        cls._constraint_dependencies = {
+            attribute_name: tuple(constraint_names)
+            for attribute_name, constraint_names in
+                constraint_dependencies.items()
+        }
+
+
+# (Python 2 and 3 compatible) base-class which applies the `_ModelType`
+_ModelBase = _ModelType('_ModelBase', (object,), {})
+
+
+class Model(_ModelBase):
     """
     Class representing a "Model"
 
     Class Attributes/Properties:
         attribute_metadata (lazy-dict, stored as `_attribute_metadata`): the
             `Attribute` meta-data `dict`
+        attribute_positions (lazy-dict, stored as `_attribute_positions`): the
+            position of each `Attribute` in `attribute_metadata`
+        constant_default_attribute_data (lazy-dict, stored as
+            `_constant_default_attribute_data`): the (shared) `default` values
+            of the `Attribute(s)` with a constant `default`
+        constraint_dependencies (dict, stored as `_constraint_dependencies`):
+            the dependency graph of the `Constraint(s)`, the names of the
+            `Constraint(s)` which depend on each `Attribute` (compiled, and
+            checked, when the class is created)
+        constraint_metadata (dict, stored as `_constraint_metadata`): the
+            `Constraint` meta-data `dict` (compiled when the class is created)
+        pickle_positions (lazy-dict, stored as `_pickle_positions`): the
+            position of each `Attribute` in a pickle (see: `__reduce__`)
         trigger_metadata (lazy-dict, stored as `_trigger_metadata`): the
             `Trigger` meta-data `dict`
 
     Instance Attributes/Properties:
         attribute_data (lazy-dict, stored as `_attribute_data`): the `Attribute`
-            data `dict`
+            data `dict`, the `default` values are materialized in it (and the
+            loaded values which have not been read yet are resolved) when it
+            is read
         changed_attribute_data (lazy-dict, stored as `_changed_attribute_data`):
             the changed `Attribute` data `dict`
+        constraint_results (lazy-dict, stored as `_constraint_results`): the
+            cached result of each `Constraint` which has been evaluated since
+            one of its `Attribute(s)` was last changed
+        default_attribute_data (lazy-dict, stored as `_default_attribute_data`):
+            the resolved `default` values of the `Attribute(s)` with a callable
+            `default` (these are resolved on demand)
         initialized (bool): the initialization status
+        journal (Journal): the `Journal` instance
         merged_attribute_data (derived-dict): the result of merging the
             `attribute_data` (`dict`) and `changed_attribute_data` (`dict`)
+        persisted (bool): if the `Model` was loaded via, or has been persisted
+            via, a `Persistor`
         persistor (Persistor): the `Persistor` instance
         processed_attributes (lazy-set, stored as `_processed_attributes`): the
             attribute-names of the processed `Attribute(s)`
+        read_only (bool): if the `Model` is a read-only snapshot
+        stored_attribute_data (lazy-dict, stored as `_attribute_data`): the
+            `attribute_data` as it is stored, it only holds the supplied (or
+            loaded) values (the `default` values are resolved on demand) and a
+            loaded value which has not been read yet is kept as a `Deferred` or
+            `Unloaded` marker
+        stored_merged_attribute_data (derived-dict): the result of merging the
+            `stored_attribute_data` (`dict`) and `changed_attribute_data`
+            (`dict`), this is what is persisted
     """
     def __init__(
         self,
@@ -52,38 +336,349 @@ class Model(object):
         # and `persist` is called, a `NotImplementedError` will be raised
         self.persistor = kwargs.pop('persistor', None)
 
+        # store the `Journal` instance on the `Model`. If one is provided the
+        # changes are appended to it each time `persist` succeeds
+        self.journal = kwargs.pop('journal', None)
+
         # support both a [single] positional argument of a `dict`, as well as
         # keyword arguments
         attributes = args[0] if args and isinstance(args[0], dict) else kwargs
 
-        # ensure that only mapped-attributes are set. The `default` value will
-        # be returned for any missing/omitted attribute when action is taken on
-        # the `Model` (e.g. `persist` or `validate` is called)
-        for attribute_name, attribute in self.attribute_metadata.items():
-            if attribute_name in attributes:
-                setattr(
-                    self,
-                    attribute_name,
-                    attributes[attribute_name]
-                )
+        # ensure that only mapped-attributes are set (in the order they are
+        # mapped). The `default` value will be resolved for any missing/omitted
+        # attribute when it is read or action is taken on the `Model` (e.g.
+        # `persist` or `validate` is called)
+        for attribute_name in self._mapped_attribute_names(attributes):
+            setattr(
+                self,
+                attribute_name,
+                attributes[attribute_name]
+            )
 
         # Set the `initialized` to `True`, we are done
         self.initialized = True
 
+    @classmethod
+    def build_many(
+        cls,
+        records,
+        workers=None,
+        chunk_size=1000,
+        persistor=None
+    ):
+        """
+        Build a `Model` instance for each of the specified `records`, sharding
+        the work across a process-pool. Only the raw records and the class
+        reference are shipped to the workers, as such the `Model` class must be
+        importable (e.g. defined at module-level)
+
+        Args:
+            records (iterable of dict): the raw records
+            workers (int): the number of worker processes (defaults to the
+                number of CPUs, `1` builds in-process)
+            chunk_size (int): the number of records shipped to a worker at once
+            persistor (Persistor): the `Persistor` instance to attach to each
+                successfully built `Model`
+
+        Returns:
+            list (of tuples): a `(model, error)` tuple for each record (in
+                order). `model` is `None` if building the record failed, in
+                which case `error` is the raised exception
+
+        Raises:
+            RuntimeError: if the `concurrent.futures` library was not
+                successfully loaded
+        """
+        results = cls._map_chunks(_build_chunk, records, workers, chunk_size)
+        if persistor is not None:
+            for model, _ in results:
+                if model is not None:
+                    model.persistor = persistor
+        return results
+
+    @classmethod
+    def load(
+        cls,
+        persistor,
+        **key_attributes
+    ):
+        """
+        Load a `Model` instance, by key, via the specified `persistor`
+
+        Args:
+            persistor (Persistor): the `Persistor` instance
+            **key_attributes (dict): the key-attributes
+
+        Returns:
+            Model: the loaded `Model` instance, or `None` if there is no match
+
+        Raises:
+            ValueError: if any loaded `attribute_value` could not be formatted
+                or is invalid
+        """
+        attributes = persistor.load(key_attributes,
+            cls.attribute_metadata.keys())
+        if attributes is None:
+            return None
+        model = cls(attributes, persistor=persistor)
+        model.persisted = True
+        return model
+
+    @classmethod
+    def page(
+        cls,
+        persistor,
+        attribute_names=None,
+        after=None,
+        limit=100,
+        **filters
+    ):
+        """
+        Load a page of `Model` instances, in key order, via the specified
+        `persistor` (see: `SQLPersistor.page`). Only the specified
+        `attribute_names` (and the key-attributes) are selected and formatted,
+        the other attributes are `Unloaded`: they are fetched (in a single
+        query per `Model`) if one of them is read and are not written back by
+        `persist` unless they are set
+
+        Args:
+            persistor (Persistor): the `Persistor` instance
+            attribute_names (iterable of str): the attribute-names to select (if
+                omitted every attribute is selected)
+            after (mixed): the `Model` (or its key-attributes) the page starts
+                after, e.g. the last `Model` of the previous page (if omitted
+                the first page is loaded)
+            limit (int): the maximum number of `Model(s)`
+            **filters (dict): the filters (see: `SQLPersistor.count`)
+
+        Returns:
+            list (of Model): the loaded `Model` instances
+
+        Raises:
+            ValueError: if any loaded `attribute_value` could not be formatted
+                or is invalid
+        """
+        key_attribute_names = persistor.key_attribute_names
+        if isinstance(after, Model):
+            after = {
+                attribute_name: after.get_attribute_value(attribute_name)
+                for attribute_name in key_attribute_names
+            }
+        if attribute_names is None:
+            attribute_names = list(cls.attribute_metadata)
+            unloaded_attribute_names = ()
+        else:
+            attribute_names = list(attribute_names)
+            unloaded_attribute_names = [
+                attribute_name
+                for attribute_name in cls.attribute_metadata
+                if attribute_name not in attribute_names and
+                    attribute_name not in key_attribute_names
+            ]
+        models = []
+        for attributes in persistor.page(attribute_names, after, limit,
+            **filters):
+            if unloaded_attribute_names:
+                attributes.update(Unloaded.columns(persistor, {
+                    attribute_name: attributes[attribute_name]
+                    for attribute_name in key_attribute_names
+                }, unloaded_attribute_names))
+            model = cls(attributes, persistor=persistor)
+            model.persisted = True
+            models.append(model)
+        return models
+
+    @classmethod
+    def try_build(
+        cls,
+        attributes,
+        persistor=None,
+        journal=None
+    ):
+        """
+        Build a `Model` instance from the specified `attributes` without
+        raising. Every attribute is formatted and validated once (including
+        the omitted ones, which take their `default` value), then every
+        `Constraint` whose attributes are valid is checked, and all of the
+        errors are reported in a single pass. The error messages are only built
+        when they are read
+
+        Args:
+            attributes (dict): the attributes
+            persistor (Persistor): the `Persistor` instance
+            journal (Journal): the `Journal` instance
+
+        Returns:
+            tuple: a `(model, errors)` tuple, `errors` is a `dict` of
+                `FieldError(s)` (key: `attribute_name`, or the name of the
+                `Constraint`) and `model` is `None` if it is non-empty
+        """
+        model = cls(persistor=persistor, journal=journal)
+        model.initialized = False
+        attribute_metadata = cls.attribute_metadata
+        errors = {}
+        attribute_names = cls._mapped_attribute_names(attributes)
+        for attribute_name in attribute_names:
+            attribute = attribute_metadata[attribute_name]
+            attribute_value = attributes[attribute_name]
+            new_attribute_value = attribute.try_format(attribute_value)
+            if new_attribute_value is INVALID:
+                errors[attribute_name] = FieldError(attribute_name,
+                    attribute_value, FieldError.FORMAT)
+            elif not attribute.validate(new_attribute_value):
+                errors[attribute_name] = FieldError(attribute_name,
+                    attribute_value, FieldError.INVALID)
+            else:
+                model._set_attribute_value(attribute_name,
+                    new_attribute_value)
+        model.initialized = True
+        # the supplied attributes have been validated above, only the omitted
+        # ones (their `default` value) remain
+        attribute_names = frozenset(attribute_names)
+        for attribute_name, attribute in attribute_metadata.items():
+            if attribute_name in attribute_names:
+                continue
+            attribute_value = model._stored_attribute_value(attribute_name)
+            if not attribute.validate(attribute_value):
+                errors[attribute_name] = FieldError(attribute_name,
+                    attribute_value, FieldError.INVALID)
+        # the results are cached, they are not re-evaluated by `validate`
+        constraint_results = model.constraint_results
+        for constraint_name, constraint in cls.constraint_metadata.items():
+            if not constraint.attribute_names.isdisjoint(errors):
+                continue
+            result = constraint_results[constraint_name] = \
+                constraint.check(model)
+            if not result:
+                errors[constraint_name] = FieldError(constraint_name,
+                    constraint.message, FieldError.CONSTRAINT)
+        return (None, errors) if errors else (model, errors)
+
+    @classmethod
+    def validate_many(
+        cls,
+        records,
+        workers=None,
+        chunk_size=1000
+    ):
+        """
+        Build and validate a `Model` instance for each of the specified
+        `records`, sharding the work across a process-pool. Only the raw records
+        and the class reference are shipped to the workers (and only the
+        results are shipped back), as such the `Model` class must be importable
+        (e.g. defined at module-level)
+
+        Args:
+            records (iterable of dict): the raw records
+            workers (int): the number of worker processes (defaults to the
+                number of CPUs, `1` validates in-process)
+            chunk_size (int): the number of records shipped to a worker at once
+
+        Returns:
+            list (of tuples): a `(result, error)` tuple for each record (in
+                order). `result` is `False` if building the record failed, in
+                which case `error` is the raised exception
+
+        Raises:
+            RuntimeError: if the `concurrent.futures` library was not
+                successfully loaded
+        """
+        return cls._map_chunks(_validate_chunk, records, workers, chunk_size)
+
+    @classmethod
+    def _mapped_attribute_names(cls, attributes):
+        """
+        Determine which of the specified `attributes` are mapped, in the order
+        they are mapped (the cost is proportional to the number of
+        `attributes`, not to the number of mapped `Attribute(s)`)
+
+        Args:
+            attributes (dict): the attributes
+
+        Returns:
+            list (of str): the mapped attribute-names
+        """
+        attribute_positions = cls.attribute_positions
+        return sorted(
+            (
+                attribute_name
+                for attribute_name in attributes
+                if attribute_name in attribute_positions
+            ),
+            key=attribute_positions.__getitem__
+        )
+
+    @classmethod
+    def _map_chunks(
+        cls,
+        function,
+        records,
+        workers,
+        chunk_size
+    ):
+        """
+        Apply the specified `function` to chunks of the specified `records`,
+        either in-process (if `workers` is `1`) or across a process-pool
+
+        Args:
+            function (callable): a module-level function accepting the `Model`
+                class and a chunk of records and returning a `list` of results
+            records (iterable of dict): the raw records
+            workers (int): the number of worker processes
+            chunk_size (int): the number of records per chunk
+
+        Returns:
+            list: the (flattened) results, in order
+
+        Raises:
+            RuntimeError: if the `concurrent.futures` library was not
+                successfully loaded
+        """
+        chunks = _chunk(records, chunk_size)
+        if workers == 1:
+            return list(chain.from_iterable(
+                function(cls, chunk) for chunk in chunks))
+        # imported on first use, it is costly to import
+        try:
+            from concurrent import futures
+        except Exception:
+            raise RuntimeError
+        with futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(chain.from_iterable(executor.map(
+                function, repeat(cls), chunks)))
+
     @property
     def attribute_data(self):
         """
-        Lazy load and return the `Attribute` data `dict`
+        Get the `Attribute` data `dict`. The `default` value of every attribute
+        which has not been set is materialized in it, and the loaded values
+        which have not been read yet (see: `stored_attribute_data`) are
+        resolved (decoded, fetched and formatted) first
 
         Returns:
             dict: the `Attribute` data `dict` (key: `attribute_name`)
+
+        Raises:
+            ValueError: if a loaded value could not be decoded, formatted or is
+                invalid
         """
-        if not hasattr(self, '_attribute_data'):
-            self.__dict__['_attribute_data'] = {
-                attribute_name: attribute.default()
-                for attribute_name, attribute in self.attribute_metadata.items()
-            }
-        return self._attribute_data
+        attribute_data = self.stored_attribute_data
+        attribute_names = [
+            attribute_name
+            for attribute_name in self.attribute_metadata
+            if attribute_name not in attribute_data
+        ]
+        if attribute_names:
+            if self.__dict__.get('_attribute_data_shared'):
+                # the baseline is shared with a copy, it is not changed
+                attribute_data = self.attribute_data = dict(attribute_data)
+            for attribute_name in attribute_names:
+                attribute_data[attribute_name] = \
+                    self._default_attribute_value(attribute_name)
+        for attribute_name, attribute_value in list(attribute_data.items()):
+            if isinstance(attribute_value, Deferred):
+                self._resolve_deferred(attribute_name, attribute_value)
+        return attribute_data
 
     @attribute_data.setter
     def attribute_data(self, value):
@@ -94,16 +689,16 @@ class Model(object):
             value (dict): the _new_ `Attribute` data `dict`
         """
         self._attribute_data = value
+        self.__dict__.pop('_attribute_data_shared', None)
 
-    @property
-    def attribute_metadata(self):
+    @_classproperty
+    def attribute_metadata(cls):
         """
         Lazy load and return the `Attribute` meta-data `dict`
 
         Returns:
             dict: the `Attribute` meta-data (key: `attribute_name`)
         """
-        cls = type(self)
         if not hasattr(cls, '_attribute_metadata'):
             cls._attribute_metadata = {
                 attribute_name: attribute
@@ -112,6 +707,23 @@ class Model(object):
             }
         return cls._attribute_metadata
 
+    @_classproperty
+    def attribute_positions(cls):
+        """
+        Lazy load and return the position of each `Attribute` in
+        `attribute_metadata`
+
+        Returns:
+            dict: the positions (key: `attribute_name`)
+        """
+        if not hasattr(cls, '_attribute_positions'):
+            cls._attribute_positions = {
+                attribute_name: position
+                for position, attribute_name in
+                    enumerate(cls.attribute_metadata)
+            }
+        return cls._attribute_positions
+
     @property
     def changed_attribute_data(self):
         """
@@ -124,6 +736,70 @@ class Model(object):
             self._changed_attribute_data = dict()
         return self._changed_attribute_data
 
+    @_classproperty
+    def constant_default_attribute_data(cls):
+        """
+        Lazy load and return the (shared) `default` values of the
+        `Attribute(s)` with a constant `default`
+
+        Returns:
+            dict: the `default` values (key: `attribute_name`)
+        """
+        if not hasattr(cls, '_constant_default_attribute_data'):
+            cls._constant_default_attribute_data = {
+                attribute_name: attribute.default()
+                for attribute_name, attribute in cls.attribute_metadata.items()
+                if attribute.constant_default
+            }
+        return cls._constant_default_attribute_data
+
+    @_classproperty
+    def constraint_dependencies(cls):
+        """
+        Get the dependency graph of the `Constraint(s)` (see: `_ModelType`)
+
+        Returns:
+            dict: the names of the `Constraint(s)` which depend on each
+                `Attribute` (key: `attribute_name`)
+        """
+        return cls._constraint_dependencies
+
+    @_classproperty
+    def constraint_metadata(cls):
+        """
+        Get the `Constraint` meta-data `dict` (see: `_ModelType`)
+
+        Returns:
+            dict: the `Constraint` meta-data (key: the name of the
+                `Constraint`)
+        """
+        return cls._constraint_metadata
+
+    @property
+    def constraint_results(self):
+        """
+        Lazy load and return the cached `Constraint` results
+
+        Returns:
+            dict: the cached results (key: the name of the `Constraint`)
+        """
+        if not hasattr(self, '_constraint_results'):
+            self._constraint_results = dict()
+        return self._constraint_results
+
+    @property
+    def default_attribute_data(self):
+        """
+        Lazy load and return the resolved `default` values of the
+        `Attribute(s)` with a callable `default`
+
+        Returns:
+            dict: the resolved `default` values (key: `attribute_name`)
+        """
+        if not hasattr(self, '_default_attribute_data'):
+            self._default_attribute_data = dict()
+        return self._default_attribute_data
+
     @property
     def initialized(self):
         """
@@ -144,15 +820,66 @@ class Model(object):
         """
         self._initialized = value
 
+    @property
+    def journal(self):
+        """
+        Get the `Journal`
+
+        Return:
+            Journal: the `Journal` instance
+        """
+        return self._journal
+
+    @journal.setter
+    def journal(self, value):
+        """
+        Set the `Journal`
+
+        Args:
+            value (Journal): the _new_ `Journal` [instance]
+        """
+        self._journal = value
+
     @property
     def merged_attribute_data(self):
         """
-        Get the merged `Attribute` data `dict` (this *is not* memoized)
+        Get the merged `Attribute` data `dict` (this *is not* memoized), the
+        loaded values which have not been read yet (see:
+        `stored_merged_attribute_data`) are resolved first
 
         Returns:
             dict: the merged `Attribute` data `dict` (key: `attribute_name`)
+
+        Raises:
+            ValueError: if a loaded value could not be decoded, formatted or is
+                invalid
+        """
+        merged_attribute_data = self.stored_merged_attribute_data
+        for attribute_name, attribute_value in merged_attribute_data.items():
+            if isinstance(attribute_value, Deferred):
+                merged_attribute_data[attribute_name] = \
+                    self._resolve_deferred(attribute_name, attribute_value)
+        return merged_attribute_data
+
+    @property
+    def persisted(self):
+        """
+        Get the persistence status
+
+        Returns:
+            bool: the persistence status
+        """
+        return self.__dict__.get('_persisted', False)
+
+    @persisted.setter
+    def persisted(self, value):
+        """
+        Set the persistence status
+
+        Args:
+            value (bool): the _new_ persistence status
         """
-        return dict(self.attribute_data, **self.changed_attribute_data)
+        self._persisted = value
 
     @property
     def persistor(self):
@@ -174,6 +901,25 @@ class Model(object):
         """
         self._persistor = value
 
+    @_classproperty
+    def pickle_positions(cls):
+        """
+        Lazy load and return the position of each `Attribute` in a pickle. The
+        positions are in attribute-name order, rather than in
+        `attribute_metadata` order, which depends on the (hash-seeded) order
+        of the class `__dict__` prior to Python 3.6
+
+        Returns:
+            dict: the positions (key: `attribute_name`)
+        """
+        if not hasattr(cls, '_pickle_positions'):
+            cls._pickle_positions = {
+                attribute_name: position
+                for position, attribute_name in
+                    enumerate(sorted(cls.attribute_metadata))
+            }
+        return cls._pickle_positions
+
     @property
     def processed_attributes(self):
         """
@@ -187,14 +933,62 @@ class Model(object):
         return self._processed_attributes
 
     @property
-    def trigger_metadata(self):
+    def read_only(self):
+        """
+        Get the read-only status
+
+        Returns:
+            bool: the read-only status
+        """
+        return self.__dict__.get('_read_only', False)
+
+    @property
+    def stored_attribute_data(self):
+        """
+        Lazy load and return the `Attribute` data `dict` as it is stored: only
+        the supplied (or loaded) values are held (the `default` values are not
+        materialized) and a loaded value which has not been read yet is kept as
+        a `Deferred` (not decoded) or `Unloaded` (not fetched) marker
+
+        Returns:
+            dict: the `Attribute` data `dict` (key: `attribute_name`)
+        """
+        if not hasattr(self, '_attribute_data'):
+            self.__dict__['_attribute_data'] = dict()
+        return self._attribute_data
+
+    @property
+    def stored_merged_attribute_data(self):
+        """
+        Get the merged `Attribute` data `dict` as it is stored (this *is not*
+        memoized), see: `stored_attribute_data`. This is what is persisted: a
+        `Deferred` value is written back as-is and an `Unloaded` value is not
+        written
+
+        Returns:
+            dict: the merged `Attribute` data `dict` (key: `attribute_name`)
+        """
+        attribute_data = self.stored_attribute_data
+        changed_attribute_data = self.changed_attribute_data
+        merged_attribute_data = dict(self.constant_default_attribute_data)
+        for attribute_name, attribute in self.attribute_metadata.items():
+            if not attribute.constant_default and \
+                attribute_name not in attribute_data and \
+                attribute_name not in changed_attribute_data:
+                merged_attribute_data[attribute_name] = \
+                    self._default_attribute_value(attribute_name)
+        merged_attribute_data.update(attribute_data)
+        merged_attribute_data.update(changed_attribute_data)
+        return merged_attribute_data
+
+    @_classproperty
+    def trigger_metadata(cls):
         """
         Lazy load and return the `Trigger` meta-data `dict`
 
         Returns:
             dict: the `Trigger` meta-data `dict` (key: `attribute_names`)
         """
-        cls = type(self)
         if not hasattr(cls, '_trigger_metadata'):
             cls._trigger_metadata = {
                 trigger.attribute_names: trigger
@@ -203,6 +997,65 @@ class Model(object):
             }
         return cls._trigger_metadata
 
+    def __reduce__(self):
+        """
+        Get the compact pickle of the `Model`: the class reference, the stored
+        values (positionally, in `pickle_positions` order) and the bit-masks
+        of which attributes are set, changed, defaulted and processed. It is
+        rebuilt without formatting or validating its values.
+        `Unloaded` values are fetched first. The `Persistor` is referred to by
+        the name it was registered under (see: `Persistor.register`), an
+        unregistered `Persistor` and the `Journal` are not pickled (the copy is
+        detached from them), nor are the pending (deferred or dispatched)
+        `Trigger` handlers. The pickle must be loaded with the same `Model`
+        class definition (the same attribute-names), it does not depend on the
+        process (e.g. its hash seed)
+
+        Returns:
+            tuple: the pickle
+        """
+        pickle_positions = self.pickle_positions
+        state = self.__dict__
+        # an `Unloaded` value refers to the `Persistor`, it is fetched first
+        for attribute_name, attribute_value in list(
+            state.get('_attribute_data', {}).items()):
+            if isinstance(attribute_value, Unloaded):
+                self._resolve_deferred(attribute_name, attribute_value)
+        values = []
+        masks = []
+        extra_attribute_data = None
+        for name in ('_attribute_data', '_changed_attribute_data',
+            '_default_attribute_data'):
+            attribute_data = state.get(name)
+            mask = 0
+            if attribute_data:
+                positioned = []
+                for attribute_name, attribute_value in attribute_data.items():
+                    position = pickle_positions.get(attribute_name)
+                    if position is None:
+                        if extra_attribute_data is None:
+                            extra_attribute_data = {}
+                        extra_attribute_data[attribute_name] = attribute_value
+                    else:
+                        mask |= 1 << position
+                        positioned.append((position, attribute_value))
+                positioned.sort(key=lambda item: item[0])
+                values.extend(
+                    attribute_value for _, attribute_value in positioned)
+            masks.append(mask)
+        processed_mask = 0
+        for attribute_name in state.get('_processed_attributes', ()):
+            processed_mask |= 1 << pickle_positions[attribute_name]
+        return (_restore, (
+            type(self),
+            tuple(values),
+            tuple(masks),
+            processed_mask,
+            (1 if self.persisted else 0) | (2 if self.read_only else 0),
+            getattr(state.get('_persistor'), 'registry_name', None),
+            extra_attribute_data,
+        ))
+
     def __setattr__(
         self,
         attribute_name,
@@ -221,70 +1074,590 @@ class Model(object):
             attribute_value (mixed): the attribute-value
 
         Raises:
-            ValueError: if the `attribute_value` could not be formatted or is
-                invalid
+            FormatError: if the `attribute_value` could not be formatted
+            ValidationError: if the `attribute_value` is invalid
         """
         attribute = self.attribute_metadata.get(attribute_name)
         if not attribute:
             super(Model, self).__setattr__(attribute_name, attribute_value)
             return
+        if self.read_only:
+            raise AttributeError('Cannot set attribute: {} on a read-only '
+                'snapshot'.format(attribute_name))
         new_attribute_value = attribute.format(attribute_value)
         if not attribute.validate(new_attribute_value):
-            raise ValueError('Invalid value: {} for attribute: {}'.format(
-                attribute_value, attribute_name))
-        old_attribute_value = self.changed_attribute_data.get(attribute_name,
-            self.attribute_data.get(attribute_name))
-        if not self.initialized:
-            self.attribute_data[attribute_name] = new_attribute_value
-        elif attribute_name not in self.attribute_data or \
-            new_attribute_value != old_attribute_value:
-            self.changed_attribute_data[attribute_name] = new_attribute_value
-        else:
-            self.changed_attribute_data.pop(attribute_name, None)
-            self.processed_attributes.discard(attribute_name)
-            return
-        self.processed_attributes.add(attribute_name)
-        for attribute_names, trigger in self.trigger_metadata.items():
-            if attribute_name in attribute_names and \
-                self.processed_attributes >= attribute_names:
-                trigger.trigger(
-                    old_attribute_value,
-                    new_attribute_value,
-                    self
-                )
+            raise ValidationError('Invalid value: {} for attribute: {}',
+                attribute_value, attribute_name)
+        self._set_attribute_value(attribute_name, new_attribute_value)
+
+    def clone(self):
+        """
+        Create an editable copy of the `Model`. The copy shares the baseline
+        `attribute_data` with this `Model` (copy-on-write) and diverges only
+        through its own `changed_attribute_data`, as such the cost is
+        proportional to the number of changed attributes
+
+        Returns:
+            Model: the copy
+        """
+        return self._copy(False)
+
+    def failed_constraints(self):
+        """
+        Determine which `Constraint(s)` do not hold. Only the `Constraint(s)`
+        which depend on an `Attribute` changed since they were last evaluated
+        are evaluated, the others are taken from `constraint_results`
+
+        Returns:
+            dict: the failed `Constraint(s)` (key: the name of the `Constraint`)
+
+        Raises:
+            AttributeError: if a `Constraint` depends on an unmapped attribute
+        """
+        constraint_metadata = self.constraint_metadata
+        if not constraint_metadata:
+            return {}
+        constraint_results = self.constraint_results
+        failed_constraints = {}
+        for constraint_name, constraint in constraint_metadata.items():
+            result = constraint_results.get(constraint_name)
+            if result is None:
+                result = constraint_results[constraint_name] = \
+                    constraint.check(self)
+            if not result:
+                failed_constraints[constraint_name] = constraint
+        return failed_constraints
+
+    def flush_triggers(self):
+        """
+        Run the queued `Trigger` handlers, in the order they were queued (an
+        error does not stop the remaining handlers): the deferred ones are run
+        here, the dispatched ones on their executor (this waits for them)
+
+        Returns:
+            list (of tuples): a `(trigger, error)` tuple for each handler which
+                raised since the last flush
+        """
+        state = self.__dict__
+        condition = state.get('_trigger_condition')
+        if condition is None:
+            return []
+        current_thread = threading.current_thread()
+        with condition:
+            if state.get('_trigger_draining') is current_thread:
+                # called by a deferred handler, the queue is already being run
+                return []
+        while True:
+            with condition:
+                while state.get('_trigger_draining'):
+                    condition.wait()
+                queued_triggers = state.get('_queued_triggers')
+                if not queued_triggers:
+                    return state.pop('_trigger_errors', [])
+                trigger, old_attribute_value, new_attribute_value = \
+                    queued_triggers[0]
+                if trigger.deferred:
+                    queued_triggers.popleft()
+                    state['_trigger_draining'] = current_thread
+                else:
+                    state['_trigger_draining'] = True
+            if not trigger.deferred:
+                self._submit_triggers(trigger.executor)
+                continue
+            # a handler may set attributes and, in turn, queue more handlers
+            try:
+                trigger.trigger(old_attribute_value, new_attribute_value, self)
+            except Exception as e:
+                with condition:
+                    state.setdefault('_trigger_errors', []).append((trigger, e))
+            with condition:
+                state['_trigger_draining'] = False
+                condition.notify_all()
+
+    def get_attribute_value(self, attribute_name):
+        """
+        Get the (current) value of an attribute, resolving its `default` value
+        if it has not been set. A `Deferred` (loaded) value is decoded, and a
+        nested `Model` (see: `ModelAttribute`) is built, on first access
+
+        Args:
+            attribute_name (str): the attribute-name
+
+        Returns:
+            mixed: the attribute-value
+
+        Raises:
+            AttributeError: if the `attribute_name` does not refer to a mapped
+                `Attribute`
+            ValueError: if a `Deferred` value could not be decoded, formatted or
+                is invalid, or a nested `Model` could not be built
+        """
+        attribute_value = self._stored_attribute_value(attribute_name)
+        if isinstance(attribute_value, Deferred):
+            attribute_value = self._resolve_deferred(attribute_name,
+                attribute_value)
+        if isinstance(attribute_value, (LazyModel, LazyModelList)):
+            # a change to a child is reported to this `Model`
+            attribute_value.owner = (self, attribute_name)
+            if isinstance(attribute_value, LazyModel):
+                return attribute_value.model
+        return attribute_value
 
     def persist(self):
         """
-        Persist the `Model`
+        Persist the `Model`. The changes are staged in the `Journal` (if any)
+        until the transaction is committed (see: `Journal.commit`)
 
         Returns:
             bool: the result
 
         Raises:
             RuntimeError: if the `Persistor` [instance] is `None`
+            TriggerError: if a (deferred or dispatched) `Trigger` handler raised
         """
         persistor = self.persistor
         if persistor is None:
             raise RuntimeError
+        errors = self.flush_triggers()
+        if errors:
+            raise TriggerError(errors)
         if not self.validate():
             return False
-        merged_attribute_data = self.merged_attribute_data
+        merged_attribute_data = self.stored_merged_attribute_data
         key_attribute_data = persistor.persist(merged_attribute_data)
         if key_attribute_data is None:
             return False
-        self.attribute_data = dict(merged_attribute_data, **key_attribute_data)
-        self.changed_attribute_data.clear()
+        self._mark_persisted(merged_attribute_data, key_attribute_data)
         return True
 
+    def snapshot(self):
+        """
+        Create a read-only copy of the `Model` (e.g. a "before" copy for
+        auditing). The copy shares the baseline `attribute_data` with this
+        `Model` (copy-on-write), is detached from the `Persistor` and `Journal`
+        and raises an `AttributeError` if an attribute is set on it
+
+        Returns:
+            Model: the copy
+        """
+        return self._copy(True)
+
     def validate(self):
         """
-        Validate the `Model`
+        Validate the `Model`: every `Attribute` value, then every `Constraint`
+        (see: `failed_constraints`). The nested `Model(s)` of a changed value
+        are built (and validated) even if they have not been read
 
         Returns:
             bool: the result
         """
-        merged_attribute_data = self.merged_attribute_data
+        for attribute_value in self.changed_attribute_data.values():
+            if isinstance(attribute_value, (LazyModel, LazyModelList)) and \
+                not attribute_value.build():
+                return False
+        merged_attribute_data = self.stored_merged_attribute_data
         return all(
             attribute.validate(merged_attribute_data[attribute_name])
             for attribute_name, attribute in self.attribute_metadata.items()
+        ) and not self.failed_constraints()
+
+    def _child_changed(
+        self,
+        attribute_name,
+        container
+    ):
+        """
+        Record that a nested `Model` of the specified `container` (the value of
+        the specified `attribute_name`) is about to change in place: the
+        attribute is marked as changed and the baseline keeps a (detached) copy
+        of the value from before the change
+
+        Args:
+            attribute_name (str): the attribute-name
+            container (mixed): the `LazyModel` or `LazyModelList` instance
+
+        Raises:
+            AttributeError: if this `Model` is a read-only snapshot
+        """
+        if self._stored_attribute_value(attribute_name) is not container:
+            # the child was replaced, it is no longer part of this `Model`
+            return
+        if self.read_only:
+            raise AttributeError('Cannot change attribute: {} of a read-only '
+                'snapshot'.format(attribute_name))
+        changed_attribute_data = self.changed_attribute_data
+        if attribute_name not in changed_attribute_data:
+            self._notify_container()
+            attribute_data = self.stored_attribute_data
+            if attribute_name in attribute_data:
+                if self.__dict__.get('_attribute_data_shared'):
+                    attribute_data = self.attribute_data = dict(attribute_data)
+                attribute_data[attribute_name] = type(container)(
+                    container.model_class, container.to_raw())
+            changed_attribute_data[attribute_name] = container
+        self._invalidate_constraints(attribute_name)
+
+    def _copy(self, read_only):
+        """
+        Create a copy of the `Model` which shares the baseline `attribute_data`.
+        Before it is first shared every `list` value is frozen, from then on
+        the only way to change one is to assign a _new_ value, which goes to
+        `changed_attribute_data` of the `Model` it was assigned on. The nested
+        `Model(s)` are copied (as they can be changed in place)
+
+        Args:
+            read_only (bool): if the copy should be a read-only snapshot
+
+        Returns:
+            Model: the copy
+        """
+        state = self.__dict__
+        if not state.get('_attribute_data_shared'):
+            state['_attribute_data'] = self._freeze_attribute_data(
+                self.stored_attribute_data)
+            state['_attribute_data_shared'] = True
+        changed_attribute_data = self._freeze_attribute_data(
+            self.changed_attribute_data)
+        state['_changed_attribute_data'] = changed_attribute_data
+        cls = type(self)
+        model = cls.__new__(cls)
+        model.__dict__.update(
+            state,
+            _changed_attribute_data=dict(changed_attribute_data),
+            _constraint_results=dict(self.constraint_results),
+            _default_attribute_data=dict(self.default_attribute_data),
+            _processed_attributes=set(self.processed_attributes),
         )
+        for name in _TRIGGER_STATE:
+            model.__dict__.pop(name, None)
+        model.__dict__.pop('_container', None)
+        for name in ('_attribute_data', '_changed_attribute_data'):
+            attribute_data = model.__dict__.get(name)
+            if attribute_data:
+                model.__dict__[name] = _copy_nested(attribute_data, read_only)
+        if read_only:
+            model.__dict__.update(
+                _journal=None,
+                _persistor=None,
+                _read_only=True,
+            )
+        else:
+            model.__dict__.pop('_read_only', None)
+        return model
+
+    def _default_attribute_value(self, attribute_name):
+        """
+        Resolve the `default` value of an attribute (a callable `default` is
+        only called the first time it is resolved)
+
+        Args:
+            attribute_name (str): the attribute-name
+
+        Returns:
+            mixed: the `default` value
+        """
+        constant_default_attribute_data = self.constant_default_attribute_data
+        if attribute_name in constant_default_attribute_data:
+            return constant_default_attribute_data[attribute_name]
+        default_attribute_data = self.default_attribute_data
+        if attribute_name not in default_attribute_data:
+            default_attribute_data[attribute_name] = \
+                self.attribute_metadata[attribute_name].default()
+        return default_attribute_data[attribute_name]
+
+    def _drain_triggers(self, executor):
+        """
+        Run the dispatched `Trigger` handlers at the head of the queue (this
+        runs on the specified `executor`), collecting their errors. It stops at
+        a deferred handler and hands over to the executor of a handler which is
+        dispatched elsewhere
+
+        Args:
+            executor (concurrent.futures.Executor): the executor this runs on
+        """
+        state = self.__dict__
+        condition = state['_trigger_condition']
+        queued_triggers = state['_queued_triggers']
+        while True:
+            with condition:
+                if not queued_triggers or queued_triggers[0][0].deferred:
+                    state['_trigger_draining'] = False
+                    condition.notify_all()
+                    return
+                trigger, old_attribute_value, new_attribute_value = \
+                    queued_triggers[0]
+                if trigger.executor is not executor:
+                    break
+                queued_triggers.popleft()
+            try:
+                trigger.trigger(old_attribute_value, new_attribute_value, self)
+            except Exception as e:
+                with condition:
+                    state.setdefault('_trigger_errors', []).append((trigger, e))
+        self._submit_triggers(trigger.executor)
+
+    def _freeze_attribute_data(self, attribute_data):
+        """
+        Freeze every `list` value of the specified `attribute_data`
+
+        Args:
+            attribute_data (dict): the `Attribute` data `dict`
+
+        Returns:
+            dict: the specified `attribute_data`, or a copy of it if any value
+                had to be frozen
+        """
+        frozen_attribute_data = None
+        for attribute_name, attribute_value in attribute_data.items():
+            if isinstance(attribute_value, list) and \
+                not isinstance(attribute_value, FrozenList):
+                if frozen_attribute_data is None:
+                    frozen_attribute_data = dict(attribute_data)
+                frozen_attribute_data[attribute_name] = \
+                    FrozenList(attribute_value)
+        return attribute_data if frozen_attribute_data is None else \
+            frozen_attribute_data
+
+    def _invalidate_constraints(self, attribute_name):
+        """
+        Drop the cached result of each `Constraint` which depends on the
+        specified `attribute_name` (it is re-evaluated by `validate`)
+
+        Args:
+            attribute_name (str): the attribute-name
+        """
+        constraint_results = self.__dict__.get('_constraint_results')
+        if constraint_results:
+            for constraint_name in self.constraint_dependencies.get(
+                attribute_name, ()):
+                constraint_results.pop(constraint_name, None)
+
+    def _mark_persisted(
+        self,
+        merged_attribute_data,
+        key_attribute_data
+    ):
+        """
+        Record that the specified `merged_attribute_data` has been persisted:
+        stage the changes in the transaction of the `Persistor` (if there is a
+        `Journal`, see: `Journal.stage`), fold them and the specified
+        `key_attribute_data` into `attribute_data` and clear
+        `changed_attribute_data`
+
+        Args:
+            merged_attribute_data (dict): the persisted `Attribute` data
+            key_attribute_data (dict): the key-attributes returned by the
+                `Persistor`
+        """
+        journal = self.journal
+        if journal is not None:
+            transaction = self._transaction()
+            # a `Model` which has not been persisted before is journaled as a
+            # whole, otherwise only the changed attributes are journaled
+            if self.persisted:
+                changed_attribute_data = self.changed_attribute_data
+                attribute_data = self.stored_attribute_data
+                old_attribute_data = {}
+                for attribute_name in changed_attribute_data:
+                    attribute_value = attribute_data.get(attribute_name)
+                    if isinstance(attribute_value, Deferred):
+                        attribute_value = attribute_value.decode()
+                    old_attribute_data[attribute_name] = attribute_value
+                journal.stage(
+                    transaction,
+                    key_attribute_data,
+                    _raw_attribute_data(old_attribute_data),
+                    _raw_attribute_data(changed_attribute_data)
+                )
+            else:
+                journal.stage(transaction, key_attribute_data, {},
+                    _raw_attribute_data(dict(merged_attribute_data,
+                        **key_attribute_data)))
+        self.attribute_data = dict(merged_attribute_data, **key_attribute_data)
+        self.changed_attribute_data.clear()
+        self.persisted = True
+
+    def _notify_container(self):
+        """
+        Report that this (nested) `Model` is about to change in place to the
+        parent `Model` which owns its container (if any)
+        """
+        container = self.__dict__.get('_container')
+        if container is not None and container.owner is not None:
+            model, attribute_name = container.owner
+            model._child_changed(attribute_name, container)
+
+    def _queue_trigger(
+        self,
+        trigger,
+        old_attribute_value,
+        new_attribute_value
+    ):
+        """
+        Queue a (deferred or dispatched) `Trigger` handler. Both kinds share a
+        single queue (per `Model`) which is run by one task at a time, as such
+        the handlers run in the order they were queued. The dispatched handlers
+        at the head of the queue are run on the executor of their `Trigger`, a
+        deferred handler (and every handler queued after it) waits until
+        `flush_triggers` is called
+
+        Args:
+            trigger (Trigger): the `Trigger`
+            old_attribute_value (mixed): the old-value of the `Attribute`
+            new_attribute_value (mixed): the new-value of the `Attribute`
+        """
+        state = self.__dict__
+        condition = state.get('_trigger_condition')
+        if condition is None:
+            condition = state.setdefault('_trigger_condition',
+                threading.Condition())
+        with condition:
+            queued_triggers = state.setdefault('_queued_triggers', deque())
+            queued_triggers.append(
+                (trigger, old_attribute_value, new_attribute_value))
+            if state.get('_trigger_draining') or queued_triggers[0][0].deferred:
+                return
+            state['_trigger_draining'] = True
+            executor = queued_triggers[0][0].executor
+        self._submit_triggers(executor)
+
+    def _resolve_deferred(
+        self,
+        attribute_name,
+        deferred
+    ):
+        """
+        Decode, format and validate a `Deferred` (loaded) value and store the
+        result in its place
+
+        Args:
+            attribute_name (str): the attribute-name
+            deferred (Deferred): the `Deferred` value
+
+        Returns:
+            mixed: the formatted attribute-value
+
+        Raises:
+            ValueError: if the value could not be decoded, formatted or is
+                invalid
+        """
+        attribute = self.attribute_metadata[attribute_name]
+        attribute_value = attribute.format(deferred.decode())
+        if not attribute.validate(attribute_value):
+            raise ValidationError('Invalid value: {} for attribute: {}',
+                attribute_value, attribute_name)
+        changed_attribute_data = self.changed_attribute_data
+        if changed_attribute_data.get(attribute_name) is deferred:
+            changed_attribute_data[attribute_name] = attribute_value
+        elif self.stored_attribute_data.get(attribute_name) is deferred:
+            if self.__dict__.get('_attribute_data_shared') and \
+                isinstance(attribute_value, list):
+                # the baseline is shared, `list` values must stay frozen
+                attribute_value = FrozenList(attribute_value)
+            self.stored_attribute_data[attribute_name] = attribute_value
+        return attribute_value
+
+    def _set_attribute_value(
+        self,
+        attribute_name,
+        new_attribute_value
+    ):
+        """
+        Store an (already formatted and validated) attribute value and fire any
+        applicable `Trigger(s)`
+
+        Args:
+            attribute_name (str): the attribute-name
+            new_attribute_value (mixed): the formatted attribute-value
+        """
+        if not self.initialized:
+            # the old-value (the `default` value) is only resolved if a
+            # `Trigger` needs it
+            old_attribute_value = _UNRESOLVED
+            self.stored_attribute_data[attribute_name] = new_attribute_value
+        else:
+            old_attribute_value = self._stored_attribute_value(attribute_name)
+            if self.attribute_metadata[attribute_name].changed(
+                old_attribute_value, new_attribute_value):
+                # the parent `Model` (if any) is told before the change is
+                # applied, it keeps the value from before the change
+                self._notify_container()
+                self.changed_attribute_data[attribute_name] = \
+                    new_attribute_value
+            else:
+                if attribute_name in self.changed_attribute_data:
+                    self._notify_container()
+                    del self.changed_attribute_data[attribute_name]
+                self.processed_attributes.discard(attribute_name)
+                return
+        self._invalidate_constraints(attribute_name)
+        self.processed_attributes.add(attribute_name)
+        for attribute_names, trigger in self.trigger_metadata.items():
+            if attribute_name in attribute_names and \
+                self.processed_attributes >= attribute_names:
+                if old_attribute_value is _UNRESOLVED:
+                    old_attribute_value = \
+                        self._default_attribute_value(attribute_name)
+                if trigger.immediate:
+                    trigger.trigger(
+                        old_attribute_value,
+                        new_attribute_value,
+                        self
+                    )
+                else:
+                    self._queue_trigger(trigger, old_attribute_value,
+                        new_attribute_value)
+
+    def _stored_attribute_value(self, attribute_name):
+        """
+        Get the (current) stored value of an attribute, resolving its `default`
+        value if it has not been set (a nested `Model` is not built)
+
+        Args:
+            attribute_name (str): the attribute-name
+
+        Returns:
+            mixed: the attribute-value
+
+        Raises:
+            AttributeError: if the `attribute_name` does not refer to a mapped
+                `Attribute`
+        """
+        changed_attribute_data = self.changed_attribute_data
+        if attribute_name in changed_attribute_data:
+            return changed_attribute_data[attribute_name]
+        attribute_data = self.stored_attribute_data
+        if attribute_name in attribute_data:
+            return attribute_data[attribute_name]
+        if attribute_name not in self.attribute_metadata:
+            raise AttributeError('Unmapped attribute: {}'.format(
+                attribute_name))
+        return self._default_attribute_value(attribute_name)
+
+    def _submit_triggers(self, executor):
+        """
+        Submit a task which runs the queued `Trigger` handlers to the specified
+        `executor` (the caller has marked the queue as draining)
+
+        Args:
+            executor (concurrent.futures.Executor): the executor
+        """
+        try:
+            executor.submit(self._drain_triggers, executor)
+        except Exception:
+            condition = self.__dict__['_trigger_condition']
+            with condition:
+                self.__dict__['_trigger_draining'] = False
+                condition.notify_all()
+            raise
+
+    def _transaction(self):
+        """
+        Get the transaction the writes of the `Persistor` belong to (see:
+        `Persistor.transaction`)
+
+        Returns:
+            mixed: the transaction (`None` if the `Persistor` commits each
+                write itself, e.g. a `WriterPersistor`)
+        """
+        return self.persistor.transaction
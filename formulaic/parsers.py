@@ -0,0 +1,457 @@
+__all__ = (
+    'FormParser',
+    'MultipartFormParser',
+    'URLEncodedFormParser',
+)
+
+
+import re
+
+from six.moves.urllib.parse import unquote_to_bytes
+
+from .types import Type
+
+
+class FormParser(object):
+    """
+    Class providing methods for incrementally parsing a (raw) form-body into a
+    `Model` instance. The body is consumed in chunks (via `feed`) and only the
+    fields mapped in the `attribute_metadata` of the `Model` class are kept,
+    the data of any other field is dropped as it is parsed (it is never
+    buffered). Repeated fields are collected into a `list` for `Attribute(s)`
+    of `Type.LIST`, otherwise the last value wins
+
+    Instance Attributes:
+        encoding (str): the character-encoding of the field-values
+        max_body_size (int): the maximum size (in bytes) of the body
+        max_field_size (int): the maximum size (in bytes) of a (kept)
+            field-value
+        model_class (type): the `Model` class
+        streams (dict): file-like objects (key: `attribute_name`) to which the
+            value of the respective field is written as it is parsed, instead
+            of it being buffered and set on the `Model`
+    """
+    def __init__(
+        self,
+        model_class,
+        encoding='utf-8',
+        max_body_size=None,
+        max_field_size=None,
+        streams=None
+    ):
+        self.encoding = encoding
+        self.max_body_size = max_body_size
+        self.max_field_size = max_field_size
+        self.model_class = model_class
+        self.streams = streams or {}
+        self._attributes = {}
+        self._body_size = 0
+        self._field_chunks = None
+        self._field_name = None
+        self._field_size = 0
+
+    @classmethod
+    def create(
+        cls,
+        model_class,
+        content_type,
+        **kwargs
+    ):
+        """
+        Create the appropriate `FormParser` for the specified `content_type`
+
+        Args:
+            model_class (type): the `Model` class
+            content_type (str): the (`Content-Type` header) content-type
+            **kwargs (dict): the keyword arguments (passed to `__init__`)
+
+        Returns:
+            FormParser: the `FormParser` instance
+
+        Raises:
+            ValueError: if the `content_type` is not supported
+        """
+        media_type = content_type.split(';', 1)[0].strip().lower()
+        if media_type == 'application/x-www-form-urlencoded':
+            return URLEncodedFormParser(model_class, **kwargs)
+        if media_type == 'multipart/form-data':
+            match = re.search(r'boundary="?([^";]+)"?', content_type)
+            if match:
+                return MultipartFormParser(model_class, match.group(1),
+                    **kwargs)
+        raise ValueError('Unsupported content-type: {}'.format(content_type))
+
+    def close(self):
+        """
+        Finish parsing and build the `Model` instance
+
+        Returns:
+            Model: the `Model` instance
+
+        Raises:
+            ValueError: if the body is incomplete, or any `attribute_value`
+                could not be formatted or is invalid
+        """
+        return self.model_class(self._attributes)
+
+    def feed(self, chunk):
+        """
+        Parse the next `chunk` of the body
+
+        Args:
+            chunk (bytes): the chunk
+
+        Raises:
+            ValueError: if the body or a field-value exceeds its size limit, or
+                the body is malformed
+        """
+        self._body_size += len(chunk)
+        if self.max_body_size is not None and \
+            self._body_size > self.max_body_size:
+            raise ValueError('Body exceeds: {} bytes'.format(
+                self.max_body_size))
+        self._parse(chunk)
+
+    @classmethod
+    def parse(
+        cls,
+        model_class,
+        chunks,
+        *args,
+        **kwargs
+    ):
+        """
+        Parse the specified `chunks` into a `Model` instance
+
+        Args:
+            model_class (type): the `Model` class
+            chunks (iterable of bytes): the chunks of the body
+            *args (list): the positional arguments (passed to `__init__`)
+            **kwargs (dict): the keyword arguments (passed to `__init__`)
+
+        Returns:
+            Model: the `Model` instance
+
+        Raises:
+            ValueError: if the body or a field-value exceeds its size limit, the
+                body is malformed, or any `attribute_value` could not be
+                formatted or is invalid
+        """
+        parser = cls(model_class, *args, **kwargs)
+        for chunk in chunks:
+            parser.feed(chunk)
+        return parser.close()
+
+    def _end_field(self):
+        """
+        Finish the current field, storing its value (if it is kept)
+        """
+        field_name, field_chunks = self._field_name, self._field_chunks
+        self._field_chunks = self._field_name = None
+        if field_chunks is None:
+            return
+        attribute_value = b''.join(field_chunks).decode(self.encoding)
+        attribute = self.model_class.attribute_metadata[field_name]
+        if attribute.type == Type.LIST:
+            self._attributes.setdefault(field_name, []).append(attribute_value)
+        else:
+            self._attributes[field_name] = attribute_value
+
+    def _field_data(self, data):
+        """
+        Consume the (decoded) `data` of the current field. The `data` is dropped
+        if the field is not kept
+
+        Args:
+            data (bytes): the data
+
+        Raises:
+            ValueError: if the field-value exceeds `max_field_size`
+        """
+        if self._field_name is None or not data:
+            return
+        self._field_size += len(data)
+        if self.max_field_size is not None and \
+            self._field_size > self.max_field_size:
+            raise ValueError('Value of field: {} exceeds: {} bytes'.format(
+                self._field_name, self.max_field_size))
+        stream = self.streams.get(self._field_name)
+        if stream is not None:
+            stream.write(data)
+        else:
+            self._field_chunks.append(data)
+
+    def _parse(self, chunk):
+        """
+        Parse the next `chunk` of the body
+
+        Args:
+            chunk (bytes): the chunk
+
+        Raises:
+            NotImplementedError: if this method is not overridden by an
+                inheriting class
+        """
+        raise NotImplementedError
+
+    def _start_field(self, field_name):
+        """
+        Start a field (it is only kept if it is mapped in the
+        `attribute_metadata` of the `Model` class)
+
+        Args:
+            field_name (str): the field-name
+        """
+        if field_name in self.model_class.attribute_metadata:
+            self._field_chunks = \
+                None if field_name in self.streams else []
+            self._field_name = field_name
+        else:
+            self._field_chunks = self._field_name = None
+        self._field_size = 0
+
+
+class MultipartFormParser(FormParser):
+    """
+    Class providing methods for incrementally parsing a `multipart/form-data`
+    body into a `Model` instance
+
+    Class Attributes:
+        MAX_HEADERS_SIZE (int): the maximum size (in bytes) of the headers of a
+            part
+
+    Instance Attributes:
+        boundary (str): the boundary
+    """
+    MAX_HEADERS_SIZE = 16 * 1024
+
+    def __init__(
+        self,
+        model_class,
+        boundary,
+        **kwargs
+    ):
+        super(MultipartFormParser, self).__init__(model_class, **kwargs)
+        self.boundary = boundary
+        self._buffer = b''
+        self._delimiter = b'\r\n--' + boundary.encode('ascii')
+        self._state = 'preamble'
+
+    def close(self):
+        """
+        Finish parsing and build the `Model` instance
+
+        Returns:
+            Model: the `Model` instance
+
+        Raises:
+            ValueError: if the body is incomplete, or any `attribute_value`
+                could not be formatted or is invalid
+        """
+        if self._state != 'epilogue':
+            raise ValueError('Incomplete multipart body')
+        return super(MultipartFormParser, self).close()
+
+    def _parse(self, chunk):
+        """
+        Parse the next `chunk` of the body
+
+        Args:
+            chunk (bytes): the chunk
+
+        Raises:
+            ValueError: if the body is malformed
+        """
+        buffer = self._buffer + chunk
+        delimiter = self._delimiter
+        while True:
+            state = self._state
+            if state == 'preamble':
+                # the first delimiter is not preceded by a CRLF
+                index = buffer.find(delimiter[2:])
+                if index == -1:
+                    buffer = buffer[-(len(delimiter) - 3):]
+                    break
+                buffer = buffer[index + len(delimiter) - 2:]
+                self._state = 'delimiter'
+            elif state == 'delimiter':
+                if len(buffer) < 2:
+                    break
+                if buffer[:2] == b'--':
+                    self._state = 'epilogue'
+                elif buffer[:2] == b'\r\n':
+                    self._state = 'headers'
+                else:
+                    raise ValueError('Malformed multipart delimiter')
+                buffer = buffer[2:]
+            elif state == 'headers':
+                index = buffer.find(b'\r\n\r\n')
+                if index == -1:
+                    if len(buffer) > self.MAX_HEADERS_SIZE:
+                        raise ValueError('Multipart headers exceed: {} '
+                            'bytes'.format(self.MAX_HEADERS_SIZE))
+                    break
+                self._start_field(self._field_name_from_headers(
+                    buffer[:index].decode('latin-1')))
+                buffer = buffer[index + 4:]
+                self._state = 'body'
+            elif state == 'body':
+                index = buffer.find(delimiter)
+                if index == -1:
+                    # hold back enough data to detect a delimiter which
+                    # straddles the chunks
+                    split = max(len(buffer) - len(delimiter) + 1, 0)
+                    self._field_data(buffer[:split])
+                    buffer = buffer[split:]
+                    break
+                self._field_data(buffer[:index])
+                self._end_field()
+                buffer = buffer[index + len(delimiter):]
+                self._state = 'delimiter'
+            else:
+                buffer = b''
+                break
+        self._buffer = buffer
+
+    def _field_name_from_headers(self, headers):
+        """
+        Extract the field-name from the (`Content-Disposition`) headers of a
+        part
+
+        Args:
+            headers (str): the headers
+
+        Returns:
+            str: the field-name (or `None` if there is none)
+        """
+        for header in headers.split('\r\n'):
+            name, _, value = header.partition(':')
+            if name.strip().lower() == 'content-disposition':
+                match = re.search(r'\bname="([^"]*)"', value)
+                if match:
+                    return match.group(1)
+        return None
+
+
+class URLEncodedFormParser(FormParser):
+    """
+    Class providing methods for incrementally parsing an
+    `application/x-www-form-urlencoded` body into a `Model` instance
+
+    Class Attributes:
+        KEY_DELIMITERS (regex): the delimiters which terminate a field-name
+    """
+    KEY_DELIMITERS = re.compile(b'[=&]')
+
+    def __init__(
+        self,
+        model_class,
+        **kwargs
+    ):
+        super(URLEncodedFormParser, self).__init__(model_class, **kwargs)
+        # (encoded) field-names longer than this can not be mapped
+        self._max_key_size = 3 * max(
+            [len(attribute_name) for attribute_name in
+                model_class.attribute_metadata] or [0])
+        self._key = b''
+        self._pending = b''
+        self._state = 'key'
+
+    def close(self):
+        """
+        Finish parsing and build the `Model` instance
+
+        Returns:
+            Model: the `Model` instance
+
+        Raises:
+            ValueError: if any `attribute_value` could not be formatted or is
+                invalid
+        """
+        self._parse(b'&')
+        return super(URLEncodedFormParser, self).close()
+
+    def _parse(self, chunk):
+        """
+        Parse the next `chunk` of the body
+
+        Args:
+            chunk (bytes): the chunk
+
+        Raises:
+            ValueError: if a field-value exceeds `max_field_size`
+        """
+        position, length = 0, len(chunk)
+        while position < length:
+            state = self._state
+            if state == 'value':
+                index = chunk.find(b'&', position)
+                end = length if index == -1 else index
+                self._value_data(chunk[position:end], index != -1)
+                if index == -1:
+                    return
+                self._end_field()
+                self._state = 'key'
+                position = index + 1
+            elif state == 'key':
+                match = self.KEY_DELIMITERS.search(chunk, position)
+                end = length if match is None else match.start()
+                self._key += chunk[position:end]
+                if len(self._key) > self._max_key_size:
+                    self._key = b''
+                    self._start_field(None)
+                    self._state = 'skip'
+                    position = end
+                    continue
+                if match is None:
+                    return
+                self._start_field(self._unquote(self._key).decode(
+                    self.encoding, 'replace'))
+                self._key = b''
+                if match.group() == b'=':
+                    self._state = 'value'
+                else:
+                    self._end_field()
+                position = end + 1
+            else:
+                index = chunk.find(b'&', position)
+                if index == -1:
+                    return
+                self._state = 'key'
+                position = index + 1
+
+    def _unquote(self, data):
+        """
+        Decode (`+` and percent-escapes) the specified `data`
+
+        Args:
+            data (bytes): the encoded data
+
+        Returns:
+            bytes: the decoded data
+        """
+        return unquote_to_bytes(data.replace(b'+', b' '))
+
+    def _value_data(
+        self,
+        data,
+        final
+    ):
+        """
+        Decode and consume the next (encoded) `data` of the current field-value.
+        A percent-escape which straddles the chunks is held back until the rest
+        of it has been parsed
+
+        Args:
+            data (bytes): the encoded data
+            final (bool): if this is the last data of the field-value
+        """
+        if self._field_name is None:
+            return
+        data = self._pending + data
+        self._pending = b''
+        if not final:
+            index = data.rfind(b'%', max(len(data) - 2, 0))
+            if index != -1:
+                data, self._pending = data[:index], data[index:]
+        self._field_data(self._unquote(data))
@@ -1,21 +1,201 @@
 __all__ = (
+    'CachingPersistor',
     'Persistor',
     'SQLPersistor',
     'SQLitePersistor',
+    'ShardedSQLitePersistor',
 )
 
 
+import heapq
+import itertools
+import json
+import re
+import threading
+import time
+import zlib
+
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from .columns import Deferred, JSONCodec, Unloaded
+from .types import Type
+
+
 try:
     import sqlite3
 except Exception:
     sqlite3 = None
 
 
+# `time.monotonic` is not affected by system clock changes (Python 3.3+)
+_clock = getattr(time, 'monotonic', time.time)
+
+_MISSING = object()
+
+# the operators of the (suffixed) filters, see: `SQLPersistor.count`
+_FILTER_OPERATORS = {
+    'eq': '=',
+    'ge': '>=',
+    'gt': '>',
+    'in': 'IN',
+    'le': '<=',
+    'lt': '<',
+    'ne': '<>',
+}
+
+# the registered `Persistor(s)` (key: name), see: `Persistor.register`
+_registry = {}
+
+
+def _attribute_codecs(attribute_metadata):
+    """
+    Determine the `Codec` of each encoded attribute of the specified
+    `attribute_metadata` (an `Attribute` with a `codec`, or of
+    `Type.LIST`/`Type.DICTIONARY` which defaults to a `JSONCodec`)
+
+    Args:
+        attribute_metadata (dict): the `Attribute` meta-data `dict` (key:
+            `attribute_name`), it may be `None`
+
+    Returns:
+        dict: the `Codec(s)` (key: `attribute_name`)
+    """
+    codecs = {}
+    default_codec = JSONCodec()
+    for attribute_name, attribute in (attribute_metadata or {}).items():
+        if attribute.codec is not None:
+            codecs[attribute_name] = attribute.codec
+        elif attribute.type in (Type.DICTIONARY, Type.LIST):
+            codecs[attribute_name] = default_codec
+    return codecs
+
+
+def _persist_shard(
+    database_file_path,
+    table_name,
+    key_attribute_names,
+    attributes_list
+):
+    """
+    Persist (and commit) the specified `attributes_list` to a single shard.
+    This is a module-level function so that it can be shipped to pool workers
+    (each worker opens, and closes, its own connection)
+
+    Args:
+        database_file_path (str): the database file-path of the shard
+        table_name (str): the table name
+        key_attribute_names (tuple of str): the key-attribute names
+        attributes_list (list of dict): the attributes of each row
+
+    Returns:
+        list: the mapped INSERT/UPSERT result of each row (in order)
+    """
+    persistor = SQLitePersistor(database_file_path, table_name,
+        key_attribute_names=key_attribute_names)
+    try:
+        results = persistor.persist_many(attributes_list)
+        persistor.connection.commit()
+        return results
+    finally:
+        persistor.connection.close()
+
+
 class Persistor(object):
     """
     Class providing methods for persisting input (persistence occurs when the
     `persist` method is called on a `Model` instance)
+
+    Instance Attributes:
+        registry_name (str): the name the `Persistor` was registered under
+            (`None` if it is not registered). A pickled `Model` refers to its
+            `Persistor` by this name and is re-attached to the `Persistor`
+            registered under it in the process which unpickles it
+        transaction (mixed): the transaction the writes belong to, an object
+            with `commit` and `rollback` methods (`Persistor(s)` which share
+            it share a transaction), or `None` if each write is committed as
+            it is made (the default)
     """
+    registry_name = None
+    transaction = None
+
+    @staticmethod
+    def lookup(name):
+        """
+        Get the `Persistor` registered under the specified `name`
+
+        Args:
+            name (str): the name
+
+        Returns:
+            Persistor: the `Persistor` instance
+
+        Raises:
+            KeyError: if no `Persistor` is registered under the `name`
+        """
+        try:
+            return _registry[name]
+        except KeyError:
+            raise KeyError('Unregistered persistor: {}'.format(name))
+
+    @staticmethod
+    def register(
+        name,
+        persistor
+    ):
+        """
+        Register the specified `persistor` under the specified `name`
+        (replacing any `Persistor` registered under it). Every process which
+        unpickles a `Model` must register its own `Persistor` under the same
+        name
+
+        Args:
+            name (str): the name
+            persistor (Persistor): the `Persistor` instance
+
+        Returns:
+            Persistor: the `Persistor` instance
+        """
+        previous_persistor = _registry.get(name)
+        if previous_persistor is not None and \
+            previous_persistor is not persistor:
+            previous_persistor.registry_name = None
+        _registry[name] = persistor
+        persistor.registry_name = name
+        return persistor
+
+    @staticmethod
+    def unregister(name):
+        """
+        Unregister the `Persistor` registered under the specified `name` (if
+        any)
+
+        Args:
+            name (str): the name
+        """
+        persistor = _registry.pop(name, None)
+        if persistor is not None:
+            persistor.registry_name = None
+
+    def column_name(self, attribute_name):
+        """
+        Convert an attribute-name to the name it is stored under (by default
+        the attribute-name itself)
+
+        Args:
+            attribute_name (str): the attribute-name
+
+        Returns:
+            str: the column-name
+        """
+        return attribute_name
+
+    def commit(self):
+        """
+        Commit the pending writes (by default each write is committed as it is
+        made, as such there is nothing to commit)
+        """
+
     def persist(self, attributes):
         """
         Persist the specified `attributes`
@@ -32,26 +212,107 @@ class Persistor(object):
         """
         raise NotImplementedError
 
+    def persist_many(self, attributes_list):
+        """
+        Persist the specified `attributes_list` (by default one row at a time,
+        see: `persist`)
+
+        Args:
+            attributes_list (iterable of dict): the attributes of each row
+
+        Returns:
+            list: the result of each row (in order)
+        """
+        return [self.persist(attributes) for attributes in attributes_list]
+
+    def rollback(self):
+        """
+        Roll back the pending writes (by default each write is committed as it
+        is made, as such there is nothing to roll back)
+        """
+
 
 class SQLPersistor(Persistor):
     """
     Class providing methods for persisting input to a SQL DB (persistence occurs
     when the `persist` method is called on a `Model` instance)
 
+    Class Attributes:
+        COLUMN_TYPES (tuple of tuples): the `(type, column-type)` mappings used
+            when generating DDL (the first matching `type` wins, `TEXT` is used
+            if there is no match)
+        PLACEHOLDER (str): the parameter placeholder (DB-API `qmark` style)
+        SUPPORTS_UPSERT (bool): if the DB supports `INSERT ... ON CONFLICT`
+            (UPSERT), otherwise an UPDATE is performed, followed by an INSERT
+            if no row was updated
+
     Instance Attributes:
+        attribute_metadata (dict): the `Attribute` meta-data `dict` (key:
+            `attribute_name`), if it is provided the values of `Attribute(s)`
+            with a `codec` (and `list`/`dict` values) are encoded on write and
+            decoded lazily (see: `Deferred`) on load
+        codecs (lazy-dict, stored as `_codecs`): the `Codec` of each encoded
+            attribute (key: `attribute_name`)
+        connection (lazy-mixed, stored as `_connection`): the "Connection"
+            instance (it may be provided, e.g. to share it between
+            `Persistor(s)`)
         table_name (str): the table name
-        key_attribute_names (set of str): the key-attribute names (in the future
-            complex keys will likely be supported, for now only simple/singular
-            keys are supported)
+        key_attribute_names (tuple of str): the key-attribute names, in
+            primary-key (clustered) order
+        transaction (mixed): the transaction the writes belong to (see:
+            `Persistor`), the `connection`
     """
+    COLUMN_TYPES = (
+        (Type.BOOLEAN, 'BOOLEAN'),
+        (Type.FLOAT, 'DOUBLE PRECISION'),
+        (Type.INTEGER, 'INTEGER'),
+        (Type.LONG, 'BIGINT'),
+        (Type.STRING, 'VARCHAR(255)'),
+    )
+    PLACEHOLDER = '?'
+    SUPPORTS_UPSERT = True
+
     def __init__(
         self,
         table_name,
         key_attribute_name=None,
+        key_attribute_names=None,
+        connection=None,
+        attribute_metadata=None
     ):
+        assert(not (key_attribute_name and key_attribute_names))
+        if connection is not None:
+            self._connection = connection
+        self.attribute_metadata = attribute_metadata
         self.table_name = table_name
-        self.key_attribute_names = frozenset([key_attribute_name]) if \
-            key_attribute_name else frozenset()
+        self.key_attribute_names = tuple(key_attribute_names) if \
+            key_attribute_names else (key_attribute_name,) if \
+            key_attribute_name else ()
+
+    @property
+    def codecs(self):
+        """
+        Lazy-load and return the `Codec` of each encoded attribute (an
+        `Attribute` with a `codec`, or of `Type.LIST`/`Type.DICTIONARY` which
+        defaults to a `JSONCodec`)
+
+        Returns:
+            dict: the `Codec(s)` (key: `attribute_name`)
+        """
+        if not hasattr(self, '_codecs'):
+            self._codecs = _attribute_codecs(self.attribute_metadata)
+        return self._codecs
+
+    @codecs.setter
+    def codecs(self, value):
+        """
+        Set the `Codec` of each encoded attribute (e.g. when the `Attribute`
+        meta-data is not available, as in a `WriterProcess`)
+
+        Args:
+            value (dict): the _new_ `Codec(s)` (key: `attribute_name`)
+        """
+        self._codecs = value
 
     @property
     def connection(self):
@@ -69,27 +330,43 @@ class SQLPersistor(Persistor):
             self._connection = self._connect()
         return self._connection
 
-    def persist(self, attributes):
+    @property
+    def transaction(self):
         """
-        Persist the specified `attributes`
-
-        Args:
-            attributes (dict): the attributes
+        Get the transaction the writes belong to (see: `Persistor`), the
+        `connection`
 
         Returns:
-            mixed: the mapped INSERT/UPDATE result
+            mixed: the "Connection" instance
+        """
+        return self.connection
 
-        Raises:
-            RuntimeError: if a dependency could not be loaded or a connection to
-                DB could not be established
+    @contextmanager
+    def bulk_load(self, attribute_metadata):
         """
-        key_attributes, non_key_attributes = \
-            self._partition_attributes(attributes)
-        if key_attributes and all(key_attributes.values()):
-            return self._update(key_attributes, non_key_attributes)
-        return self._insert(non_key_attributes)
+        Context-manager for loading large amounts of data. The secondary
+        indexes are dropped on entry and rebuilt (before committing) on exit. If
+        an error occurs the load is rolled back and the indexes are rebuilt
+        before the error is re-raised
 
-    def _column_name(self, attribute_name):
+        Args:
+            attribute_metadata (dict): the `Attribute` meta-data `dict` (key:
+                `attribute_name`)
+
+        Yields:
+            SQLPersistor: this `Persistor` instance
+        """
+        self.drop_indexes(attribute_metadata)
+        try:
+            yield self
+            self.create_indexes(attribute_metadata)
+        except Exception:
+            self.connection.rollback()
+            self.create_indexes(attribute_metadata)
+            raise
+        self.connection.commit()
+
+    def column_name(self, attribute_name):
         """
         Convert an attribute-name to a column-name
 
@@ -99,225 +376,2446 @@ class SQLPersistor(Persistor):
         Returns:
             str: the column-name
         """
-        return ''.join(
-            str.capitalize(attribute_name_part)
-            for attribute_name_part in attribute_name.split('_')
-        )
+        return self._column_name(attribute_name)
+
+    def commit(self):
+        """
+        Commit the transaction of the `connection`
+        """
+        self.connection.commit()
 
-    def _column_value(self, attribute_value):
+    def count(self, **filters):
         """
-        Sanitize and quote an attribute-value
+        Count the rows matching the specified `filters` (in SQL, no row is
+        fetched). A filter is keyed by an attribute-name, optionally suffixed
+        by an operator: `__eq` (the default), `__ne`, `__lt`, `__le`, `__gt`,
+        `__ge` or `__in` (the value is an iterable). A `None` value matches
+        `NULL` (`IS NULL`, or `IS NOT NULL` for `__ne`). The values are bound
+        as parameters
 
         Args:
-            attribute_value (mixed): the attribute-value
+            **filters (dict): the filters
 
         Returns:
-            str: the sanitized and quoted attribute-value
+            int: the number of matching rows
+
+        Raises:
+            RuntimeError: if a dependency could not be loaded or a connection to
+                DB could not be established
+            ValueError: if a filter operator is not supported
         """
-        return "'%s'" % attribute_value if attribute_value is not None else \
-            'NULL'
+        return self._aggregate('COUNT(*)', filters)
 
-    def _connect(self):
+    def count_by(
+        self,
+        attribute_names,
+        **filters
+    ):
         """
-        Establish a new connection to a DB
+        Count the rows matching the specified `filters` (see: `count`), grouped
+        by the specified `attribute_names` (in SQL, no row is fetched)
+
+        Args:
+            attribute_names (mixed): the attribute-name, or an iterable of
+                attribute-names, to group by
+            **filters (dict): the filters
 
         Returns:
-            mixed: the new connection instance
+            dict: the number of matching rows of each group (key: the value, or
+                a `tuple` of the values if an iterable of attribute-names was
+                provided)
 
         Raises:
-            NotImplementedError: if this method is not overridden by an
-                inheriting class
+            RuntimeError: if a dependency could not be loaded or a connection to
+                DB could not be established
+            ValueError: if a filter operator is not supported
         """
-        raise NotImplementedError
+        single = isinstance(attribute_names, Type.STRING)
+        column_names = ', '.join(
+            self._column_name(attribute_name)
+            for attribute_name in ((attribute_names,) if single else
+                attribute_names)
+        )
+        filter_sql, parameters = self._filter_sql(filters)
+        cursor = self.connection.execute(
+            'SELECT %s, COUNT(*) FROM %s%s GROUP BY %s' % (column_names,
+                self.table_name, filter_sql, column_names), parameters)
+        return {
+            row[0] if single else tuple(row[:-1]): row[-1]
+            for row in cursor.fetchall()
+        }
 
-    def _insert(self, non_key_attributes):
+    def create_indexes(self, attribute_metadata):
         """
-        Perform an INSERT operation based on the specified `non_key_attributes`
+        Create the secondary indexes for any `Attribute(s)` configured with
+        `index` or `unique` (if they do not already exist)
 
         Args:
-            non_key_attributes (dict): the non-key-attributes
-
-        Returns:
-            mixed: the mapped INSERT result
+            attribute_metadata (dict): the `Attribute` meta-data `dict` (key:
+                `attribute_name`)
         """
-        return self._map_insert_result(self.connection.execute(self._insert_sql(
-            non_key_attributes)))
+        for sql in self._create_index_sqls(attribute_metadata):
+            self.connection.execute(sql)
 
-    def _insert_sql(self, non_key_attributes):
+    def create_table(self, attribute_metadata):
         """
-        Generate the SQL required for an INSERT operation based on the specified
-        `non_key_attributes`
+        Create the table, and its secondary indexes, based on the specified
+        `attribute_metadata` (if they do not already exist)
 
         Args:
-            non_key_attributes (dict): the non-key-attributes
-
-        Returns:
-            str: the SQL string
+            attribute_metadata (dict): the `Attribute` meta-data `dict` (key:
+                `attribute_name`)
         """
-        return 'INSERT INTO %s (%s) VALUES (%s)' % (
-            self.table_name,
-            ', '.join(
-                self._column_name(attribute_name)
-                for attribute_name in non_key_attributes.keys()
-            ),
-            ', '.join(
-                self._column_value(attribute_value)
-                for attribute_value in non_key_attributes.values()
-            ),
-        )
+        self.connection.execute(self._create_table_sql(attribute_metadata))
+        self.create_indexes(attribute_metadata)
 
-    def _map_insert_result(self, result):
+    def drop_indexes(self, attribute_metadata):
         """
-        Map the result from an INSERT operation
+        Drop the secondary indexes for any `Attribute(s)` configured with
+        `index` or `unique` (if they exist)
 
         Args:
-            result (mixed): the unmapped INSERT result
-
-        Returns:
-            mixed: the mapped INSERT result
+            attribute_metadata (dict): the `Attribute` meta-data `dict` (key:
+                `attribute_name`)
         """
-        return result
+        for sql in self._drop_index_sqls(attribute_metadata):
+            self.connection.execute(sql)
 
-    def _map_update_result(self, result):
+    def exists(self, **filters):
         """
-        Map the result from an UPDATE operation
+        Determine if any row matches the specified `filters` (see: `count`),
+        the query stops at the first matching row
 
         Args:
-            result (mixed): the unmapped UPDATE result
+            **filters (dict): the filters
 
         Returns:
-            mixed: the mapped UPDATE result
+            bool: the result
+
+        Raises:
+            RuntimeError: if a dependency could not be loaded or a connection to
+                DB could not be established
+            ValueError: if a filter operator is not supported
         """
-        return result
+        filter_sql, parameters = self._filter_sql(filters)
+        return self.connection.execute('SELECT 1 FROM %s%s LIMIT 1' % (
+            self.table_name, filter_sql), parameters).fetchone() is not None
 
-    def _partition_attributes(self, attributes):
+    def load(
+        self,
+        key_attributes,
+        attribute_names=None
+    ):
         """
-        Partition the specified `attributes` into two `dict(s)`, one of the
-        `key_attributes` and another of the `non_key_attributes`
+        Load the attributes of the row identified by the specified
+        `key_attributes`
 
         Args:
-            attributes (dict): the attributes
+            key_attributes (dict): the key-attributes (every key-attribute must
+                be provided)
+            attribute_names (iterable of str): the attribute-names to load (if
+                omitted every column is loaded)
 
         Returns:
-            tuple (of dicts): a `tuple` of the `key_attributes` and
-                `non_key_attributes`
+            dict: the attributes (key: `attribute_name`), or `None` if there is
+                no matching row
+
+        Raises:
+            RuntimeError: if a dependency could not be loaded or a connection to
+                DB could not be established
         """
-        key_attributes, non_key_attributes = {}, {}
-        key_attribute_names = self.key_attribute_names
-        for attribute_name, attribute_value in attributes.items():
-            if attribute_name in key_attribute_names:
-                key_attributes[attribute_name] = attribute_value
-            else:
-                non_key_attributes[attribute_name] = attribute_value
-        return (key_attributes, non_key_attributes)
+        sql, parameters = self._select_sql(key_attributes, attribute_names)
+        cursor = self.connection.execute(sql, parameters)
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        if attribute_names is None:
+            attribute_names = [
+                self._attribute_name(column[0])
+                for column in cursor.description
+            ]
+        return self._decode_attributes(dict(zip(attribute_names, row)), True)
 
-    def _update(
+    def max(
         self,
-        key_attributes,
-        non_key_attributes
+        attribute_name,
+        **filters
     ):
         """
-        Perform an UPDATE operation based on the specified `key_attributes` and
-        `non_key_attributes`
+        Compute the maximum value of the specified `attribute_name` over the
+        rows matching the specified `filters` (see: `count`), in SQL. The value
+        is the (raw) column-value, it is not decoded
 
         Args:
-            key_attributes (dict): the key-attributes
-            non_key_attributes (dict): the non-key-attributes
+            attribute_name (str): the attribute-name
+            **filters (dict): the filters
 
         Returns:
-            mixed: the mapped UPDATE result
+            mixed: the maximum value (`None` if no row matches)
+
+        Raises:
+            RuntimeError: if a dependency could not be loaded or a connection to
+                DB could not be established
+            ValueError: if a filter operator is not supported
         """
-        return self._map_update_result(self.connection.execute(self._update_sql(
-            key_attributes, non_key_attributes)))
+        return self._aggregate('MAX(%s)' % self._column_name(attribute_name),
+            filters)
 
-    def _update_sql(
+    def min(
         self,
-        key_attributes,
-        non_key_attributes
+        attribute_name,
+        **filters
     ):
         """
-        Generate the SQL required for an UPDATE operation based on the specified
-        `key_attributes` and `non_key_attributes`
+        Compute the minimum value of the specified `attribute_name` over the
+        rows matching the specified `filters` (see: `count`), in SQL. The value
+        is the (raw) column-value, it is not decoded
 
         Args:
-            key_attributes (dict): the key-attributes
-            non_key_attributes (dict): the non-key-attributes
+            attribute_name (str): the attribute-name
+            **filters (dict): the filters
 
         Returns:
-            str: the SQL string
-        """
-        return 'UPDATE %s SET %s WHERE %s' % (
-            self.table_name,
-            ', '.join(
-                '%s = %s' % (self._column_name(attribute_name),
-                    self._column_value(attribute_value))
-                for attribute_name, attribute_value in
-                    non_key_attributes.items()
-            ),
-            ' AND '.join(
-                '%s = %s' % (self._column_name(attribute_name),
-                    self._column_value(attribute_value))
-                for attribute_name, attribute_value in
-                    key_attributes.items()
-            )
-        )
-
+            mixed: the minimum value (`None` if no row matches)
 
-class SQLitePersistor(SQLPersistor):
-    """
-    Class providing methods for persisting input to a SQLite DB (persistence
-    occurs when the `persist` method is called on a `Model` instance)
+        Raises:
+            RuntimeError: if a dependency could not be loaded or a connection to
+                DB could not be established
+            ValueError: if a filter operator is not supported
+        """
+        return self._aggregate('MIN(%s)' % self._column_name(attribute_name),
+            filters)
 
-    Instance Attributes:
-        database_file_path (str): the database file-path
-        table_name (str): the table name
-        key_attribute_names (set of str): the key-attribute names (in the future
-            complex keys will likely be supported, for now only simple/singular
-            keys are supported)
-    """
-    def __init__(
+    def page(
         self,
-        database_file_path,
-        table_name,
-        key_attribute_name=None
+        attribute_names=None,
+        after=None,
+        limit=100,
+        **filters
     ):
-        super(SQLitePersistor, self).__init__(table_name, key_attribute_name)
-        self.database_file_path = database_file_path
-
-    def _connect(self):
         """
-        Establish a new connection to a SQLite DB
+        Load a page of (at most `limit`) rows matching the specified `filters`
+        (see: `count`), in key order, starting after the row identified by the
+        specified `after` key-attributes. The page is found by seeking the
+        primary-key (`WHERE (key, ...) > (?, ...)`) rather than by skipping
+        rows, as such the cost of a page does not depend on its depth. The
+        next page starts after the last row of this one
+
+        Args:
+            attribute_names (iterable of str): the attribute-names to select,
+                the key-attributes are always selected (if omitted every column
+                is selected)
+            after (dict): the key-attributes of the row the page starts after
+                (if omitted the first page is loaded)
+            limit (int): the maximum number of rows
+            **filters (dict): the filters
 
         Returns:
-            sqlite3.Connection: the new connection instance
+            list (of dict): the attributes of each row (key: `attribute_name`),
+                an encoded value is decoded lazily (see: `Deferred`)
 
         Raises:
-            RuntimeError: if the `sqlite3` library was not successfully loaded
+            RuntimeError: if a dependency could not be loaded or a connection to
+                DB could not be established
+            ValueError: if there are no key-attributes, or a filter operator is
+                not supported
         """
-        if sqlite3 is None:
-            raise RuntimeError
-        return sqlite3.connect(self.database_file_path)
+        key_attribute_names = self.key_attribute_names
+        if not key_attribute_names:
+            raise ValueError('Keyset pagination requires key-attributes')
+        if attribute_names is not None:
+            attribute_names = list(attribute_names)
+            attribute_names.extend(
+                attribute_name
+                for attribute_name in key_attribute_names
+                if attribute_name not in attribute_names
+            )
+        filter_sql, parameters = self._filter_sql(filters)
+        key_column_names = ', '.join(
+            self._column_name(attribute_name)
+            for attribute_name in key_attribute_names
+        )
+        if after is not None:
+            # a row-value comparison (SQLite 3.15+) seeks the primary-key
+            filter_sql += '%s (%s) > (%s)' % (
+                ' AND' if filter_sql else ' WHERE',
+                key_column_names,
+                ', '.join([self.PLACEHOLDER] * len(key_attribute_names)),
+            )
+            parameters.extend(
+                self._parameter_value(after[attribute_name])
+                for attribute_name in key_attribute_names
+            )
+        cursor = self.connection.execute(
+            'SELECT %s FROM %s%s ORDER BY %s LIMIT %d' % (
+                ', '.join(
+                    self._column_name(attribute_name)
+                    for attribute_name in attribute_names
+                ) if attribute_names is not None else '*',
+                self.table_name,
+                filter_sql,
+                key_column_names,
+                limit,
+            ),
+            parameters
+        )
+        if attribute_names is None:
+            attribute_names = [
+                self._attribute_name(column[0])
+                for column in cursor.description
+            ]
+        return [
+            self._decode_attributes(dict(zip(attribute_names, row)), True)
+            for row in cursor.fetchall()
+        ]
 
-    def _map_insert_result(self, result):
+    def persist(self, attributes):
         """
-        Map the result from an INSERT operation
+        Persist the specified `attributes`. If every key-attribute has a value
+        (not `None`, e.g. `0` is a value) an UPSERT is performed (see:
+        `SUPPORTS_UPSERT`), otherwise an INSERT is performed. The values are
+        bound as parameters
 
         Args:
-            result (mixed): the unmapped INSERT result
+            attributes (dict): the attributes
 
         Returns:
-            mixed: the mapped INSERT result
+            mixed: the mapped INSERT/UPSERT result
+
+        Raises:
+            RuntimeError: if a dependency could not be loaded or a connection to
+                DB could not be established
         """
-        return {next(iter(self.key_attribute_names)): result.lastrowid}
+        key_attributes, non_key_attributes = \
+            self._partition_attributes(self._encode_attributes(attributes))
+        if self._has_key(key_attributes):
+            return self._upsert(key_attributes, non_key_attributes)
+        return self._insert(
+            {
+                attribute_name: attribute_value
+                for attribute_name, attribute_value in key_attributes.items()
+                if attribute_value is not None
+            },
+            non_key_attributes
+        )
 
-    def _map_update_result(self, result):
+    def persist_many(self, attributes_list):
         """
-        Map the result from an UPDATE operation
+        Persist the specified `attributes_list` in batches. Rows for which every
+        key-attribute has a value are UPSERTed via `executemany` (one statement
+        per distinct set of columns, or one at a time if the DB does not
+        support UPSERT, see: `SUPPORTS_UPSERT`), the remaining rows are then
+        INSERTed one at a time (using the same parameterized statement) so that
+        the generated keys can be mapped. Nothing is committed
 
         Args:
-            result (mixed): the unmapped UPDATE result
+            attributes_list (iterable of dict): the attributes of each row
 
         Returns:
-            mixed: the mapped UPDATE result
+            list: the mapped INSERT/UPSERT result of each row (in order)
+
+        Raises:
+            RuntimeError: if a dependency could not be loaded or a connection to
+                DB could not be established
         """
-        return {next(iter(self.key_attribute_names)): result.lastrowid}
+        connection = self.connection
+        results, upserts, inserts = [], {}, []
+        for attributes in attributes_list:
+            key_attributes, non_key_attributes = \
+                self._partition_attributes(self._encode_attributes(attributes))
+            if self._has_key(key_attributes) and not self.SUPPORTS_UPSERT:
+                results.append(self._upsert(key_attributes,
+                    non_key_attributes))
+                continue
+            if self._has_key(key_attributes):
+                upserts.setdefault(
+                    tuple(non_key_attributes.keys()), []
+                ).append((key_attributes, non_key_attributes, len(results)))
+                results.append(None)
+                continue
+            key_attributes = {
+                attribute_name: attribute_value
+                for attribute_name, attribute_value in key_attributes.items()
+                if attribute_value is not None
+            }
+            inserts.append((key_attributes, self._ordered_attributes(
+                key_attributes, non_key_attributes), len(results)))
+            results.append(None)
+        for non_key_attribute_names, rows in upserts.items():
+            cursor = connection.executemany(
+                self._parameterized_upsert_sql(non_key_attribute_names),
+                (
+                    [
+                        self._parameter_value(attribute_value)
+                        for _, attribute_value in self._ordered_attributes(
+                            key_attributes, non_key_attributes)
+                    ]
+                    for key_attributes, non_key_attributes, _ in rows
+                )
+            )
+            for key_attributes, _, index in rows:
+                results[index] = self._map_upsert_result(cursor,
+                    key_attributes)
+        # the keyless rows are INSERTed last, so that a generated key can never
+        # be claimed (and then overwritten) by a row whose key was supplied
+        for key_attributes, attributes, index in inserts:
+            results[index] = self._map_insert_result(connection.execute(
+                self._parameterized_insert_sql(
+                    [attribute_name for attribute_name, _ in attributes]),
+                [
+                    self._parameter_value(attribute_value)
+                    for _, attribute_value in attributes
+                ]
+            ), key_attributes)
+        return results
+
+    def rollback(self):
+        """
+        Roll back the transaction of the `connection`
+        """
+        self.connection.rollback()
+
+    def stream(
+        self,
+        attribute_names,
+        chunk_size=1000
+    ):
+        """
+        Stream the specified `attribute_names` of every row (in key order),
+        fetching `chunk_size` rows at a time
+
+        Args:
+            attribute_names (iterable of str): the attribute-names to select
+            chunk_size (int): the number of rows fetched at once
+
+        Yields:
+            dict: the attributes of the next row (key: `attribute_name`)
+
+        Raises:
+            RuntimeError: if a dependency could not be loaded or a connection to
+                DB could not be established
+        """
+        attribute_names = list(attribute_names)
+        cursor = self.connection.execute('SELECT %s FROM %s%s' % (
+            ', '.join(
+                self._column_name(attribute_name)
+                for attribute_name in attribute_names
+            ),
+            self.table_name,
+            ' ORDER BY %s' % ', '.join(
+                self._column_name(attribute_name)
+                for attribute_name in self.key_attribute_names
+            ) if self.key_attribute_names else '',
+        ))
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            for row in rows:
+                yield self._decode_attributes(dict(zip(attribute_names, row)),
+                    False)
+
+    def sum(
+        self,
+        attribute_name,
+        **filters
+    ):
+        """
+        Compute the sum of the values of the specified `attribute_name` over
+        the rows matching the specified `filters` (see: `count`), in SQL
+
+        Args:
+            attribute_name (str): the attribute-name
+            **filters (dict): the filters
+
+        Returns:
+            mixed: the sum (`None` if no row matches)
+
+        Raises:
+            RuntimeError: if a dependency could not be loaded or a connection to
+                DB could not be established
+            ValueError: if a filter operator is not supported
+        """
+        return self._aggregate('SUM(%s)' % self._column_name(attribute_name),
+            filters)
+
+    def _aggregate(
+        self,
+        expression,
+        filters
+    ):
+        """
+        Compute the specified aggregate `expression` over the rows matching the
+        specified `filters`
+
+        Args:
+            expression (str): the aggregate SQL expression
+            filters (dict): the filters (see: `count`)
+
+        Returns:
+            mixed: the value of the aggregate
+
+        Raises:
+            ValueError: if a filter operator is not supported
+        """
+        filter_sql, parameters = self._filter_sql(filters)
+        return self.connection.execute('SELECT %s FROM %s%s' % (expression,
+            self.table_name, filter_sql), parameters).fetchone()[0]
+
+    def _attribute_name(self, column_name):
+        """
+        Convert a column-name to an attribute-name (the inverse of
+        `_column_name`)
+
+        Args:
+            column_name (str): the column-name
+
+        Returns:
+            str: the attribute-name
+        """
+        return re.sub(r'(?<!^)(?=[A-Z])', '_', column_name).lower()
+
+    def _column_name(self, attribute_name):
+        """
+        Convert an attribute-name to a column-name
+
+        Args:
+            attribute_name (str): the attribute-name
+
+        Returns:
+            str: the column-name
+        """
+        return ''.join(
+            str.capitalize(attribute_name_part)
+            for attribute_name_part in attribute_name.split('_')
+        )
+
+    def _column_type(self, attribute):
+        """
+        Determine the column-type for an `Attribute`
+
+        Args:
+            attribute (Attribute): the `Attribute`
+
+        Returns:
+            str: the column-type
+        """
+        if attribute.codec is not None:
+            return attribute.codec.COLUMN_TYPE
+        for attribute_type, column_type in self.COLUMN_TYPES:
+            if attribute.type == attribute_type:
+                return column_type
+        return 'TEXT'
+
+    def _connect(self):
+        """
+        Establish a new connection to a DB
+
+        Returns:
+            mixed: the new connection instance
+
+        Raises:
+            NotImplementedError: if this method is not overridden by an
+                inheriting class
+        """
+        raise NotImplementedError
+
+    def _create_index_sqls(self, attribute_metadata):
+        """
+        Generate the SQL required to create the secondary indexes based on the
+        specified `attribute_metadata`
+
+        Args:
+            attribute_metadata (dict): the `Attribute` meta-data `dict` (key:
+                `attribute_name`)
+
+        Returns:
+            list (of str): the SQL strings
+        """
+        return [
+            'CREATE %sINDEX IF NOT EXISTS %s ON %s (%s)' % (
+                'UNIQUE ' if attribute.unique else '',
+                self._index_name(attribute_name),
+                self.table_name,
+                self._column_name(attribute_name),
+            )
+            for attribute_name, attribute in
+                self._indexed_attributes(attribute_metadata)
+        ]
+
+    def _create_table_sql(self, attribute_metadata):
+        """
+        Generate the SQL required to create the table based on the specified
+        `attribute_metadata` (the key-column(s) come first)
+
+        Args:
+            attribute_metadata (dict): the `Attribute` meta-data `dict` (key:
+                `attribute_name`)
+
+        Returns:
+            str: the SQL string
+        """
+        key_attribute_names = self.key_attribute_names
+        if len(key_attribute_names) == 1:
+            column_definitions = [
+                '%s %s PRIMARY KEY' % (
+                    self._column_name(key_attribute_names[0]),
+                    self._column_type(attribute_metadata[
+                        key_attribute_names[0]]),
+                )
+            ]
+        else:
+            column_definitions = [
+                '%s %s NOT NULL' % (
+                    self._column_name(attribute_name),
+                    self._column_type(attribute_metadata[attribute_name]),
+                )
+                for attribute_name in key_attribute_names
+            ]
+        column_definitions.extend(
+            '%s %s%s' % (
+                self._column_name(attribute_name),
+                self._column_type(attribute),
+                ' NOT NULL' if attribute.required else '',
+            )
+            for attribute_name, attribute in attribute_metadata.items()
+            if attribute_name not in key_attribute_names
+        )
+        if len(key_attribute_names) > 1:
+            column_definitions.append('PRIMARY KEY (%s)' % ', '.join(
+                self._column_name(attribute_name)
+                for attribute_name in key_attribute_names
+            ))
+        return 'CREATE TABLE IF NOT EXISTS %s (%s)' % (
+            self.table_name,
+            ', '.join(column_definitions),
+        )
+
+    def _decode_attributes(
+        self,
+        attributes,
+        lazy
+    ):
+        """
+        Decode the encoded values of the specified (loaded) `attributes`
+
+        Args:
+            attributes (dict): the attributes
+            lazy (bool): if the values should be wrapped in `Deferred` markers
+                (decoded on first read) rather than decoded now
+
+        Returns:
+            dict: the specified `attributes` (decoded in place)
+        """
+        for attribute_name, codec in self.codecs.items():
+            column_value = attributes.get(attribute_name)
+            if column_value is not None:
+                attributes[attribute_name] = Deferred(codec, column_value) if \
+                    lazy else codec.decode(column_value)
+        return attributes
+
+    def _drop_index_sqls(self, attribute_metadata):
+        """
+        Generate the SQL required to drop the secondary indexes based on the
+        specified `attribute_metadata`
+
+        Args:
+            attribute_metadata (dict): the `Attribute` meta-data `dict` (key:
+                `attribute_name`)
+
+        Returns:
+            list (of str): the SQL strings
+        """
+        return [
+            'DROP INDEX IF EXISTS %s' % self._index_name(attribute_name)
+            for attribute_name, _ in
+                self._indexed_attributes(attribute_metadata)
+        ]
+
+    def _encode_attributes(self, attributes):
+        """
+        Encode the values of the specified `attributes` which have a `Codec`. A
+        `Deferred` value which was never decoded is written back as-is and an
+        `Unloaded` value which was never read is not written
+
+        Args:
+            attributes (dict): the attributes
+
+        Returns:
+            dict: the encoded attributes (the specified `attributes` if there is
+                nothing to encode)
+        """
+        codecs = self.codecs
+        unloaded = any(
+            isinstance(attribute_value, Unloaded)
+            for attribute_value in attributes.values()
+        )
+        if unloaded:
+            attributes = {
+                attribute_name: attribute_value
+                for attribute_name, attribute_value in attributes.items()
+                if not isinstance(attribute_value, Unloaded)
+            }
+        if not codecs:
+            return attributes
+        encoded_attributes = dict(attributes)
+        for attribute_name, codec in codecs.items():
+            attribute_value = attributes.get(attribute_name)
+            if attribute_value is None:
+                continue
+            if isinstance(attribute_value, Deferred):
+                encoded_attributes[attribute_name] = \
+                    attribute_value.column_value if \
+                    attribute_value.codec is codec else \
+                    codec.encode(attribute_value.decode())
+            else:
+                encoded_attributes[attribute_name] = \
+                    codec.encode(attribute_value)
+        return encoded_attributes
+
+    def _filter_sql(self, filters):
+        """
+        Generate the (parameterized) SQL condition matching the specified
+        `filters` (see: `count`)
+
+        Args:
+            filters (dict): the filters
+
+        Returns:
+            tuple: a `(sql, parameters)` tuple, `sql` is empty if there are no
+                `filters` (otherwise it starts with ` WHERE`)
+
+        Raises:
+            ValueError: if a filter operator is not supported
+        """
+        if not filters:
+            return ('', [])
+        conditions, parameters = [], []
+        for name in sorted(filters):
+            filter_value = filters[name]
+            attribute_name, _, operator = name.rpartition('__')
+            if not attribute_name:
+                attribute_name, operator = name, 'eq'
+            elif operator not in _FILTER_OPERATORS:
+                raise ValueError('Unsupported filter: {}'.format(name))
+            column_name = self._column_name(attribute_name)
+            if operator == 'in':
+                filter_values = [
+                    self._parameter_value(value)
+                    for value in filter_value
+                ]
+                if not filter_values:
+                    conditions.append('0 = 1')
+                    continue
+                conditions.append('%s IN (%s)' % (column_name,
+                    ', '.join([self.PLACEHOLDER] * len(filter_values))))
+                parameters.extend(filter_values)
+            elif filter_value is None and operator in ('eq', 'ne'):
+                conditions.append('%s IS %sNULL' % (column_name,
+                    'NOT ' if operator == 'ne' else ''))
+            else:
+                conditions.append('%s %s %s' % (column_name,
+                    _FILTER_OPERATORS[operator], self.PLACEHOLDER))
+                parameters.append(self._parameter_value(filter_value))
+        return (' WHERE %s' % ' AND '.join(conditions), parameters)
+
+    def _has_key(self, key_attributes):
+        """
+        Determine if every key-attribute of the specified `key_attributes` has
+        a value (`None` is not a value, but a falsy value such as `0` is)
+
+        Args:
+            key_attributes (dict): the key-attributes
+
+        Returns:
+            bool: the result
+        """
+        key_attribute_names = self.key_attribute_names
+        return bool(key_attribute_names) and all(
+            key_attributes.get(attribute_name) is not None
+            for attribute_name in key_attribute_names
+        )
+
+    def _index_name(self, attribute_name):
+        """
+        Generate the name of the secondary index for an attribute-name
+
+        Args:
+            attribute_name (str): the attribute-name
+
+        Returns:
+            str: the index-name
+        """
+        return '%s%sIndex' % (self.table_name,
+            self._column_name(attribute_name))
+
+    def _indexed_attributes(self, attribute_metadata):
+        """
+        Filter the specified `attribute_metadata` down to the (non-key)
+        `Attribute(s)` configured with `index` or `unique`
+
+        Args:
+            attribute_metadata (dict): the `Attribute` meta-data `dict` (key:
+                `attribute_name`)
+
+        Returns:
+            list (of tuples): the `(attribute_name, attribute)` tuples
+        """
+        key_attribute_names = self.key_attribute_names
+        return [
+            (attribute_name, attribute)
+            for attribute_name, attribute in attribute_metadata.items()
+            if (attribute.index or attribute.unique) and
+                attribute_name not in key_attribute_names
+        ]
+
+    def _insert(
+        self,
+        key_attributes,
+        non_key_attributes
+    ):
+        """
+        Perform an INSERT operation based on the specified `key_attributes` (any
+        key-attribute which is omitted is expected to be generated by the DB)
+        and `non_key_attributes`
+
+        Args:
+            key_attributes (dict): the (provided) key-attributes
+            non_key_attributes (dict): the non-key-attributes
+
+        Returns:
+            mixed: the mapped INSERT result
+        """
+        sql, parameters = self._insert_sql(key_attributes, non_key_attributes)
+        return self._map_insert_result(self.connection.execute(sql,
+            parameters), key_attributes)
+
+    def _insert_sql(
+        self,
+        key_attributes,
+        non_key_attributes
+    ):
+        """
+        Generate the (parameterized) SQL required for an INSERT operation based
+        on the specified `key_attributes` and `non_key_attributes`
+
+        Args:
+            key_attributes (dict): the (provided) key-attributes
+            non_key_attributes (dict): the non-key-attributes
+
+        Returns:
+            tuple: a `(sql, parameters)` tuple
+        """
+        attributes = self._ordered_attributes(key_attributes,
+            non_key_attributes)
+        return (
+            self._parameterized_insert_sql(
+                [attribute_name for attribute_name, _ in attributes]),
+            [
+                self._parameter_value(attribute_value)
+                for _, attribute_value in attributes
+            ],
+        )
+
+    def _key_sql(self, key_attributes):
+        """
+        Generate the (parameterized) SQL condition matching the specified
+        `key_attributes` (in primary-key order)
+
+        Args:
+            key_attributes (dict): the key-attributes
+
+        Returns:
+            tuple: a `(sql, parameters)` tuple
+        """
+        return (
+            ' AND '.join(
+                '%s = %s' % (self._column_name(attribute_name),
+                    self.PLACEHOLDER)
+                for attribute_name in self.key_attribute_names
+            ),
+            [
+                self._parameter_value(key_attributes[attribute_name])
+                for attribute_name in self.key_attribute_names
+            ],
+        )
+
+    def _map_insert_result(
+        self,
+        result,
+        key_attributes
+    ):
+        """
+        Map the result from an INSERT operation
+
+        Args:
+            result (mixed): the unmapped INSERT result
+            key_attributes (dict): the (provided) key-attributes
+
+        Returns:
+            mixed: the mapped INSERT result
+        """
+        return result
+
+    def _map_update_result(
+        self,
+        result,
+        key_attributes
+    ):
+        """
+        Map the result from an UPDATE operation
+
+        Args:
+            result (mixed): the unmapped UPDATE result
+            key_attributes (dict): the key-attributes
+
+        Returns:
+            mixed: the mapped UPDATE result
+        """
+        return result
+
+    def _map_upsert_result(
+        self,
+        result,
+        key_attributes
+    ):
+        """
+        Map the result from an UPSERT operation
+
+        Args:
+            result (mixed): the unmapped UPSERT result
+            key_attributes (dict): the key-attributes
+
+        Returns:
+            mixed: the mapped UPSERT result
+        """
+        return result
+
+    def _ordered_attributes(
+        self,
+        key_attributes,
+        non_key_attributes
+    ):
+        """
+        Order the specified `key_attributes` (in primary-key order) ahead of the
+        specified `non_key_attributes`
+
+        Args:
+            key_attributes (dict): the key-attributes
+            non_key_attributes (dict): the non-key-attributes
+
+        Returns:
+            list (of tuples): the `(attribute_name, attribute_value)` tuples
+        """
+        attributes = [
+            (attribute_name, key_attributes[attribute_name])
+            for attribute_name in self.key_attribute_names
+            if attribute_name in key_attributes
+        ]
+        attributes.extend(non_key_attributes.items())
+        return attributes
+
+    def _parameter_value(self, attribute_value):
+        """
+        Convert an attribute-value to a (bindable) parameter-value
+
+        Args:
+            attribute_value (mixed): the attribute-value
+
+        Returns:
+            mixed: the parameter-value (a value of a type the DB-API module
+                can not bind is converted to its `str` representation)
+        """
+        if attribute_value is None or \
+            isinstance(attribute_value, (bytes, float) + Type.INTEGER +
+                Type.STRING):
+            return attribute_value
+        return str(attribute_value)
+
+    def _parameterized_insert_sql(self, attribute_names):
+        """
+        Generate the parameterized SQL required for an INSERT operation of the
+        specified `attribute_names`
+
+        Args:
+            attribute_names (list of str): the attribute-names (in order)
+
+        Returns:
+            str: the SQL string
+        """
+        return 'INSERT INTO %s (%s) VALUES (%s)' % (
+            self.table_name,
+            ', '.join(
+                self._column_name(attribute_name)
+                for attribute_name in attribute_names
+            ),
+            ', '.join([self.PLACEHOLDER] * len(attribute_names)),
+        )
+
+    def _parameterized_upsert_sql(self, non_key_attribute_names):
+        """
+        Generate the parameterized SQL required for an UPSERT operation of the
+        key-attributes (in primary-key order) followed by the specified
+        `non_key_attribute_names`
+
+        Args:
+            non_key_attribute_names (tuple of str): the non-key-attribute names
+                (in order)
+
+        Returns:
+            str: the SQL string
+        """
+        return '%s ON CONFLICT (%s) DO %s' % (
+            self._parameterized_insert_sql(self.key_attribute_names +
+                tuple(non_key_attribute_names)),
+            ', '.join(
+                self._column_name(attribute_name)
+                for attribute_name in self.key_attribute_names
+            ),
+            'UPDATE SET %s' % ', '.join(
+                '%s = excluded.%s' % ((self._column_name(attribute_name),) * 2)
+                for attribute_name in non_key_attribute_names
+            ) if non_key_attribute_names else 'NOTHING',
+        )
+
+    def _partition_attributes(self, attributes):
+        """
+        Partition the specified `attributes` into two `dict(s)`, one of the
+        `key_attributes` and another of the `non_key_attributes`
+
+        Args:
+            attributes (dict): the attributes
+
+        Returns:
+            tuple (of dicts): a `tuple` of the `key_attributes` and
+                `non_key_attributes`
+        """
+        key_attributes, non_key_attributes = {}, {}
+        key_attribute_names = self.key_attribute_names
+        for attribute_name, attribute_value in attributes.items():
+            if attribute_name in key_attribute_names:
+                key_attributes[attribute_name] = attribute_value
+            else:
+                non_key_attributes[attribute_name] = attribute_value
+        return (key_attributes, non_key_attributes)
+
+    def _select_sql(
+        self,
+        key_attributes,
+        attribute_names=None
+    ):
+        """
+        Generate the (parameterized) SQL required for a SELECT operation based
+        on the specified `key_attributes`
+
+        Args:
+            key_attributes (dict): the key-attributes
+            attribute_names (iterable of str): the attribute-names to select (if
+                omitted every column is selected)
+
+        Returns:
+            tuple: a `(sql, parameters)` tuple
+        """
+        key_sql, parameters = self._key_sql(key_attributes)
+        return ('SELECT %s FROM %s WHERE %s LIMIT 1' % (
+            ', '.join(
+                self._column_name(attribute_name)
+                for attribute_name in attribute_names
+            ) if attribute_names is not None else '*',
+            self.table_name,
+            key_sql,
+        ), parameters)
+
+    def _update_sql(
+        self,
+        key_attributes,
+        non_key_attributes
+    ):
+        """
+        Generate the (parameterized) SQL required for an UPDATE operation based
+        on the specified `key_attributes` and `non_key_attributes`
+
+        Args:
+            key_attributes (dict): the key-attributes
+            non_key_attributes (dict): the non-key-attributes
+
+        Returns:
+            tuple: a `(sql, parameters)` tuple
+        """
+        key_sql, key_parameters = self._key_sql(key_attributes)
+        return ('UPDATE %s SET %s WHERE %s' % (
+            self.table_name,
+            ', '.join(
+                '%s = %s' % (self._column_name(attribute_name),
+                    self.PLACEHOLDER)
+                for attribute_name in non_key_attributes
+            ),
+            key_sql,
+        ), [
+            self._parameter_value(attribute_value)
+            for attribute_value in non_key_attributes.values()
+        ] + key_parameters)
+
+    def _upsert(
+        self,
+        key_attributes,
+        non_key_attributes
+    ):
+        """
+        Perform an UPSERT (INSERT, or UPDATE if a row with the same key already
+        exists) operation based on the specified `key_attributes` and
+        `non_key_attributes`. If the DB does not support UPSERT (see:
+        `SUPPORTS_UPSERT`) an UPDATE is performed, followed by an INSERT if no
+        row was updated
+
+        Args:
+            key_attributes (dict): the key-attributes
+            non_key_attributes (dict): the non-key-attributes
+
+        Returns:
+            mixed: the mapped UPDATE, INSERT or UPSERT result
+        """
+        connection = self.connection
+        if self.SUPPORTS_UPSERT:
+            sql, parameters = self._upsert_sql(key_attributes,
+                non_key_attributes)
+            return self._map_upsert_result(connection.execute(sql,
+                parameters), key_attributes)
+        if non_key_attributes:
+            sql, parameters = self._update_sql(key_attributes,
+                non_key_attributes)
+            cursor = connection.execute(sql, parameters)
+            if cursor.rowcount:
+                return self._map_update_result(cursor, key_attributes)
+        else:
+            # there is nothing to UPDATE, an existing row is left as-is
+            key_sql, parameters = self._key_sql(key_attributes)
+            cursor = connection.execute('SELECT 1 FROM %s WHERE %s' % (
+                self.table_name, key_sql), parameters)
+            if cursor.fetchone() is not None:
+                return self._map_upsert_result(cursor, key_attributes)
+        return self._insert(key_attributes, non_key_attributes)
+
+    def _upsert_sql(
+        self,
+        key_attributes,
+        non_key_attributes
+    ):
+        """
+        Generate the (parameterized) SQL required for an UPSERT operation based
+        on the specified `key_attributes` (every key-attribute must be
+        provided) and `non_key_attributes`
+
+        Args:
+            key_attributes (dict): the key-attributes
+            non_key_attributes (dict): the non-key-attributes
+
+        Returns:
+            tuple: a `(sql, parameters)` tuple
+        """
+        return (
+            self._parameterized_upsert_sql(tuple(non_key_attributes)),
+            [
+                self._parameter_value(attribute_value)
+                for _, attribute_value in self._ordered_attributes(
+                    key_attributes, non_key_attributes)
+            ],
+        )
+
+
+class SQLitePersistor(SQLPersistor):
+    """
+    Class providing methods for persisting input to a SQLite DB (persistence
+    occurs when the `persist` method is called on a `Model` instance)
+
+    Class Attributes:
+        COLUMN_TYPES (tuple of tuples): the `(type, column-type)` mappings used
+            when generating DDL (SQLite type-affinities)
+        SUPPORTS_UPSERT (bool): if the loaded SQLite library (3.24.0, or later)
+            supports UPSERT, see: `SQLPersistor`
+
+    Instance Attributes:
+        attribute_metadata (dict): the `Attribute` meta-data `dict` (key:
+            `attribute_name`), see: `SQLPersistor`
+        connection (lazy-sqlite3.Connection, stored as `_connection`): the
+            `sqlite3.Connection` instance (it may be provided, e.g. to share it
+            between `Persistor(s)`)
+        database_file_path (str): the database file-path
+        table_name (str): the table name
+        key_attribute_names (tuple of str): the key-attribute names, in
+            primary-key (clustered) order
+        without_rowid (bool): if the table should be created as a `WITHOUT
+            ROWID` (clustered on the primary-key) table
+    """
+    COLUMN_TYPES = (
+        (Type.BOOLEAN, 'INTEGER'),
+        (Type.FLOAT, 'REAL'),
+        (Type.INTEGER, 'INTEGER'),
+        (Type.LONG, 'INTEGER'),
+    )
+    # `INSERT ... ON CONFLICT` was added in SQLite 3.24.0
+    SUPPORTS_UPSERT = sqlite3 is not None and \
+        sqlite3.sqlite_version_info >= (3, 24, 0)
+
+    def __init__(
+        self,
+        database_file_path,
+        table_name,
+        key_attribute_name=None,
+        key_attribute_names=None,
+        without_rowid=False,
+        connection=None,
+        attribute_metadata=None
+    ):
+        super(SQLitePersistor, self).__init__(table_name, key_attribute_name,
+            key_attribute_names, connection, attribute_metadata)
+        self.database_file_path = database_file_path
+        self.without_rowid = without_rowid
+
+    def _connect(self):
+        """
+        Establish a new connection to a SQLite DB
+
+        Returns:
+            sqlite3.Connection: the new connection instance
+
+        Raises:
+            RuntimeError: if the `sqlite3` library was not successfully loaded
+        """
+        if sqlite3 is None:
+            raise RuntimeError
+        return sqlite3.connect(self.database_file_path)
+
+    def _create_table_sql(self, attribute_metadata):
+        """
+        Generate the SQL required to create the table based on the specified
+        `attribute_metadata` (the key-column(s) come first)
+
+        Args:
+            attribute_metadata (dict): the `Attribute` meta-data `dict` (key:
+                `attribute_name`)
+
+        Returns:
+            str: the SQL string
+        """
+        sql = super(SQLitePersistor, self)._create_table_sql(attribute_metadata)
+        return '%s WITHOUT ROWID' % sql if self.without_rowid else sql
+
+    def _map_insert_result(
+        self,
+        result,
+        key_attributes
+    ):
+        """
+        Map the result from an INSERT operation. For a simple/singular key which
+        was not provided the `ROWID` (which it aliases) is used
+
+        Args:
+            result (sqlite3.Cursor): the unmapped INSERT result
+            key_attributes (dict): the (provided) key-attributes
+
+        Returns:
+            dict: the key-attributes
+        """
+        key_attribute_names = self.key_attribute_names
+        if len(key_attribute_names) == 1 and not key_attributes:
+            return {key_attribute_names[0]: result.lastrowid}
+        return dict(key_attributes)
+
+    def _map_update_result(
+        self,
+        result,
+        key_attributes
+    ):
+        """
+        Map the result from an UPDATE operation
+
+        Args:
+            result (sqlite3.Cursor): the unmapped UPDATE result
+            key_attributes (dict): the key-attributes
+
+        Returns:
+            dict: the key-attributes, or `None` if no row was updated
+        """
+        return dict(key_attributes) if result.rowcount else None
+
+    def _map_upsert_result(
+        self,
+        result,
+        key_attributes
+    ):
+        """
+        Map the result from an UPSERT operation
+
+        Args:
+            result (sqlite3.Cursor): the unmapped UPSERT result
+            key_attributes (dict): the key-attributes
+
+        Returns:
+            dict: the key-attributes
+        """
+        return dict(key_attributes)
+
+
+class ShardedSQLitePersistor(Persistor):
+    """
+    Class providing methods for persisting input across N SQLite DBs (shards).
+    SQLite allows a single writer per database file, as such each row is routed
+    to one shard by a stable hash (CRC-32) of its shard-attributes and the
+    shards are written in parallel (by threads, or by processes which open
+    their own connections). Each shard is a `SQLitePersistor` with its own
+    connection. A row is routed before it is written, as such every row must
+    have a value for each shard-attribute (the key can not be generated by the
+    DB) and a table without key-attributes (or shard-attributes) is rejected
+    (`ValueError`) when the `ShardedSQLitePersistor` is constructed. The
+    thread writer leaves the writes pending on the connections of the shards
+    (see: `commit`/`rollback`), the process writer commits each partition on a
+    dedicated connection (as such, every write is committed as it is made)
+
+    Instance Attributes:
+        attribute_metadata (dict): the `Attribute` meta-data `dict` (key:
+            `attribute_name`), see: `SQLPersistor`
+        database_file_paths (tuple of str): the database file-paths (one per
+            shard, their order determines the routing)
+        key_attribute_names (tuple of str): the key-attribute names, in
+            primary-key (clustered) order
+        shard_attribute_names (tuple of str): the attribute-names which are
+            hashed to route a row (defaults to the `key_attribute_names`)
+        shards (lazy-tuple of SQLitePersistor, stored as `_shards`): the
+            `SQLitePersistor` instance of each shard
+        table_name (str): the table name
+        transaction (mixed): the transaction the writes belong to (see:
+            `Persistor`), this `Persistor` (see: `commit`/`rollback`), `None`
+            for the process writer
+        without_rowid (bool): if the tables should be created as `WITHOUT
+            ROWID` (clustered on the primary-key) tables
+        writer (str): the kind of parallel writer used by `persist_many`
+            (`'thread'` or `'process'`)
+    """
+    def __init__(
+        self,
+        database_file_paths,
+        table_name,
+        key_attribute_name=None,
+        key_attribute_names=None,
+        shard_attribute_names=None,
+        without_rowid=False,
+        writer='thread',
+        attribute_metadata=None
+    ):
+        assert(not (key_attribute_name and key_attribute_names))
+        assert(writer in ('thread', 'process'))
+        self.attribute_metadata = attribute_metadata
+        self.database_file_paths = tuple(database_file_paths)
+        self.key_attribute_names = tuple(key_attribute_names) if \
+            key_attribute_names else (key_attribute_name,) if \
+            key_attribute_name else ()
+        self.shard_attribute_names = tuple(shard_attribute_names) if \
+            shard_attribute_names else self.key_attribute_names
+        if not self.shard_attribute_names:
+            raise ValueError('No shard-attributes for table: {}'.format(
+                table_name))
+        self.table_name = table_name
+        self.without_rowid = without_rowid
+        self.writer = writer
+        self._locks = tuple(threading.Lock() for _ in
+            self.database_file_paths)
+
+    @property
+    def shards(self):
+        """
+        Lazy-load and return the `SQLitePersistor` instance of each shard. The
+        connections may be used from any (one at a time) thread
+
+        Returns:
+            tuple (of SQLitePersistor): the `SQLitePersistor` instances
+
+        Raises:
+            RuntimeError: if the `sqlite3` library was not successfully loaded
+        """
+        if not hasattr(self, '_shards'):
+            if sqlite3 is None:
+                raise RuntimeError
+            self._shards = tuple(
+                SQLitePersistor(
+                    database_file_path,
+                    self.table_name,
+                    key_attribute_names=self.key_attribute_names,
+                    without_rowid=self.without_rowid,
+                    connection=sqlite3.connect(database_file_path,
+                        check_same_thread=False),
+                    attribute_metadata=self.attribute_metadata,
+                )
+                for database_file_path in self.database_file_paths
+            )
+        return self._shards
+
+    @property
+    def transaction(self):
+        """
+        Get the transaction the writes belong to (see: `Persistor`), this
+        `Persistor` (the shards are committed together, see: `commit`), or
+        `None` for the process writer (every write is committed as it is made)
+
+        Returns:
+            ShardedSQLitePersistor: this `Persistor` instance (or `None`)
+        """
+        if self.writer == 'process':
+            return None
+        return self
+
+    def close(self):
+        """
+        Close the connection of every shard (they are re-opened on next use)
+        """
+        if hasattr(self, '_shards'):
+            for shard in self._shards:
+                shard.connection.close()
+            del self._shards
+
+    def column_name(self, attribute_name):
+        """
+        Convert an attribute-name to a column-name (see: `SQLPersistor`)
+
+        Args:
+            attribute_name (str): the attribute-name
+
+        Returns:
+            str: the column-name
+        """
+        return self.shards[0].column_name(attribute_name)
+
+    def commit(self):
+        """
+        Commit the transaction of every shard (each shard is committed
+        independently, there is no cross-shard atomicity)
+        """
+        for index, shard in enumerate(self.shards):
+            with self._locks[index]:
+                shard.connection.commit()
+
+    def count(self, **filters):
+        """
+        Count the rows matching the specified `filters` (see:
+        `SQLPersistor.count`) across the shards (only the owning shard is
+        queried if every shard-attribute is filtered by equality)
+
+        Args:
+            **filters (dict): the filters
+
+        Returns:
+            int: the number of matching rows
+
+        Raises:
+            RuntimeError: if the `sqlite3` library was not successfully loaded
+            ValueError: if a filter operator is not supported
+        """
+        return sum(self._scatter('count', (), filters))
+
+    def count_by(
+        self,
+        attribute_names,
+        **filters
+    ):
+        """
+        Count the rows matching the specified `filters` (see:
+        `SQLPersistor.count`), grouped by the specified `attribute_names`,
+        across the shards
+
+        Args:
+            attribute_names (mixed): the attribute-name, or an iterable of
+                attribute-names, to group by
+            **filters (dict): the filters
+
+        Returns:
+            dict: the number of matching rows of each group (see:
+                `SQLPersistor.count_by`)
+
+        Raises:
+            RuntimeError: if the `sqlite3` library was not successfully loaded
+            ValueError: if a filter operator is not supported
+        """
+        counts = {}
+        for shard_counts in self._scatter('count_by', (attribute_names,),
+            filters):
+            for group, count in shard_counts.items():
+                counts[group] = counts.get(group, 0) + count
+        return counts
+
+    def create_indexes(self, attribute_metadata):
+        """
+        Create the secondary indexes on every shard
+
+        Args:
+            attribute_metadata (dict): the `Attribute` meta-data `dict` (key:
+                `attribute_name`)
+        """
+        for shard in self.shards:
+            shard.create_indexes(attribute_metadata)
+
+    def create_table(self, attribute_metadata):
+        """
+        Create the table, and its secondary indexes, on every shard
+
+        Args:
+            attribute_metadata (dict): the `Attribute` meta-data `dict` (key:
+                `attribute_name`)
+        """
+        for shard in self.shards:
+            shard.create_table(attribute_metadata)
+
+    def drop_indexes(self, attribute_metadata):
+        """
+        Drop the secondary indexes on every shard
+
+        Args:
+            attribute_metadata (dict): the `Attribute` meta-data `dict` (key:
+                `attribute_name`)
+        """
+        for shard in self.shards:
+            shard.drop_indexes(attribute_metadata)
+
+    def exists(self, **filters):
+        """
+        Determine if any row matches the specified `filters` (see:
+        `SQLPersistor.count`), the shards are queried (in order) until a
+        matching row is found
+
+        Args:
+            **filters (dict): the filters
+
+        Returns:
+            bool: the result
+
+        Raises:
+            RuntimeError: if the `sqlite3` library was not successfully loaded
+            ValueError: if a filter operator is not supported
+        """
+        for index in self._filter_shard_indexes(filters):
+            with self._locks[index]:
+                if self.shards[index].exists(**filters):
+                    return True
+        return False
+
+    def load(
+        self,
+        key_attributes,
+        attribute_names=None
+    ):
+        """
+        Load the attributes of the row identified by the specified
+        `key_attributes`. If every shard-attribute is provided only the owning
+        shard is queried, otherwise every shard is queried (in order) until the
+        row is found
+
+        Args:
+            key_attributes (dict): the key-attributes (every key-attribute must
+                be provided)
+            attribute_names (iterable of str): the attribute-names to load (if
+                omitted every column is loaded)
+
+        Returns:
+            dict: the attributes (key: `attribute_name`), or `None` if there is
+                no matching row
+
+        Raises:
+            RuntimeError: if the `sqlite3` library was not successfully loaded
+        """
+        if all(attribute_name in key_attributes for attribute_name in
+            self.shard_attribute_names):
+            indexes = (self.shard_index(key_attributes),)
+        else:
+            indexes = range(len(self.database_file_paths))
+        for index in indexes:
+            with self._locks[index]:
+                attributes = self.shards[index].load(key_attributes,
+                    attribute_names)
+            if attributes is not None:
+                return attributes
+        return None
+
+    def max(
+        self,
+        attribute_name,
+        **filters
+    ):
+        """
+        Compute the maximum value of the specified `attribute_name` over the
+        rows matching the specified `filters` (see: `SQLPersistor.count`)
+        across the shards
+
+        Args:
+            attribute_name (str): the attribute-name
+            **filters (dict): the filters
+
+        Returns:
+            mixed: the maximum value (`None` if no row matches)
+
+        Raises:
+            RuntimeError: if the `sqlite3` library was not successfully loaded
+            ValueError: if a filter operator is not supported
+        """
+        values = [
+            value
+            for value in self._scatter('max', (attribute_name,), filters)
+            if value is not None
+        ]
+        return max(values) if values else None
+
+    def min(
+        self,
+        attribute_name,
+        **filters
+    ):
+        """
+        Compute the minimum value of the specified `attribute_name` over the
+        rows matching the specified `filters` (see: `SQLPersistor.count`)
+        across the shards
+
+        Args:
+            attribute_name (str): the attribute-name
+            **filters (dict): the filters
+
+        Returns:
+            mixed: the minimum value (`None` if no row matches)
+
+        Raises:
+            RuntimeError: if the `sqlite3` library was not successfully loaded
+            ValueError: if a filter operator is not supported
+        """
+        values = [
+            value
+            for value in self._scatter('min', (attribute_name,), filters)
+            if value is not None
+        ]
+        return min(values) if values else None
+
+    def page(
+        self,
+        attribute_names=None,
+        after=None,
+        limit=100,
+        **filters
+    ):
+        """
+        Load a page of (at most `limit`) rows matching the specified `filters`
+        (see: `SQLPersistor.page`), in key order, across the shards. Each shard
+        seeks its own page and the pages are merged
+
+        Args:
+            attribute_names (iterable of str): the attribute-names to select,
+                the key-attributes are always selected (if omitted every column
+                is selected)
+            after (dict): the key-attributes of the row the page starts after
+                (if omitted the first page is loaded)
+            limit (int): the maximum number of rows
+            **filters (dict): the filters
+
+        Returns:
+            list (of dict): the attributes of each row (key: `attribute_name`)
+
+        Raises:
+            RuntimeError: if the `sqlite3` library was not successfully loaded
+            ValueError: if there are no key-attributes, or a filter operator is
+                not supported
+        """
+        key_attribute_names = self.key_attribute_names
+        rows = []
+        for shard_rows in self._scatter('page', (attribute_names, after,
+            limit), filters):
+            rows.extend(shard_rows)
+        rows.sort(key=lambda attributes: tuple(
+            attributes[attribute_name]
+            for attribute_name in key_attribute_names
+        ))
+        return rows[:limit]
+
+    def persist(self, attributes):
+        """
+        Persist the specified `attributes` to the owning shard (nothing is
+        committed, unless the writer is the process writer)
+
+        Args:
+            attributes (dict): the attributes
+
+        Returns:
+            mixed: the mapped INSERT/UPSERT result
+
+        Raises:
+            RuntimeError: if the `sqlite3` library was not successfully loaded
+            ValueError: if a shard-attribute has no value
+        """
+        index = self.shard_index(attributes)
+        with self._locks[index]:
+            shard = self.shards[index]
+            result = shard.persist(attributes)
+            if self.writer == 'process':
+                # a pending write would lock out the writers of `persist_many`
+                shard.connection.commit()
+            return result
+
+    def persist_many(self, attributes_list):
+        """
+        Persist the specified `attributes_list`. The rows are partitioned by
+        shard and each partition is written (via
+        `SQLitePersistor.persist_many`) by its own writer, in parallel. Nothing
+        is committed by the thread writer, the process writer commits each
+        partition independently (there is no cross-shard atomicity)
+
+        Args:
+            attributes_list (iterable of dict): the attributes of each row
+
+        Returns:
+            list: the mapped INSERT/UPSERT result of each row (in order)
+
+        Raises:
+            RuntimeError: if the `sqlite3` or `concurrent.futures` library was
+                not successfully loaded
+            ValueError: if a shard-attribute of any row has no value (nothing
+                is written)
+        """
+        partitions = {}
+        count = 0
+        for attributes in attributes_list:
+            partitions.setdefault(self.shard_index(attributes), []).append(
+                (count, attributes))
+            count += 1
+        results = [None] * count
+        if not partitions:
+            return results
+        if len(partitions) == 1:
+            # no parallelism to be gained, write in-process
+            index, rows = next(iter(partitions.items()))
+            self._write_partition_results(results, rows,
+                self._persist_partition(index, rows))
+            return results
+        # imported on first use, it is costly to import
+        try:
+            from concurrent import futures
+        except Exception:
+            raise RuntimeError
+        if self.writer == 'process':
+            executor = futures.ProcessPoolExecutor(max_workers=len(partitions))
+        else:
+            executor = futures.ThreadPoolExecutor(max_workers=len(partitions))
+        with executor:
+            futures_by_index = {
+                index: self._submit_partition(executor, index, rows)
+                for index, rows in partitions.items()
+            }
+            for index, future in futures_by_index.items():
+                self._write_partition_results(results, partitions[index],
+                    future.result())
+        return results
+
+    def reshard(
+        self,
+        database_file_paths,
+        attribute_metadata,
+        chunk_size=1000
+    ):
+        """
+        Copy every row into a new set of shards (e.g. to change N). The new
+        tables (and secondary indexes) are created, each row is re-routed and
+        written (and committed) in chunks. The existing shards are not modified
+        (their pending writes are not copied)
+
+        Args:
+            database_file_paths (iterable of str): the database file-paths of
+                the new shards
+            attribute_metadata (dict): the `Attribute` meta-data `dict` (key:
+                `attribute_name`)
+            chunk_size (int): the number of rows copied at once
+
+        Returns:
+            ShardedSQLitePersistor: the `ShardedSQLitePersistor` instance of the
+                new shards
+        """
+        persistor = type(self)(
+            database_file_paths,
+            self.table_name,
+            key_attribute_names=self.key_attribute_names,
+            shard_attribute_names=self.shard_attribute_names,
+            without_rowid=self.without_rowid,
+            writer=self.writer,
+            attribute_metadata=self.attribute_metadata,
+        )
+        persistor.create_table(attribute_metadata)
+        persistor.commit()
+        attributes_list = []
+        for attributes in self.stream(attribute_metadata, chunk_size):
+            attributes_list.append(attributes)
+            if len(attributes_list) == chunk_size:
+                persistor.persist_many(attributes_list)
+                persistor.commit()
+                attributes_list = []
+        if attributes_list:
+            persistor.persist_many(attributes_list)
+            persistor.commit()
+        return persistor
+
+    def rollback(self):
+        """
+        Roll back the transaction of every shard
+        """
+        for index, shard in enumerate(self.shards):
+            with self._locks[index]:
+                shard.connection.rollback()
+
+    def shard_index(self, attributes):
+        """
+        Determine the index of the shard which owns the specified `attributes`
+        (the routing is stable across processes and interpreter versions)
+
+        Args:
+            attributes (dict): the attributes
+
+        Returns:
+            int: the shard index
+
+        Raises:
+            ValueError: if a shard-attribute has no value
+        """
+        shard_attribute_values = []
+        for attribute_name in self.shard_attribute_names:
+            attribute_value = attributes.get(attribute_name)
+            if attribute_value is None:
+                raise ValueError('No value for shard-attribute: {}'.format(
+                    attribute_name))
+            shard_attribute_values.append(attribute_value)
+        return (zlib.crc32(json.dumps(shard_attribute_values,
+            default=str).encode('utf-8')) & 0xffffffff) % \
+            len(self.database_file_paths)
+
+    def stream(
+        self,
+        attribute_names,
+        chunk_size=1000
+    ):
+        """
+        Stream the specified `attribute_names` of every row (in key order). The
+        shards are read concurrently (by threads, each reading the next
+        `chunk_size` rows of its shard while the current ones are merged)
+
+        Args:
+            attribute_names (iterable of str): the attribute-names to select
+            chunk_size (int): the number of rows fetched at once (per shard)
+
+        Yields:
+            dict: the attributes of the next row (key: `attribute_name`)
+
+        Raises:
+            RuntimeError: if the `sqlite3` or `concurrent.futures` library was
+                not successfully loaded
+        """
+        attribute_names = list(attribute_names)
+        key_attribute_names = self.key_attribute_names
+        selected_attribute_names = attribute_names + [
+            attribute_name
+            for attribute_name in key_attribute_names
+            if attribute_name not in attribute_names
+        ]
+        shards = self.shards
+        # imported on first use, it is costly to import
+        try:
+            from concurrent import futures
+        except Exception:
+            raise RuntimeError
+        with futures.ThreadPoolExecutor(max_workers=len(shards)) as executor:
+            # the first chunk of every shard is requested up-front (`merge`
+            # only advances a shard once its previous row has been consumed)
+            streams = []
+            for index, shard in enumerate(shards):
+                rows = shard.stream(selected_attribute_names, chunk_size)
+                streams.append(self._decorated_stream(executor, index, rows,
+                    executor.submit(self._fetch_chunk, index, rows,
+                        chunk_size), chunk_size))
+            for _, _, attributes in heapq.merge(*streams):
+                yield {
+                    attribute_name: attributes[attribute_name]
+                    for attribute_name in attribute_names
+                }
+
+    def sum(
+        self,
+        attribute_name,
+        **filters
+    ):
+        """
+        Compute the sum of the values of the specified `attribute_name` over
+        the rows matching the specified `filters` (see: `SQLPersistor.count`)
+        across the shards
+
+        Args:
+            attribute_name (str): the attribute-name
+            **filters (dict): the filters
+
+        Returns:
+            mixed: the sum (`None` if no row matches)
+
+        Raises:
+            RuntimeError: if the `sqlite3` library was not successfully loaded
+            ValueError: if a filter operator is not supported
+        """
+        values = [
+            value
+            for value in self._scatter('sum', (attribute_name,), filters)
+            if value is not None
+        ]
+        return sum(values) if values else None
+
+    def _decorated_stream(
+        self,
+        executor,
+        index,
+        rows,
+        future,
+        chunk_size
+    ):
+        """
+        Stream the rows of a single shard, decorated for merging (in key
+        order). The next chunk is fetched (by the `executor`) while the current
+        one is consumed
+
+        Args:
+            executor (concurrent.futures.Executor): the executor
+            index (int): the shard index
+            rows (iterator of dict): the rows of the shard (see:
+                `SQLPersistor.stream`)
+            future (concurrent.futures.Future): the future of the first chunk
+            chunk_size (int): the number of rows fetched at once
+
+        Yields:
+            tuple: a `(key-values, index, attributes)` tuple for the next row
+        """
+        key_attribute_names = self.key_attribute_names
+        while True:
+            chunk = future.result()
+            if not chunk:
+                return
+            future = executor.submit(self._fetch_chunk, index, rows,
+                chunk_size)
+            for attributes in chunk:
+                yield (
+                    tuple(
+                        attributes[attribute_name]
+                        for attribute_name in key_attribute_names
+                    ),
+                    index,
+                    attributes,
+                )
+
+    def _fetch_chunk(
+        self,
+        index,
+        rows,
+        chunk_size
+    ):
+        """
+        Fetch the next `chunk_size` rows of a single shard
+
+        Args:
+            index (int): the shard index
+            rows (iterator of dict): the rows of the shard
+            chunk_size (int): the number of rows to fetch
+
+        Returns:
+            list (of dict): the rows (empty once the shard is exhausted)
+        """
+        with self._locks[index]:
+            return list(itertools.islice(rows, chunk_size))
+
+    def _filter_shard_indexes(self, filters):
+        """
+        Determine the indexes of the shards which may hold rows matching the
+        specified `filters`: only the owning shard if every shard-attribute is
+        filtered by equality (to a value), otherwise every shard
+
+        Args:
+            filters (dict): the filters (see: `SQLPersistor.count`)
+
+        Returns:
+            iterable (of int): the shard indexes
+        """
+        if all(filters.get(attribute_name) is not None for attribute_name in
+            self.shard_attribute_names):
+            return (self.shard_index(filters),)
+        return range(len(self.database_file_paths))
+
+    def _persist_partition(
+        self,
+        index,
+        rows
+    ):
+        """
+        Persist the specified `rows` to a single shard, using its (shared)
+        connection (nothing is committed), or a dedicated connection (which is
+        committed) for the process writer
+
+        Args:
+            index (int): the shard index
+            rows (list of tuples): the `(position, attributes)` of each row
+
+        Returns:
+            list: the mapped INSERT/UPSERT result of each row (in order)
+        """
+        with self._locks[index]:
+            if self.writer == 'process':
+                return _persist_shard(*self._persist_shard_arguments(index,
+                    rows))
+            return self.shards[index].persist_many(
+                attributes for _, attributes in rows)
+
+    def _persist_shard_arguments(
+        self,
+        index,
+        rows
+    ):
+        """
+        Build the arguments of `_persist_shard` for the specified `rows` of a
+        single shard. The values are encoded here, the `Attribute` meta-data is
+        not shipped to the workers
+
+        Args:
+            index (int): the shard index
+            rows (list of tuples): the `(position, attributes)` of each row
+
+        Returns:
+            tuple: the positional arguments
+        """
+        shard = self.shards[index]
+        return (
+            self.database_file_paths[index],
+            self.table_name,
+            self.key_attribute_names,
+            [shard._encode_attributes(attributes) for _, attributes in rows],
+        )
+
+    def _scatter(
+        self,
+        method_name,
+        args,
+        filters
+    ):
+        """
+        Call the specified (query) method on each shard which may hold rows
+        matching the specified `filters`
+
+        Args:
+            method_name (str): the name of the `SQLPersistor` method
+            args (tuple): the positional arguments of the method
+            filters (dict): the filters (see: `SQLPersistor.count`)
+
+        Returns:
+            list: the result of each queried shard (in shard order)
+        """
+        results = []
+        for index in self._filter_shard_indexes(filters):
+            with self._locks[index]:
+                results.append(getattr(self.shards[index], method_name)(*args,
+                    **filters))
+        return results
+
+    def _submit_partition(
+        self,
+        executor,
+        index,
+        rows
+    ):
+        """
+        Submit the write of the specified `rows` to a single shard to the
+        specified `executor`
+
+        Args:
+            executor (concurrent.futures.Executor): the executor
+            index (int): the shard index
+            rows (list of tuples): the `(position, attributes)` of each row
+
+        Returns:
+            concurrent.futures.Future: the future of the results
+        """
+        if self.writer == 'process':
+            return executor.submit(_persist_shard,
+                *self._persist_shard_arguments(index, rows))
+        return executor.submit(self._persist_partition, index, rows)
+
+    def _write_partition_results(
+        self,
+        results,
+        rows,
+        partition_results
+    ):
+        """
+        Write the results of a single shard into the (ordered) `results`
+
+        Args:
+            results (list): the results of every row
+            rows (list of tuples): the `(position, attributes)` of each row
+            partition_results (list): the results of the shard (in order)
+        """
+        for (position, _), result in zip(rows, partition_results):
+            results[position] = result
+
+
+class CachingPersistor(Persistor):
+    """
+    Class providing a read-through/write-through cache (LRU with TTL) in front
+    of a `SQLPersistor`. Loaded rows are kept by key and key lookups are served
+    from memory, missing keys can be cached too (negative caching). A
+    `persist` updates (write-through) or drops (invalidate) the cached row of
+    its key. Rows are cached as they are stored (the encoded column-values,
+    which are immutable, as such a cached row shares nothing with a `Model`)
+    and a hit returns them wrapped as `SQLPersistor.load` does (decoded on
+    first read). The cache holds uncommitted writes, `rollback` drops every
+    cached row (`invalidate`/`clear` should be used if the transaction of the
+    wrapped `persistor` is rolled back directly). The cache itself is
+    thread-safe, but the calls to the wrapped `persistor` are not serialized
+    (the lock is not held during I/O), as such it must be thread-safe too if
+    the `CachingPersistor` is shared between threads (a `SQLitePersistor` is
+    not, its connection may only be used by one thread at a time)
+
+    Instance Attributes:
+        eviction_count (int): the number of rows evicted (LRU)
+        expiration_count (int): the number of rows expired (TTL)
+        hit_count (int): the number of lookups served from memory
+        max_size (int): the maximum number of cached rows
+        miss_count (int): the number of lookups served by the `persistor`
+        negative_ttl (float): the time-to-live (in seconds) of a missing key
+            (`0` disables negative caching, `None` never expires)
+        persistor (SQLPersistor): the wrapped `SQLPersistor` instance (it is
+            called without holding the lock)
+        transaction (mixed): the transaction the writes belong to (see:
+            `Persistor`), this `Persistor` (its `rollback` drops the cached
+            rows)
+        ttl (float): the time-to-live (in seconds) of a row (`None` never
+            expires)
+        write_through (bool): if a `persist` should update, rather than drop,
+            the cached row of its key
+    """
+    def __init__(
+        self,
+        persistor,
+        max_size=1024,
+        ttl=None,
+        negative_ttl=0,
+        write_through=True
+    ):
+        self.eviction_count = 0
+        self.expiration_count = 0
+        self.hit_count = 0
+        self.max_size = max_size
+        self.miss_count = 0
+        self.negative_ttl = negative_ttl
+        self.persistor = persistor
+        self.ttl = ttl
+        self.write_through = write_through
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._lock = threading.RLock()
+
+    @property
+    def connection(self):
+        """
+        Get the "Connection" instance of the wrapped `persistor`
+
+        Returns:
+            mixed: the "Connection" instance
+        """
+        return self.persistor.connection
+
+    @property
+    def key_attribute_names(self):
+        """
+        Get the key-attribute names of the wrapped `persistor`
+
+        Returns:
+            tuple (of str): the key-attribute names
+        """
+        return self.persistor.key_attribute_names
+
+    @property
+    def transaction(self):
+        """
+        Get the transaction the writes belong to (see: `Persistor`), this
+        `Persistor` (as such a `rollback` drops the cached rows)
+
+        Returns:
+            CachingPersistor: this `Persistor` instance
+        """
+        return self
+
+    def clear(self):
+        """
+        Drop every cached row (the counters are kept)
+        """
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def column_name(self, attribute_name):
+        """
+        Convert an attribute-name to a column-name (via the wrapped
+        `persistor`)
+
+        Args:
+            attribute_name (str): the attribute-name
+
+        Returns:
+            str: the column-name
+        """
+        return self.persistor.column_name(attribute_name)
+
+    def commit(self):
+        """
+        Commit the pending writes of the wrapped `persistor`
+        """
+        self.persistor.commit()
+
+    def invalidate(self, key_attributes):
+        """
+        Drop the cached row of the specified `key_attributes`
+
+        Args:
+            key_attributes (dict): the key-attributes
+        """
+        with self._lock:
+            self._entries.pop(self._key(key_attributes), None)
+            self._generation += 1
+
+    def load(
+        self,
+        key_attributes,
+        attribute_names=None
+    ):
+        """
+        Load the attributes of the row identified by the specified
+        `key_attributes`, from memory if they are cached (and not expired). A
+        miss is loaded via the wrapped `persistor` and cached
+
+        Args:
+            key_attributes (dict): the key-attributes (every key-attribute must
+                be provided)
+            attribute_names (iterable of str): the attribute-names to load (if
+                omitted every column is loaded)
+
+        Returns:
+            dict: the attributes (key: `attribute_name`), or `None` if there is
+                no matching row
+        """
+        key = self._key(key_attributes)
+        if attribute_names is not None:
+            attribute_names = list(attribute_names)
+        with self._lock:
+            entry = self._get(key)
+            if entry is not None:
+                attributes = entry[1]
+                if attributes is _MISSING:
+                    self.hit_count += 1
+                    return None
+                # a row cached with fewer attributes can not serve a wider
+                # lookup
+                if attribute_names is not None and all(
+                    attribute_name in attributes
+                    for attribute_name in attribute_names
+                ):
+                    self.hit_count += 1
+                    return self.persistor._decode_attributes({
+                        attribute_name: attributes[attribute_name]
+                        for attribute_name in attribute_names
+                    }, True)
+                if attribute_names is None and entry[2]:
+                    self.hit_count += 1
+                    return self.persistor._decode_attributes(dict(attributes),
+                        True)
+            self.miss_count += 1
+            generation = self._generation
+        attributes = self.persistor.load(key_attributes, attribute_names)
+        with self._lock:
+            # do not cache a row which was read before a concurrent write
+            if generation == self._generation:
+                if attributes is None:
+                    if self.negative_ttl != 0:
+                        self._put(key, _MISSING, False, self.negative_ttl)
+                else:
+                    self._put(key, self._column_values(attributes),
+                        attribute_names is None, self.ttl)
+        return attributes
+
+    def persist(self, attributes):
+        """
+        Persist the specified `attributes` via the wrapped `persistor`, then
+        update (or drop) the cached row of their key
+
+        Args:
+            attributes (dict): the attributes
+
+        Returns:
+            mixed: the mapped INSERT/UPSERT result
+        """
+        result = self.persistor.persist(attributes)
+        self._written(attributes, result)
+        return result
+
+    def persist_many(self, attributes_list):
+        """
+        Persist the specified `attributes_list` via the wrapped `persistor`,
+        then update (or drop) the cached row of each key
+
+        Args:
+            attributes_list (iterable of dict): the attributes of each row
+
+        Returns:
+            list: the mapped INSERT/UPSERT result of each row (in order)
+        """
+        attributes_list = list(attributes_list)
+        results = self.persistor.persist_many(attributes_list)
+        for attributes, result in zip(attributes_list, results):
+            self._written(attributes, result)
+        return results
+
+    def rollback(self):
+        """
+        Roll back the pending writes of the wrapped `persistor`, every cached
+        row is dropped (it may hold a rolled back write)
+        """
+        try:
+            self.persistor.rollback()
+        finally:
+            self.clear()
+
+    def stream(
+        self,
+        attribute_names,
+        chunk_size=1000
+    ):
+        """
+        Stream the specified `attribute_names` of every row via the wrapped
+        `persistor` (the cache is bypassed)
+
+        Args:
+            attribute_names (iterable of str): the attribute-names to select
+            chunk_size (int): the number of rows fetched at once
+
+        Returns:
+            iterator (of dict): the attributes of each row
+        """
+        return self.persistor.stream(attribute_names, chunk_size)
+
+    def _column_values(self, attributes):
+        """
+        Convert the specified (loaded or written) `attributes` to the cached
+        representation: the column-values, as they are stored (encoded by the
+        wrapped `persistor`). An `Unloaded` value is omitted
+
+        Args:
+            attributes (dict): the attributes
+
+        Returns:
+            dict: the column-values (key: `attribute_name`)
+        """
+        persistor = self.persistor
+        return {
+            attribute_name: persistor._parameter_value(column_value)
+            for attribute_name, column_value in
+                persistor._encode_attributes(attributes).items()
+        }
+
+    def _get(self, key):
+        """
+        Get the (unexpired) cache entry of the specified `key`, marking it as
+        the most recently used (the lock must be held)
+
+        Args:
+            key (tuple): the key
+
+        Returns:
+            list: the `[expires_at, attributes, complete]` entry, or `None`
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] is not None and entry[0] <= _clock():
+            del self._entries[key]
+            self.expiration_count += 1
+            return None
+        # move the entry to the most recently used end
+        del self._entries[key]
+        self._entries[key] = entry
+        return entry
+
+    def _key(self, key_attributes):
+        """
+        Generate the cache key of the specified `key_attributes`
+
+        Args:
+            key_attributes (dict): the key-attributes
+
+        Returns:
+            tuple: the key-values, in primary-key order
+        """
+        return tuple(
+            key_attributes.get(attribute_name)
+            for attribute_name in self.persistor.key_attribute_names
+        )
+
+    def _put(
+        self,
+        key,
+        attributes,
+        complete,
+        ttl
+    ):
+        """
+        Cache the `attributes` of the specified `key`, evicting the least
+        recently used entries beyond `max_size` (the lock must be held)
+
+        Args:
+            key (tuple): the key
+            attributes (mixed): the attributes (`_MISSING` for a missing key)
+            complete (bool): if every column was loaded
+            ttl (float): the time-to-live (in seconds, `None` never expires)
+        """
+        self._entries.pop(key, None)
+        self._entries[key] = [
+            _clock() + ttl if ttl is not None else None,
+            attributes,
+            complete,
+        ]
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.eviction_count += 1
+
+    def _written(
+        self,
+        attributes,
+        result
+    ):
+        """
+        Update (or drop) the cached row of the key of the specified (written)
+        `attributes`. The key is taken from the mapped result if it holds one
+        (e.g. a generated key). Nothing is updated if the write failed (the
+        `result` is `None`)
+
+        Args:
+            attributes (dict): the attributes
+            result (mixed): the mapped INSERT/UPSERT result
+        """
+        if result is None:
+            return
+        if isinstance(result, dict):
+            attributes = dict(attributes, **result)
+        key = self._key(attributes)
+        # an `Unloaded` value was not written, its (cached) value is kept
+        column_values = self._column_values(attributes) if \
+            self.write_through else None
+        with self._lock:
+            self._generation += 1
+            entry = self._get(key)
+            if entry is None:
+                return
+            if self.write_through and entry[1] is not _MISSING:
+                entry[1].update(column_values)
+                entry[0] = _clock() + self.ttl if self.ttl is not None else \
+                    None
+            else:
+                del self._entries[key]
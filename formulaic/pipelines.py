@@ -0,0 +1,264 @@
+__all__ = (
+    'Pipeline',
+    'PipelineStats',
+)
+
+
+import csv
+import json
+import time
+
+from .models import _chunk
+
+
+class PipelineStats(object):
+    """
+    Class representing the throughput/progress counters of a `Pipeline` run
+
+    Instance Attributes:
+        read_count (int): the number of records read
+        rejected_count (int): the number of records rejected
+        started_at (float): the (epoch) time the run started
+        stopped_at (float): the (epoch) time the run stopped (`None` while
+            running)
+        written_count (int): the number of records written
+    """
+    def __init__(self):
+        self.read_count = 0
+        self.rejected_count = 0
+        self.started_at = time.time()
+        self.stopped_at = None
+        self.written_count = 0
+
+    @property
+    def elapsed(self):
+        """
+        Get the elapsed time (in seconds)
+
+        Returns:
+            float: the elapsed time
+        """
+        return (self.stopped_at or time.time()) - self.started_at
+
+    @property
+    def records_per_second(self):
+        """
+        Get the throughput (read records per second)
+
+        Returns:
+            float: the throughput
+        """
+        elapsed = self.elapsed
+        return self.read_count / elapsed if elapsed else 0.0
+
+    def __repr__(self):
+        return '{}(read={}, written={}, rejected={}, elapsed={:.3f})'.format(
+            type(self).__name__, self.read_count, self.written_count,
+            self.rejected_count, self.elapsed)
+
+
+class Pipeline(object):
+    """
+    Class providing methods for moving records between flat-files (CSV or
+    NDJSON) and a `Persistor` (which supports `persist_many` and `stream`)
+    through a `Model` class. Records are consumed lazily and processed in
+    chunks (format/validate, then one batched write and commit per chunk), as
+    such memory is bounded by `chunk_size`. The column mapping is derived from
+    the `attribute_metadata` of the `Model` class and `Persistor.column_name`
+    (a flat-file field may be named after either the attribute or the column)
+
+    Instance Attributes:
+        chunk_size (int): the number of records processed at once
+        model_class (type): the `Model` class
+        persistor (Persistor): the `Persistor` instance
+        progress (callable): called with the `PipelineStats` after each chunk
+        rejects (callable): called with each rejected record and the `dict` of
+            `FieldError(s)` it was rejected for (key: `attribute_name`)
+    """
+    def __init__(
+        self,
+        model_class,
+        persistor,
+        chunk_size=1000,
+        rejects=None,
+        progress=None
+    ):
+        self.chunk_size = chunk_size
+        self.model_class = model_class
+        self.persistor = persistor
+        self.progress = progress
+        self.rejects = rejects
+
+    @property
+    def field_mapping(self):
+        """
+        Lazy load and return the flat-file field-name to attribute-name mapping
+
+        Returns:
+            dict: the mapping (key: attribute-name or column-name)
+        """
+        if not hasattr(self, '_field_mapping'):
+            field_mapping = {}
+            for attribute_name in self.model_class.attribute_metadata:
+                field_mapping[attribute_name] = attribute_name
+                field_mapping[self.persistor.column_name(attribute_name)] = \
+                    attribute_name
+            self._field_mapping = field_mapping
+        return self._field_mapping
+
+    def export_csv(self, file):
+        """
+        Export every row to the specified CSV `file` (with a header of
+        attribute-names)
+
+        Args:
+            file (file): the (text) file-like object
+
+        Returns:
+            PipelineStats: the counters
+        """
+        attribute_names = list(self.model_class.attribute_metadata)
+        writer = csv.writer(file)
+        writer.writerow(attribute_names)
+        return self._export(
+            lambda record: writer.writerow([
+                record[attribute_name] for attribute_name in attribute_names
+            ])
+        )
+
+    def export_ndjson(self, file):
+        """
+        Export every row to the specified NDJSON `file`
+
+        Args:
+            file (file): the (text) file-like object
+
+        Returns:
+            PipelineStats: the counters
+        """
+        return self._export(
+            lambda record: file.write(json.dumps(record, default=str,
+                separators=(',', ':')) + '\n')
+        )
+
+    def export_records(self):
+        """
+        Export every row (in key order)
+
+        Yields:
+            dict: the attributes of the next row (key: `attribute_name`)
+        """
+        return self.persistor.stream(self.model_class.attribute_metadata,
+            self.chunk_size)
+
+    def import_csv(self, file):
+        """
+        Import the records of the specified CSV `file` (the first row is the
+        header). Empty fields are imported as `None`
+
+        Args:
+            file (file): the (text) file-like object
+
+        Returns:
+            PipelineStats: the counters
+        """
+        return self.import_records(
+            {
+                field_name: field_value if field_value != '' else None
+                for field_name, field_value in record.items()
+            }
+            for record in csv.DictReader(file)
+        )
+
+    def import_ndjson(self, file):
+        """
+        Import the records of the specified NDJSON `file` (blank lines are
+        skipped)
+
+        Args:
+            file (file): the (text) file-like object
+
+        Returns:
+            PipelineStats: the counters
+        """
+        return self.import_records(
+            json.loads(line) for line in file if line.strip()
+        )
+
+    def import_records(self, records):
+        """
+        Import the specified `records`. Each record is built into a `Model`
+        instance (formatted and validated), the valid ones are written via
+        `Persistor.persist_many` and committed (`Persistor.commit`) once per
+        chunk, the invalid ones are passed to `rejects`
+
+        Args:
+            records (iterable of dict): the records
+
+        Returns:
+            PipelineStats: the counters
+        """
+        stats = PipelineStats()
+        for chunk in _chunk(records, self.chunk_size):
+            stats.read_count += len(chunk)
+            attributes_list = []
+            for record in chunk:
+                attributes, errors = self._build(record)
+                if errors is None:
+                    attributes_list.append(attributes)
+                else:
+                    stats.rejected_count += 1
+                    if self.rejects is not None:
+                        self.rejects(record, errors)
+            if attributes_list:
+                self.persistor.persist_many(attributes_list)
+                self.persistor.commit()
+                stats.written_count += len(attributes_list)
+            if self.progress is not None:
+                self.progress(stats)
+        stats.stopped_at = time.time()
+        return stats
+
+    def _build(self, record):
+        """
+        Build and validate a `Model` instance from the specified `record` (via
+        the non-raising `Model.try_build`)
+
+        Args:
+            record (dict): the record
+
+        Returns:
+            tuple: a `(attributes, errors)` tuple, `attributes` is `None` if the
+                record is invalid, in which case `errors` is a `dict` of
+                `FieldError(s)` (key: `attribute_name`)
+        """
+        field_mapping = self.field_mapping
+        model, errors = self.model_class.try_build({
+            field_mapping[field_name]: field_value
+            for field_name, field_value in record.items()
+            if field_name in field_mapping
+        })
+        if errors:
+            return (None, errors)
+        return (model.stored_merged_attribute_data, None)
+
+    def _export(self, write):
+        """
+        Export every row via the specified `write` callable
+
+        Args:
+            write (callable): called with the attributes of each row
+
+        Returns:
+            PipelineStats: the counters
+        """
+        stats = PipelineStats()
+        for record in self.export_records():
+            stats.read_count += 1
+            write(record)
+            stats.written_count += 1
+            if self.progress is not None and \
+                stats.read_count % self.chunk_size == 0:
+                self.progress(stats)
+        stats.stopped_at = time.time()
+        return stats
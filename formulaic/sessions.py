@@ -0,0 +1,226 @@
+__all__ = (
+    'Session',
+    'SessionStats',
+)
+
+
+import time
+
+from .errors import TriggerError, ValidationError
+
+
+class SessionStats(object):
+    """
+    Class representing the statistics of a single `Session.flush`
+
+    Instance Attributes:
+        connection_count (int): the number of distinct transactions (e.g.
+            connections, see: `Persistor.transaction`) written to
+        elapsed (float): the elapsed time (in seconds)
+        group_count (int): the number of (persistor) groups written
+        inserted_count (int): the number of `Model(s)` inserted
+        updated_count (int): the number of `Model(s)` updated
+    """
+    def __init__(self):
+        self.connection_count = 0
+        self.elapsed = 0.0
+        self.group_count = 0
+        self.inserted_count = 0
+        self.updated_count = 0
+
+    def __repr__(self):
+        return '{}(inserted={}, updated={}, groups={}, connections={}, ' \
+            'elapsed={:.3f})'.format(type(self).__name__, self.inserted_count,
+            self.updated_count, self.group_count, self.connection_count,
+            self.elapsed)
+
+
+class Session(object):
+    """
+    Class representing a unit-of-work. `Model(s)` are added to the `Session`
+    and the dirty ones (never persisted, or with a non-empty
+    `changed_attribute_data`) are written together on `flush`/`commit`: they
+    are grouped per `Persistor` (table), every insert is written before any
+    update and each group is written with batched statements
+    (`Persistor.persist_many`). `Persistor(s)` which share a transaction (see:
+    `Persistor.transaction`, e.g. `SQLPersistor(s)` which share a connection)
+    are committed together, the writes of a `Persistor` without a transaction
+    (e.g. a `WriterPersistor`) are committed as they are made. The `Journal`
+    records of the written `Model(s)` are staged until `commit` (and discarded
+    by `rollback`)
+
+    Instance Attributes:
+        models (list of Model): the tracked `Model(s)`
+        stats (SessionStats): the statistics of the last `flush`
+    """
+    def __init__(self, models=None):
+        self.models = []
+        self.stats = None
+        self._model_ids = set()
+        self._transactions = {}
+        for model in models or ():
+            self.add(model)
+
+    @property
+    def dirty(self):
+        """
+        Get the dirty `Model(s)` (this *is not* memoized)
+
+        Returns:
+            list (of Model): the dirty `Model(s)`, in the order they were added
+        """
+        return [
+            model
+            for model in self.models
+            if not model.persisted or model.changed_attribute_data
+        ]
+
+    def add(self, model):
+        """
+        Track the specified `model` (adding a tracked `Model` is a no-op)
+
+        Args:
+            model (Model): the `Model` instance
+        """
+        if id(model) not in self._model_ids:
+            self._model_ids.add(id(model))
+            self.models.append(model)
+
+    def clear(self):
+        """
+        Stop tracking every `Model`
+        """
+        del self.models[:]
+        self._model_ids.clear()
+
+    def commit(self):
+        """
+        Flush the dirty `Model(s)` and commit every transaction which was
+        written to (since the last `commit`/`rollback`), then append the
+        `Journal` records staged in each transaction
+
+        Returns:
+            SessionStats: the statistics of the flush
+
+        Raises:
+            RuntimeError: if a dirty `Model` has no `Persistor` [instance]
+            TriggerError: if a (deferred or dispatched) `Trigger` handler of a
+                dirty `Model` raised (nothing is written)
+            ValidationError: if a dirty `Model` is invalid (nothing is written)
+        """
+        stats = self._flush()
+        transactions = self._transactions
+        while transactions:
+            _, (transaction, journals) = transactions.popitem()
+            transaction.commit()
+            for journal in journals.values():
+                journal.commit(transaction)
+        return stats
+
+    def flush(self):
+        """
+        Write the dirty `Model(s)`, without committing. If a write fails every
+        transaction which was written to (since the last `commit`/`rollback`)
+        is rolled back (and no `Model` is updated)
+
+        Returns:
+            SessionStats: the statistics of the flush
+
+        Raises:
+            RuntimeError: if a dirty `Model` has no `Persistor` [instance]
+            TriggerError: if a (deferred or dispatched) `Trigger` handler of a
+                dirty `Model` raised (nothing is written)
+            ValidationError: if a dirty `Model` is invalid (nothing is written)
+        """
+        return self._flush()
+
+    def remove(self, model):
+        """
+        Stop tracking the specified `model`
+
+        Args:
+            model (Model): the `Model` instance
+        """
+        if id(model) in self._model_ids:
+            self._model_ids.discard(id(model))
+            self.models.remove(model)
+
+    def rollback(self):
+        """
+        Roll back every transaction which was written to (since the last
+        `commit`/`rollback`) and discard the `Journal` records staged in each
+        transaction. The written `Model(s)` are not reverted
+        """
+        transactions = self._transactions
+        while transactions:
+            _, (transaction, journals) = transactions.popitem()
+            transaction.rollback()
+            for journal in journals.values():
+                journal.rollback(transaction)
+
+    def _flush(self):
+        """
+        Write the dirty `Model(s)`, without committing
+
+        Returns:
+            SessionStats: the statistics of the flush
+
+        Raises:
+            RuntimeError: if a dirty `Model` has no `Persistor` [instance]
+            TriggerError: if a (deferred or dispatched) `Trigger` handler of a
+                dirty `Model` raised (nothing is written)
+            ValidationError: if a dirty `Model` is invalid (nothing is written)
+        """
+        started_at = time.time()
+        stats = SessionStats()
+        # partition the dirty `Model(s)` into inserts and updates, grouped by
+        # `Persistor` (in the order the `Model(s)` were added)
+        inserts, updates, persistors = {}, {}, {}
+        for model in self.dirty:
+            persistor = model.persistor
+            if persistor is None:
+                raise RuntimeError
+            errors = model.flush_triggers()
+            if errors:
+                raise TriggerError(errors)
+            if not model.validate():
+                raise ValidationError('Invalid model: {}', model)
+            persistors[id(persistor)] = persistor
+            groups = updates if model.persisted else inserts
+            groups.setdefault(id(persistor), []).append(
+                (model, model.stored_merged_attribute_data))
+        transaction_ids = set()
+        results = []
+        transactions = self._transactions
+        try:
+            for groups in (inserts, updates):
+                for persistor_id, group in groups.items():
+                    persistor = persistors[persistor_id]
+                    transaction = persistor.transaction
+                    if transaction is not None:
+                        transaction_ids.add(id(transaction))
+                        transactions.setdefault(id(transaction),
+                            (transaction, {}))
+                    results.extend(zip(group, persistor.persist_many(
+                        merged_attribute_data
+                        for _, merged_attribute_data in group
+                    )))
+                    stats.group_count += 1
+        except Exception:
+            self.rollback()
+            raise
+        for (model, merged_attribute_data), key_attribute_data in results:
+            if model.persisted:
+                stats.updated_count += 1
+            else:
+                stats.inserted_count += 1
+            model._mark_persisted(merged_attribute_data, key_attribute_data)
+            journal = model.journal
+            transaction = model.persistor.transaction
+            if journal is not None and transaction is not None:
+                transactions[id(transaction)][1].setdefault(id(journal),
+                    journal)
+        stats.connection_count = len(transaction_ids)
+        stats.elapsed = time.time() - started_at
+        self.stats = stats
+        return stats
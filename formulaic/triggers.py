@@ -1,25 +1,91 @@
 __all__ = ('Trigger',)
 
 
+import threading
+
+
+# guards the lazy creation of the (shared) executors
+_executor_lock = threading.Lock()
+
+
 class Trigger(object):
     """
     Class representing hooks/handlers to be "triggered" based on one or more
-    `Attribute` value(s) being set/updated
+    `Attribute` value(s) being set/updated. By default the handler runs
+    synchronously, when the `Attribute` value is set. A deferred `Trigger`
+    queues the handler on the `Model` until `persist` or `flush_triggers` is
+    called. A `Trigger` with an `executor` dispatches the handler to it. Both
+    kinds share a single queue per `Model`, as such its handlers run one at a
+    time and in the order they were queued (a dispatched handler queued after
+    a deferred one waits for the flush). In both cases the errors raised by
+    the handlers are collected (see: `Model.flush_triggers`)
 
     Instance Attributes:
         attribute_names (set of str): the attribute-names upon which the
             `Trigger` is based
+        deferred (bool): if the handler should be queued until `persist` or
+            `flush_triggers` is called
+        executor (lazy-concurrent.futures.Executor, stored as `_executor`): the
+            executor the handler is dispatched to (`None` if the handler is not
+            dispatched)
         handler (callable): the handler instance
+        max_workers (int): the number of threads of the (lazily created)
+            executor, if an `int` was provided as the `executor`
     """
     def __init__(
         self,
         attribute_names,
-        handler
+        handler,
+        deferred=False,
+        executor=None
     ):
         assert(attribute_names)
         self.attribute_names = frozenset(attribute_names)
         assert(handler)
         self.handler = handler
+        assert(not (deferred and executor))
+        self.deferred = deferred
+        if isinstance(executor, int):
+            self.max_workers = executor
+        else:
+            self.max_workers = None
+            self._executor = executor
+
+    @property
+    def executor(self):
+        """
+        Lazy-load and return the executor (a bounded thread-pool is created on
+        first use if `max_workers` was provided)
+
+        Returns:
+            concurrent.futures.Executor: the executor (or `None`)
+
+        Raises:
+            RuntimeError: if the `concurrent.futures` library was not
+                successfully loaded
+        """
+        if not hasattr(self, '_executor'):
+            with _executor_lock:
+                if not hasattr(self, '_executor'):
+                    # imported on first use, it is costly to import
+                    try:
+                        from concurrent import futures
+                    except Exception:
+                        raise RuntimeError
+                    self._executor = futures.ThreadPoolExecutor(
+                        max_workers=self.max_workers)
+        return self._executor
+
+    @property
+    def immediate(self):
+        """
+        Get if the handler runs synchronously, when the `Attribute` value is set
+
+        Returns:
+            bool: the result
+        """
+        return not self.deferred and self.max_workers is None and \
+            self._executor is None
 
     def trigger(
         self,
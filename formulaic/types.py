@@ -1,11 +1,23 @@
-__all__ = ('Type',)
+__all__ = (
+    'FrozenList',
+    'InternPool',
+    'Type',
+)
 
 
-import six
+import sys
 
 
-if six.PY3:
+if sys.version_info[0] >= 3:
     long = int
+    integer_types = (int,)
+    string_types = (str,)
+    text_type = str
+else:
+    long = long  # noqa: F821
+    integer_types = (int, long)  # noqa: F821
+    string_types = (basestring,)  # noqa: F821
+    text_type = unicode  # noqa: F821
 
 
 class Type(object):
@@ -25,9 +37,129 @@ class Type(object):
     BOOLEAN = bool
     DICTIONARY = dict
     FLOAT = float
-    INTEGER = six.integer_types
+    INTEGER = integer_types
     LIST = list
     LONG = long
-    STRING = six.string_types
-    TEXT = six.text_type
-    UUID = six.string_types
+    STRING = string_types
+    TEXT = text_type
+    UUID = string_types
+
+
+class FrozenList(list):
+    """
+    Class representing an immutable `list`. It is still a `list` (so it
+    formats, validates and serializes as one) but any attempt to mutate it in
+    place raises a `TypeError`, as such it can be shared safely; a changed
+    value must be assigned as a _new_ `list`. Unlike a `list` it is hashable
+    (if its items are), the hash is computed once and cached
+    """
+    __slots__ = ('_hash',)
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError('{} is immutable'.format(type(self).__name__))
+
+    append = _immutable
+    clear = _immutable
+    extend = _immutable
+    insert = _immutable
+    pop = _immutable
+    remove = _immutable
+    reverse = _immutable
+    sort = _immutable
+    __delitem__ = _immutable
+    __delslice__ = _immutable
+    __iadd__ = _immutable
+    __imul__ = _immutable
+    __setitem__ = _immutable
+    __setslice__ = _immutable
+
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = hash(tuple(self))
+            return self._hash
+
+    def __reduce__(self):
+        return (type(self), (list(self),))
+
+
+class InternPool(object):
+    """
+    Class representing a pool of (hashable) values in which equal values (of
+    the same type, e.g. `True` and `1` are pooled apart) are de-duplicated to
+    a single, shared instance. It is used by a "low
+    cardinality" `Attribute` (see: `Attribute.intern_pool`), as such every
+    `Model` holds the same instance of a repeated value and the common
+    "unchanged" check in `Attribute.changed` is an identity check. Once the
+    pool holds `max_size` values new values are returned as-is (and are not
+    pooled). The counters are not synchronized, they are approximate if the
+    pool is shared by multiple threads (the pooled values are not)
+
+    Instance Attributes:
+        hit_count (int): the number of values which were already pooled
+        max_size (int): the maximum number of pooled values (`None` if the
+            pool is not bounded)
+        miss_count (int): the number of values which were added to the pool
+        overflow_count (int): the number of values which were not pooled
+            because the pool was full (or they are not hashable)
+    """
+    __slots__ = ('_values', 'hit_count', 'max_size', 'miss_count',
+        'overflow_count')
+
+    def __init__(self, max_size=1024):
+        self.hit_count = 0
+        self.max_size = max_size
+        self.miss_count = 0
+        self.overflow_count = 0
+        self._values = {}
+
+    def clear(self):
+        """
+        Remove every pooled value and reset the counters
+        """
+        self._values.clear()
+        self.hit_count = self.miss_count = self.overflow_count = 0
+
+    def intern(self, value):
+        """
+        Get the pooled instance of the specified `value` (adding it to the
+        pool if it is not pooled yet and the pool is not full)
+
+        Args:
+            value (mixed): the value
+
+        Returns:
+            mixed: the pooled instance, or the `value` if it was not pooled
+        """
+        values = self._values
+        # equal values of different types (e.g. `1`, `1.0` and `True`) are
+        # not interchangeable
+        key = (type(value), value)
+        try:
+            pooled_value = values.get(key)
+        except TypeError:
+            self.overflow_count += 1
+            return value
+        if pooled_value is not None:
+            self.hit_count += 1
+            return pooled_value
+        if self.max_size is not None and len(values) >= self.max_size:
+            self.overflow_count += 1
+            return value
+        self.miss_count += 1
+        # `setdefault` is atomic, two threads pooling the same value at once
+        # get the same instance
+        return values.setdefault(key, value)
+
+    def __contains__(self, value):
+        return (type(value), value) in self._values
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return '{}(size={}, max_size={}, hits={}, misses={}, ' \
+            'overflows={})'.format(type(self).__name__, len(self._values),
+            self.max_size, self.hit_count, self.miss_count,
+            self.overflow_count)
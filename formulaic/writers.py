@@ -0,0 +1,456 @@
+__all__ = (
+    'WriterPersistor',
+    'WriterProcess',
+)
+
+
+import multiprocessing
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+
+from multiprocessing.connection import Client, Listener
+
+from six.moves import queue
+
+from .persistors import Persistor, SQLitePersistor, _attribute_codecs
+
+try:
+    import sqlite3
+except Exception:
+    sqlite3 = None
+
+
+def _serve(
+    database_file_path,
+    address,
+    authkey,
+    batch_size,
+    batch_timeout,
+    ready
+):
+    """
+    Run the writer: accept worker connections and apply their operations, in
+    batches, each batch in a single transaction. Once it is stopped, the
+    operations queued behind the stop (or received within `batch_timeout` of
+    it) are rejected, rather than left without a reply. This is a module-level
+    function so that it can be the target of the writer process
+
+    Args:
+        database_file_path (str): the database file-path
+        address (str): the address to listen on
+        authkey (bytes): the authentication key
+        batch_size (int): the maximum number of operations per transaction
+        batch_timeout (float): the maximum time (in seconds) to wait for more
+            operations before a transaction is committed
+        ready (multiprocessing.Event): set once the writer is listening
+    """
+    listener = Listener(address, authkey=authkey)
+    requests = queue.Queue()
+    ready.set()
+
+    def receive(connection):
+        # one reader thread per worker connection, the (single) writer thread
+        # is the only one which replies
+        try:
+            while True:
+                requests.put((connection, connection.recv()))
+        except (EOFError, OSError, IOError):
+            connection.close()
+
+    def accept():
+        while True:
+            try:
+                connection = listener.accept()
+            except Exception:
+                continue
+            thread = threading.Thread(target=receive, args=(connection,))
+            thread.daemon = True
+            thread.start()
+
+    def send(replies):
+        for worker_connection, reply in replies:
+            try:
+                try:
+                    worker_connection.send(reply)
+                except Exception:
+                    # the error could not be pickled
+                    worker_connection.send(('error', RuntimeError(repr(
+                        reply[1]))))
+            except (OSError, IOError):
+                pass
+
+    thread = threading.Thread(target=accept)
+    thread.daemon = True
+    thread.start()
+    # autocommit mode, transactions (and savepoints) are managed explicitly
+    connection = sqlite3.connect(database_file_path, isolation_level=None)
+    connection.execute('PRAGMA journal_mode=WAL')
+    persistors = {}
+    running = True
+    while running:
+        batch = [requests.get()]
+        deadline = time.time() + batch_timeout
+        while len(batch) < batch_size:
+            timeout = deadline - time.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(requests.get(timeout=timeout))
+            except queue.Empty:
+                break
+        replies = []
+        connection.execute('BEGIN')
+        for worker_connection, request in batch:
+            if not running:
+                replies.append((worker_connection, ('error', RuntimeError(
+                    'Writer stopped'))))
+                continue
+            if request[0] == 'stop':
+                running = False
+                replies.append((worker_connection, ('ok', None)))
+                continue
+            # a failed operation is rolled back alone, the rest of the batch
+            # is still committed
+            connection.execute('SAVEPOINT operation')
+            try:
+                result = _apply(connection, persistors, request)
+            except Exception as e:
+                connection.execute('ROLLBACK TO operation')
+                replies.append((worker_connection, ('error', e)))
+            else:
+                replies.append((worker_connection, ('ok', result)))
+            connection.execute('RELEASE operation')
+        connection.execute('COMMIT')
+        send(replies)
+    connection.close()
+    listener.close()
+    while True:
+        try:
+            worker_connection, _ = requests.get(timeout=batch_timeout)
+        except queue.Empty:
+            break
+        send([(worker_connection, ('error', RuntimeError('Writer stopped')))])
+
+
+def _apply(
+    connection,
+    persistors,
+    request
+):
+    """
+    Apply a single (worker) operation
+
+    Args:
+        connection (sqlite3.Connection): the connection of the writer
+        persistors (dict): the `SQLitePersistor` instances (key: `(table_name,
+            key_attribute_names, codecs)`)
+        request (tuple): a `(operation, table_name, key_attribute_names,
+            codecs, argument)` tuple, `codecs` is the pickled `Codec` of each
+            encoded attribute (see: `WriterPersistor`), or `None`
+
+    Returns:
+        mixed: the result of the operation
+
+    Raises:
+        ValueError: if the operation is not supported
+    """
+    operation, table_name, key_attribute_names, codecs, argument = request
+    # the `Codec(s)` are only unpickled the first time they are seen
+    key = (table_name, key_attribute_names, codecs)
+    persistor = persistors.get(key)
+    if persistor is None:
+        persistor = persistors[key] = SQLitePersistor(None, table_name,
+            key_attribute_names=key_attribute_names, connection=connection)
+        persistor.codecs = pickle.loads(codecs) if codecs is not None else {}
+    if operation == 'persist':
+        return persistor.persist(argument)
+    if operation == 'persist_many':
+        return persistor.persist_many(argument)
+    if operation == 'load':
+        return persistor.load(*argument)
+    raise ValueError('Unsupported operation: {}'.format(operation))
+
+
+class WriterProcess(object):
+    """
+    Class representing a dedicated (single) writer process for a SQLite DB.
+    Worker processes send their write operations (via `WriterPersistor`) over
+    a local socket (or named pipe) instead of contending for the SQLite write
+    lock. The writer batches the pending operations of every worker into a
+    single transaction (each operation within its own savepoint, so a failed
+    one does not affect the others) and replies once it is committed. The DB
+    is switched to WAL mode, as such readers are not blocked by the writer
+
+    Instance Attributes:
+        address (str): the address the writer listens on
+        authkey (bytes): the authentication key shared with the workers
+        batch_size (int): the maximum number of operations per transaction
+        batch_timeout (float): the maximum time (in seconds) to wait for more
+            operations before a transaction is committed
+        database_file_path (str): the database file-path
+        process (multiprocessing.Process): the writer process (`None` until
+            it is started)
+    """
+    def __init__(
+        self,
+        database_file_path,
+        address=None,
+        authkey=None,
+        batch_size=1000,
+        batch_timeout=0.002
+    ):
+        if address is None:
+            if sys.platform == 'win32':
+                address = r'\\.\pipe\formulaic-writer-%d-%d' % (os.getpid(),
+                    id(self))
+            else:
+                address = os.path.join(tempfile.mkdtemp(), 'writer.sock')
+        self.address = address
+        self.authkey = authkey if authkey is not None else os.urandom(16)
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.database_file_path = database_file_path
+        self.process = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def persistor(
+        self,
+        table_name,
+        key_attribute_name=None,
+        key_attribute_names=None,
+        attribute_metadata=None
+    ):
+        """
+        Create a `WriterPersistor` which sends its operations to this writer
+
+        Args:
+            table_name (str): the table name
+            key_attribute_name (str): the key-attribute name
+            key_attribute_names (iterable of str): the key-attribute names, in
+                primary-key (clustered) order
+            attribute_metadata (dict): the `Attribute` meta-data `dict` (key:
+                `attribute_name`), see: `WriterPersistor`
+
+        Returns:
+            WriterPersistor: the `WriterPersistor` instance
+        """
+        return WriterPersistor(self.address, table_name,
+            key_attribute_name=key_attribute_name,
+            key_attribute_names=key_attribute_names, authkey=self.authkey,
+            attribute_metadata=attribute_metadata)
+
+    def start(self):
+        """
+        Start the writer process and wait until it is listening
+
+        Raises:
+            RuntimeError: if the `sqlite3` library was not successfully loaded,
+                or the writer did not start
+        """
+        if sqlite3 is None:
+            raise RuntimeError
+        ready = multiprocessing.Event()
+        process = multiprocessing.Process(
+            target=_serve,
+            args=(self.database_file_path, self.address, self.authkey,
+                self.batch_size, self.batch_timeout, ready),
+        )
+        process.daemon = True
+        process.start()
+        while not ready.wait(0.1):
+            if not process.is_alive():
+                raise RuntimeError('Writer process exited: {}'.format(
+                    process.exitcode))
+        self.process = process
+
+    def stop(self, timeout=None):
+        """
+        Stop the writer process, once the operations queued before the stop
+        are committed (the ones queued behind it fail, see: `_serve`)
+
+        Args:
+            timeout (float): the maximum time (in seconds) to wait for it
+        """
+        if self.process is None:
+            return
+        connection = Client(self.address, authkey=self.authkey)
+        try:
+            connection.send(('stop', None, None, None, None))
+            connection.recv()
+        finally:
+            connection.close()
+        self.process.join(timeout)
+        self.process = None
+
+
+class WriterPersistor(Persistor):
+    """
+    Class providing methods for persisting input via a `WriterProcess`
+    (persistence occurs when the `persist` method is called on a `Model`
+    instance). Each operation is committed by the writer before it returns.
+    The connection to the writer is opened lazily (and re-opened in a forked
+    child), as such instances may be created before the workers are forked
+
+    Instance Attributes:
+        address (str): the address of the writer
+        attribute_metadata (dict): the `Attribute` meta-data `dict` (key:
+            `attribute_name`), see: `SQLPersistor`. The `Codec` of each
+            encoded attribute is sent (pickled once) with every operation, the
+            writer encodes and decodes the values with them. It is not pickled
+            with the `WriterPersistor` (the `Codec(s)` are)
+        authkey (bytes): the authentication key
+        key_attribute_names (tuple of str): the key-attribute names, in
+            primary-key (clustered) order
+        table_name (str): the table name
+    """
+    def __init__(
+        self,
+        address,
+        table_name,
+        key_attribute_name=None,
+        key_attribute_names=None,
+        authkey=None,
+        attribute_metadata=None
+    ):
+        assert(not (key_attribute_name and key_attribute_names))
+        self.address = address
+        self.attribute_metadata = attribute_metadata
+        self.authkey = authkey
+        self.key_attribute_names = tuple(key_attribute_names) if \
+            key_attribute_names else (key_attribute_name,) if \
+            key_attribute_name else ()
+        self.table_name = table_name
+        codecs = _attribute_codecs(attribute_metadata)
+        self._codecs = pickle.dumps(codecs, pickle.HIGHEST_PROTOCOL) if \
+            codecs else None
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def __getstate__(self):
+        # the lock and the connection are not shared with other processes and
+        # the `Attribute` meta-data can not be pickled (the `Codec(s)` are)
+        return {
+            attribute_name: attribute_value
+            for attribute_name, attribute_value in self.__dict__.items()
+            if attribute_name not in ('_connection', '_lock', '_pid',
+                'attribute_metadata')
+        }
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.attribute_metadata = None
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def close(self):
+        """
+        Close the connection to the writer (it is re-opened on next use)
+        """
+        with self._lock:
+            if self._pid == os.getpid():
+                self._connection.close()
+            self._pid = None
+
+    def column_name(self, attribute_name):
+        """
+        Convert an attribute-name to a column-name (as the writer does, see:
+        `SQLitePersistor`)
+
+        Args:
+            attribute_name (str): the attribute-name
+
+        Returns:
+            str: the column-name
+        """
+        return SQLitePersistor(None, self.table_name).column_name(
+            attribute_name)
+
+    def load(
+        self,
+        key_attributes,
+        attribute_names=None
+    ):
+        """
+        Load the attributes of the row identified by the specified
+        `key_attributes` (via the writer, as such every committed write is
+        visible)
+
+        Args:
+            key_attributes (dict): the key-attributes (every key-attribute must
+                be provided)
+            attribute_names (iterable of str): the attribute-names to load (if
+                omitted every column is loaded)
+
+        Returns:
+            dict: the attributes (key: `attribute_name`), or `None` if there is
+                no matching row
+        """
+        return self._request('load', (key_attributes,
+            list(attribute_names) if attribute_names is not None else None))
+
+    def persist(self, attributes):
+        """
+        Persist the specified `attributes` (committed by the writer)
+
+        Args:
+            attributes (dict): the attributes
+
+        Returns:
+            mixed: the mapped INSERT/UPSERT result (e.g. the generated key)
+        """
+        return self._request('persist', dict(attributes))
+
+    def persist_many(self, attributes_list):
+        """
+        Persist the specified `attributes_list` as a single operation
+        (committed by the writer)
+
+        Args:
+            attributes_list (iterable of dict): the attributes of each row
+
+        Returns:
+            list: the mapped INSERT/UPSERT result of each row (in order)
+        """
+        return self._request('persist_many', [
+            dict(attributes) for attributes in attributes_list
+        ])
+
+    def _request(
+        self,
+        operation,
+        argument
+    ):
+        """
+        Send an operation to the writer and wait for its (committed) result
+
+        Args:
+            operation (str): the operation
+            argument (mixed): the argument of the operation
+
+        Returns:
+            mixed: the result of the operation
+
+        Raises:
+            Exception: the error raised by the operation
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                # never share a connection inherited from the parent
+                self._connection = Client(self.address, authkey=self.authkey)
+                self._pid = os.getpid()
+            self._connection.send((operation, self.table_name,
+                self.key_attribute_names, self._codecs, argument))
+            status, result = self._connection.recv()
+        if status == 'error':
+            raise result
+        return result
@@ -0,0 +1,114 @@
+import pytest
+
+from formulaic import (
+    INVALID,
+    Attribute,
+    FloatAttribute,
+    FormatError,
+    Formatter,
+    IntegerAttribute,
+    InternPool,
+    ModelAttribute,
+    ModelListAttribute,
+    Model,
+    StringAttribute,
+    Type,
+)
+from formulaic.attributes import LazyModel, LazyModelList
+
+from .test_models import Item
+
+
+def test_try_formatters_return_invalid_instead_of_raising():
+    assert Formatter.try_integer('12') == 12
+    assert Formatter.try_integer('x') is INVALID
+    assert Formatter.try_float(None) is INVALID
+    assert Formatter.try_dictionary(1) is INVALID
+    assert Formatter.try_lower(1) is INVALID
+    with pytest.raises(FormatError):
+        Formatter.integer('x')
+
+
+def test_try_format_does_not_call_the_raising_formatter():
+    def formatter(value):
+        raise AssertionError('called')
+
+    attribute = IntegerAttribute()
+    attribute.formatter = formatter
+    assert attribute.try_format('x') is INVALID
+    assert attribute.try_format('7') == 7
+    assert FloatAttribute().try_format('1.5') == 1.5
+
+
+def test_try_format_guards_a_custom_formatter():
+    attribute = Attribute(formatter=int)
+    assert attribute.try_format('x') is INVALID
+    assert attribute.try_format('3') == 3
+
+
+def test_try_format_maps_list_items():
+    attribute = Attribute(formatter=Formatter.integer,
+        try_formatter=Formatter.try_integer, type=Type.LIST)
+    assert attribute.try_format(['1', 2]) == [1, 2]
+    assert attribute.try_format(['1', 'x']) is INVALID
+
+
+def test_model_attributes_try_format():
+    attribute = ModelAttribute(Item)
+    assert isinstance(attribute.try_format({'id': 1}), LazyModel)
+    assert attribute.try_format(1) is INVALID
+    with pytest.raises(FormatError):
+        attribute.format(1)
+    attribute = ModelListAttribute(Item)
+    assert isinstance(attribute.try_format([{'id': 1}]), LazyModelList)
+    assert attribute.try_format([1]) is INVALID
+
+
+def test_fingerprint_collision_is_detected_as_a_change():
+    attribute = Attribute(type=Type.LIST, fingerprint=True)
+    old_value = attribute.format([-1, 5])
+    new_value = attribute.format([-2, 5])
+    assert hash(old_value) == hash(new_value)
+    assert attribute.changed(old_value, new_value)
+    assert not attribute.changed(old_value, attribute.format([-1, 5]))
+    assert attribute.changed(old_value, attribute.format([-1, 5, 6]))
+
+
+def test_fingerprint_collision_is_tracked_by_the_model():
+    class Tagged(Model):
+        tags = Attribute(type=Type.LIST, fingerprint=True)
+
+    model = Tagged(tags=[-1, 5])
+    model.changed_attribute_data.clear()
+    model.tags = [-2, 5]
+    assert model.changed_attribute_data == {'tags': [-2, 5]}
+
+
+def test_intern_pool_pools_equal_values_of_the_same_type():
+    pool = InternPool(max_size=3)
+    value = ''.join(['a', 'b'])
+    assert pool.intern(value) is value
+    assert pool.intern(''.join(['a', 'b'])) is value
+    assert pool.intern(1) == 1
+    assert pool.intern(True) is True
+    assert type(pool.intern(1.0)) is float
+    assert (True in pool, 1.0 in pool, 2 in pool) == (True, False, False)
+    assert type(pool.intern(1.0)) is float
+    assert pool.intern([]) == []
+    assert (pool.hit_count, pool.miss_count, pool.overflow_count) == (1, 3, 3)
+    pool.clear()
+    assert len(pool) == 0
+
+
+def test_low_cardinality_attributes_share_the_formatted_values():
+    class Country(Model):
+        code = StringAttribute(low_cardinality=True)
+        name = StringAttribute(low_cardinality=2)
+
+    models = [Country(code=''.join(['u', 's'])) for _ in range(3)]
+    assert models[0].get_attribute_value('code') == 'us'
+    assert all(model.get_attribute_value('code') is models[0]
+        .get_attribute_value('code') for model in models)
+    assert Country.attribute_metadata['name'].intern_pool.max_size == 2
+    assert Country.attribute_metadata['code'].try_format(''.join(['c', 'a'])) \
+        is Country(code='ca').get_attribute_value('code')
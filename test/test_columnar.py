@@ -0,0 +1,91 @@
+import os
+
+import pytest
+
+from formulaic import (
+    BooleanAttribute,
+    ColumnarFile,
+    DictionaryAttribute,
+    FloatAttribute,
+    IntegerAttribute,
+    Model,
+    ModelAttribute,
+    StringAttribute,
+)
+from .test_models import Item
+
+
+class Listing(Model):
+    id = IntegerAttribute()
+    active = BooleanAttribute()
+    price = FloatAttribute()
+    title = StringAttribute()
+    extra = DictionaryAttribute()
+    item = ModelAttribute(Item)
+
+
+def _listing(id):
+    return Listing(id=id, active=id % 2 == 0, price=id / 2.0,
+        title=u'title-\u00e9-%d' % id, extra={'tag': id},
+        item={'id': id, 'qty': id})
+
+
+def test_write_and_read_the_rows(tmpdir):
+    file_path = os.path.join(str(tmpdir), 'listings.col')
+    rows = [_listing(id) for id in range(10)]
+    # a `None` value (null) of every kind, and a `dict` row
+    rows.append(Listing(id=10))
+    rows.append({'id': 11, 'title': 'x', 'extra': {}, 'active': False})
+    assert ColumnarFile.write(file_path, Listing, rows) == 12
+    assert os.listdir(str(tmpdir)) == ['listings.col']
+    with ColumnarFile(file_path, Listing) as columnar_file:
+        assert len(columnar_file) == 12
+        assert columnar_file.attribute_names == tuple(
+            Listing.attribute_metadata)
+        row = columnar_file[3]
+        assert (row.id, row.active, row.price, row.title) == (3, False, 1.5,
+            u'title-\u00e9-3')
+        assert row.get_attribute_value('extra') == {'tag': 3}
+        assert row.item == {'id': 3, 'qty': 3}
+        assert columnar_file[-2].merged_attribute_data == {'id': 10,
+            'active': None, 'price': None, 'title': None, 'extra': None,
+            'item': None}
+        assert columnar_file[-1].merged_attribute_data == {'id': 11,
+            'active': False, 'price': None, 'title': 'x', 'extra': {},
+            'item': None}
+        assert [row.id for row in columnar_file[8:]] == [8, 9, 10, 11]
+        assert [row.id for row in columnar_file] == list(range(12))
+        with pytest.raises(IndexError):
+            columnar_file[12]
+        with pytest.raises(AttributeError):
+            row.unknown
+
+
+def test_a_row_is_converted_to_a_read_only_model(tmpdir):
+    file_path = os.path.join(str(tmpdir), 'listings.col')
+    ColumnarFile.write(file_path, Listing, [_listing(1), Listing(id=2)])
+    with ColumnarFile(file_path, Listing) as columnar_file:
+        model = columnar_file[0].to_model()
+        assert model.read_only
+        assert model.get_attribute_value('title') == u'title-\u00e9-1'
+        assert model.get_attribute_value('item').get_attribute_value(
+            'qty') == 1
+        assert model.stored_attribute_data['extra'] == {'tag': 1}
+        model = columnar_file[1].to_model()
+        assert model.get_attribute_value('id') == 2
+        assert model.get_attribute_value('item') is None
+    with ColumnarFile(file_path) as columnar_file:
+        with pytest.raises(RuntimeError):
+            columnar_file[0].to_model()
+
+
+def test_an_invalid_file_or_value_is_rejected(tmpdir):
+    file_path = os.path.join(str(tmpdir), 'listings.col')
+    with pytest.raises(ValueError):
+        ColumnarFile.write(file_path, Listing, [Listing(id=2 ** 64)])
+    # nothing is left behind
+    assert os.listdir(str(tmpdir)) == []
+    with open(file_path, 'wb') as file:
+        file.write(b'NOTCOLUMNAR')
+    with pytest.raises(ValueError):
+        ColumnarFile(file_path)
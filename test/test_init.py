@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import formulaic
+
+
+def test_every_public_name_is_exported():
+    for name in formulaic.__all__:
+        value = getattr(formulaic, name)
+        assert getattr(sys.modules[formulaic._EXPORTS[name]], name) is value
+    assert set(formulaic.__all__) <= set(dir(formulaic))
+
+
+def test_an_unknown_name_raises_attribute_error():
+    with pytest.raises(AttributeError):
+        formulaic.Unknown
+    assert not hasattr(formulaic, '_Unknown')
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7),
+    reason='module `__getattr__` (PEP 562) is not supported')
+def test_a_submodule_is_imported_on_first_access():
+    output = subprocess.check_output([sys.executable, '-c', '; '.join([
+        'import sys',
+        'import formulaic',
+        'print(sorted(name for name in sys.modules if name.startswith('
+            '"formulaic.")))',
+        'formulaic.Model',
+        'print("formulaic.persistors" in sys.modules, "sqlite3" in '
+            'sys.modules)',
+    ])], cwd=os.path.dirname(os.path.dirname(formulaic.__file__)))
+    assert output.decode('utf-8').splitlines() == ['[]', 'False False']
@@ -0,0 +1,117 @@
+import os
+
+import pytest
+
+from formulaic import (
+    FileJournal,
+    IntegerAttribute,
+    Model,
+    Session,
+    SQLitePersistor,
+    StringAttribute,
+)
+from formulaic.attributes import LazyModel, LazyModelList
+
+
+class Item(Model):
+    id = IntegerAttribute()
+    name = StringAttribute()
+
+
+def _persistor(tmpdir):
+    persistor = SQLitePersistor(os.path.join(str(tmpdir), 'test.db'), 'Item',
+        key_attribute_name='id', attribute_metadata=Item.attribute_metadata)
+    persistor.create_table(Item.attribute_metadata)
+    return persistor
+
+
+def _journal(tmpdir):
+    directory_path = os.path.join(str(tmpdir), 'journal')
+    os.mkdir(directory_path)
+    return FileJournal(directory_path)
+
+
+def test_persist_is_journaled_once_committed(tmpdir):
+    persistor, journal = _persistor(tmpdir), _journal(tmpdir)
+    model = Item(id=1, name='a', persistor=persistor, journal=journal)
+    assert model.persist()
+    assert list(journal.read()) == []
+    persistor.connection.commit()
+    assert journal.commit(persistor.connection) == 1
+    assert [record['n'] for record in journal.read()] == [
+        {'id': 1, 'name': 'a'},
+    ]
+
+
+def test_rolled_back_persist_is_not_journaled(tmpdir):
+    persistor, journal = _persistor(tmpdir), _journal(tmpdir)
+    model = Item(id=1, name='a', persistor=persistor, journal=journal)
+    assert model.persist()
+    persistor.connection.rollback()
+    assert journal.rollback(persistor.connection) == 1
+    assert journal.commit() == 0
+    assert list(journal.read()) == []
+
+
+def test_session_journals_on_commit_only(tmpdir):
+    persistor, journal = _persistor(tmpdir), _journal(tmpdir)
+    session = Session([
+        Item(id=1, name='a', persistor=persistor, journal=journal),
+        Item(id=2, name='b', persistor=persistor, journal=journal),
+    ])
+    session.flush()
+    assert list(journal.read()) == []
+    session.rollback()
+    assert list(journal.read()) == []
+    assert persistor.count() == 0
+
+    model = Item(id=3, name='c', persistor=persistor, journal=journal)
+    session = Session([model])
+    session.flush()
+    model.name = 'd'
+    session.commit()
+    assert [(record['o'], record['n']) for record in journal.read()] == [
+        ({}, {'id': 3, 'name': 'c'}),
+        ({'name': 'c'}, {'name': 'd'}),
+    ]
+
+
+def test_failed_flush_discards_staged_records(tmpdir):
+    persistor, journal = _persistor(tmpdir), _journal(tmpdir)
+    session = Session([Item(id=1, name='a', persistor=persistor,
+        journal=journal)])
+    session.flush()
+    persistor.connection.execute('DROP TABLE Item')
+    session.add(Item(id=2, name='b', persistor=persistor, journal=journal))
+    with pytest.raises(Exception):
+        session.commit()
+    assert journal.commit() == 0
+    assert list(journal.read()) == []
+
+
+def test_nested_models_are_appended_as_raw_values(tmpdir):
+    journal = _journal(tmpdir)
+    journal.append({'id': 1}, {}, {'item': LazyModel(Item, Item(id=2,
+        name='b')), 'items': LazyModelList(Item, [{'id': 3}])})
+    record, = journal.read()
+    assert record['n'] == {
+        'item': {'id': 2, 'name': 'b'},
+        'items': [{'id': 3}],
+    }
+
+
+@pytest.mark.parametrize('records', [0, 2])
+def test_a_torn_record_is_truncated_on_recovery(tmpdir, records):
+    directory_path = str(tmpdir)
+    journal = FileJournal(directory_path)
+    for index in range(records):
+        journal.append({'id': index}, {}, {'name': 'a'})
+    journal.close()
+    segment_path = journal._segment_path(1)
+    with open(segment_path, 'ab') as segment:
+        segment.write(b'{"s":%d,"k":{"id"' % (records + 1))
+    journal = FileJournal(directory_path)
+    assert journal.append({'id': 9}, {}, {'name': 'b'}) == records + 1
+    journal.close()
+    assert [record['k'] for record in journal.read()] == [
+        {'id': index} for index in range(records)] + [{'id': 9}]
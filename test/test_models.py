@@ -0,0 +1,299 @@
+import binascii
+import os
+import pickle
+import subprocess
+import sys
+
+import pytest
+
+from formulaic import (
+    Attribute,
+    Constraint,
+    FieldError,
+    FileJournal,
+    IntegerAttribute,
+    Model,
+    ModelAttribute,
+    ModelListAttribute,
+    Session,
+    SQLitePersistor,
+    StringAttribute,
+    Trigger,
+)
+
+
+class Item(Model):
+    id = IntegerAttribute()
+    name = StringAttribute()
+    qty = IntegerAttribute()
+
+
+def test_try_build_reports_format_and_validation_errors():
+    class Checked(Model):
+        id = IntegerAttribute(required=True)
+        qty = IntegerAttribute()
+
+    model, errors = Checked.try_build({'qty': 'x'})
+    assert model is None
+    assert errors['qty'].code == FieldError.FORMAT
+    assert errors['id'].code == FieldError.INVALID
+    model, errors = Checked.try_build({'id': 1, 'qty': 2})
+    assert errors == {}
+    assert model.get_attribute_value('qty') == 2
+
+
+def test_try_build_validates_each_attribute_once():
+    calls = []
+
+    def validator(value):
+        calls.append(value)
+        return True
+
+    class Counted(Model):
+        id = Attribute(validator=validator)
+        qty = Attribute(validator=validator, default=5)
+
+    model, errors = Counted.try_build({'id': 1})
+    assert errors == {}
+    assert sorted(calls) == [1, 5]
+
+
+class Order(Model):
+    id = IntegerAttribute()
+    item = ModelAttribute(Item)
+    items = ModelListAttribute(Item)
+
+
+def _loaded_order(tmpdir, journal=None):
+    persistor = SQLitePersistor(os.path.join(str(tmpdir), 'test.db'), 'Orders',
+        key_attribute_name='id', attribute_metadata=Order.attribute_metadata)
+    persistor.create_table(Order.attribute_metadata)
+    Order(id=1, item={'id': 1, 'qty': 1}, items=[{'id': 2, 'qty': 2}],
+        persistor=persistor).persist()
+    persistor.connection.commit()
+    order = Order.load(persistor, id=1)
+    order.journal = journal
+    return order
+
+
+def test_validate_builds_changed_raw_children():
+    order = Order(id=1)
+    assert order.validate()
+    order.item = {'qty': 'x'}
+    assert not order.validate()
+    order.item = {'qty': '3'}
+    assert order.validate()
+    order.items = [{'qty': 1}, {'qty': 'x'}]
+    assert not order.validate()
+
+
+def test_editing_a_child_marks_the_parent_changed(tmpdir):
+    order = _loaded_order(tmpdir)
+    assert not order.changed_attribute_data
+    order.get_attribute_value('item').qty = 5
+    order.get_attribute_value('items')[0].qty = 6
+    assert sorted(order.changed_attribute_data) == ['item', 'items']
+    session = Session([order])
+    assert session.dirty == [order]
+    session.commit()
+    assert session.stats.updated_count == 1
+    loaded = Order.load(order.persistor, id=1)
+    assert loaded.get_attribute_value('item').get_attribute_value('qty') == 5
+    assert loaded.get_attribute_value('items')[0].get_attribute_value(
+        'qty') == 6
+
+
+def test_a_snapshot_keeps_the_children_from_before_an_edit(tmpdir):
+    order = _loaded_order(tmpdir)
+    order.get_attribute_value('item')
+    before = order.snapshot()
+    order.get_attribute_value('item').qty = 5
+    assert before.get_attribute_value('item').get_attribute_value('qty') == 1
+    with pytest.raises(AttributeError):
+        before.get_attribute_value('items')[0].qty = 7
+    clone = order.clone()
+    clone.get_attribute_value('item').qty = 8
+    assert order.get_attribute_value('item').get_attribute_value('qty') == 5
+
+
+def test_child_edits_are_journaled_as_raw_values(tmpdir):
+    directory_path = os.path.join(str(tmpdir), 'journal')
+    os.mkdir(directory_path)
+    journal = FileJournal(directory_path)
+    order = _loaded_order(tmpdir, journal)
+    order.get_attribute_value('item').qty = 5
+    assert order.persist()
+    journal.commit()
+    record, = journal.read()
+    assert record['o'] == {'item': {'id': 1, 'name': None, 'qty': 1}}
+    assert record['n'] == {'item': {'id': 1, 'name': None, 'qty': 5}}
+
+
+def test_deferred_and_dispatched_triggers_run_in_order():
+    log = []
+
+    def record(old_value, new_value, model):
+        log.append(new_value)
+
+    def fail(old_value, new_value, model):
+        raise ValueError(new_value)
+
+    class Triggered(Model):
+        a = IntegerAttribute()
+        b = IntegerAttribute()
+        c = IntegerAttribute()
+        on_a = Trigger(['a'], record, deferred=True)
+        on_b = Trigger(['b'], record, executor=1)
+        on_c = Trigger(['c'], fail, deferred=True)
+
+    model = Triggered()
+    model.b = 0
+    assert model.flush_triggers() == []
+    assert log == [0]
+    model.a = 1
+    model.b = 2
+    model.c = 3
+    model.a = 5
+    model.b = 9
+    errors = model.flush_triggers()
+    assert log == [0, 1, 2, 5, 9]
+    assert [(trigger, e.args) for trigger, e in errors] == [
+        (Triggered.on_c, (3,))]
+    assert model.flush_triggers() == []
+
+
+class Range(Model):
+    start = IntegerAttribute()
+    end = IntegerAttribute()
+    ordered = Constraint(['start', 'end'],
+        lambda start, end: start <= end, 'start is not after end')
+
+
+def test_try_build_reports_failed_constraints():
+    model, errors = Range.try_build({'start': 2, 'end': 1})
+    assert model is None
+    assert errors['ordered'].code == FieldError.CONSTRAINT
+    assert 'start is not after end' in errors['ordered'].message
+    # a constraint over an invalid attribute is not evaluated
+    model, errors = Range.try_build({'start': 'x', 'end': 1})
+    assert list(errors) == ['start']
+    model, errors = Range.try_build({'start': 1, 'end': 2})
+    assert errors == {}
+    assert model.constraint_results == {'ordered': True}
+    assert model.validate()
+
+
+def test_constraint_dependencies_are_checked_when_the_class_is_created():
+    assert Range.constraint_dependencies == {'start': ('ordered',),
+        'end': ('ordered',)}
+    with pytest.raises(AttributeError) as info:
+        class Broken(Model):
+            start = IntegerAttribute()
+            ordered = Constraint(['start', 'stop'],
+                lambda start, stop: start <= stop)
+    assert 'stop' in str(info.value)
+    assert 'Broken' in str(info.value)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_build_many_keeps_the_order_and_reports_failures(tmpdir, workers):
+    persistor = SQLitePersistor(os.path.join(str(tmpdir), 'test.db'), 'Item',
+        key_attribute_name='id', attribute_metadata=Item.attribute_metadata)
+    records = [{'id': id, 'qty': 'x' if id == 3 else id} for id in range(7)]
+    results = Item.build_many(records, workers=workers, chunk_size=2,
+        persistor=persistor)
+    assert [model is None for model, _ in results] == [False, False, False,
+        True, False, False, False]
+    assert isinstance(results[3][1], ValueError)
+    assert [model.get_attribute_value('qty') for model, _ in results
+        if model is not None] == [0, 1, 2, 4, 5, 6]
+    assert all(model.persistor is persistor for model, _ in results
+        if model is not None)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_validate_many_keeps_the_order_and_reports_failures(workers):
+    results = Item.validate_many([{'id': 1}, {'qty': 'x'}, {'id': 2}],
+        workers=workers, chunk_size=1)
+    assert [result for result, _ in results] == [True, False, True]
+    assert results[0][1] is None
+    assert isinstance(results[1][1], ValueError)
+
+
+def test_attribute_data_materializes_the_defaults():
+    import uuid
+
+    class Defaulted(Model):
+        name = StringAttribute()
+        kind = StringAttribute(default='x')
+        token = Attribute(default=lambda: uuid.uuid4().hex)
+
+    model = Defaulted(name='a')
+    assert model.stored_attribute_data == {'name': 'a'}
+    snapshot = model.snapshot()
+    attribute_data = model.attribute_data
+    assert attribute_data == {'name': 'a', 'kind': 'x',
+        'token': model.get_attribute_value('token')}
+    assert model.attribute_data is attribute_data
+    # the baseline shared with the snapshot is not changed
+    assert snapshot.stored_attribute_data == {'name': 'a'}
+    assert Defaulted().attribute_data['token'] != attribute_data['token']
+
+
+class Pickled(Model):
+    alpha = IntegerAttribute()
+    bravo = StringAttribute()
+    charlie = IntegerAttribute(default=lambda: 3)
+    delta = StringAttribute()
+    echo = IntegerAttribute()
+    foxtrot = StringAttribute()
+    golf = IntegerAttribute()
+    hotel = StringAttribute()
+
+
+@pytest.mark.parametrize('hash_seed', ['1', '2', '3'])
+def test_a_pickle_loads_in_a_process_with_another_hash_seed(hash_seed):
+    output = subprocess.check_output([sys.executable, '-c', '; '.join([
+        'import binascii, pickle',
+        'from test.test_models import Pickled',
+        # the order of the class `__dict__` is hash-seeded prior to Python 3.6
+        'Pickled._attribute_metadata = dict(reversed(list('
+            'Pickled.attribute_metadata.items())))',
+        'model = Pickled(alpha=1, bravo="b", echo=5, hotel="h")',
+        'model.get_attribute_value("charlie")',
+        'model.hotel = "i"',
+        'print(binascii.hexlify(pickle.dumps(model, 2)).decode("ascii"))',
+    ])], cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=dict(os.environ, PYTHONHASHSEED=hash_seed))
+    model = pickle.loads(binascii.unhexlify(output.strip()))
+    assert model.stored_attribute_data == {'alpha': 1, 'bravo': 'b',
+        'echo': 5, 'hotel': 'h'}
+    assert model.changed_attribute_data == {'hotel': 'i'}
+    assert model.get_attribute_value('charlie') == 3
+    assert model.get_attribute_value('hotel') == 'i'
+
+
+def test_page_loads_the_unselected_attributes_on_first_read(tmpdir):
+    persistor = SQLitePersistor(os.path.join(str(tmpdir), 'test.db'), 'Items',
+        key_attribute_name='id', attribute_metadata=Item.attribute_metadata)
+    persistor.create_table(Item.attribute_metadata)
+    persistor.persist_many({'id': id, 'name': str(id), 'qty': id} for id in
+        range(5))
+    models = Item.page(persistor, ['name'], limit=2)
+    assert [model.get_attribute_value('id') for model in models] == [0, 1]
+    statements = []
+    persistor.connection.set_trace_callback(statements.append)
+    model = models[1]
+    assert model.get_attribute_value('name') == '1'
+    assert statements == []
+    assert model.get_attribute_value('qty') == 1
+    assert len(statements) == 1
+    # an unread `Unloaded` value is not written back
+    model = Item.page(persistor, ['name'], after=model, limit=1)[0]
+    model.name = 'b'
+    assert model.persist()
+    persistor.connection.set_trace_callback(None)
+    assert [
+        (model.get_attribute_value('name'), model.get_attribute_value('qty'))
+        for model in Item.page(persistor, after={'id': 1})
+    ] == [('b', 2), ('3', 3), ('4', 4)]
@@ -0,0 +1,88 @@
+import io
+
+import pytest
+
+from formulaic import (
+    Attribute,
+    FormParser,
+    IntegerAttribute,
+    Model,
+    MultipartFormParser,
+    StringAttribute,
+    URLEncodedFormParser,
+)
+from formulaic.types import Type
+
+
+class Upload(Model):
+    name = StringAttribute()
+    qty = IntegerAttribute()
+    tags = Attribute(type=Type.LIST)
+    body = StringAttribute()
+
+
+def _chunks(body, size):
+    return [body[index:index + size] for index in range(0, len(body), size)]
+
+
+@pytest.mark.parametrize('size', [1, 3, 1000])
+def test_urlencoded_body_is_parsed_across_chunks(size):
+    body = b'name=J%C3%B6rg+W&skip=' + b'x' * 50 + b'&qty=7&tags=a&tags=b%26c'
+    model = URLEncodedFormParser.parse(Upload, _chunks(body, size))
+    assert model.get_attribute_value('name') == u'J\xf6rg W'
+    assert model.get_attribute_value('qty') == 7
+    assert model.get_attribute_value('tags') == ['a', 'b&c']
+
+
+def test_urlencoded_field_size_is_limited():
+    with pytest.raises(ValueError):
+        URLEncodedFormParser.parse(Upload, [b'name=', b'x' * 10],
+            max_field_size=5)
+    # the size of an unmapped field is not limited
+    model = URLEncodedFormParser.parse(Upload, [b'other=' + b'x' * 10],
+        max_field_size=5)
+    assert model.get_attribute_value('name') is None
+
+
+def _multipart(boundary, fields):
+    parts = [
+        b'--' + boundary + b'\r\nContent-Disposition: form-data; name="' +
+        name + b'"\r\n\r\n' + value + b'\r\n'
+        for name, value in fields
+    ]
+    return b''.join(parts) + b'--' + boundary + b'--\r\n'
+
+
+@pytest.mark.parametrize('size', [1, 7, 1000])
+def test_multipart_body_is_parsed_and_streamed_across_chunks(size):
+    body = _multipart(b'XyZ', [(b'name', b'a\r\nb'), (b'other', b'x' * 40),
+        (b'qty', b'3'), (b'body', b'--XyZ is not a delimiter')])
+    stream = io.BytesIO()
+    parser = FormParser.create(Upload, 'multipart/form-data; boundary=XyZ',
+        streams={'body': stream})
+    assert isinstance(parser, MultipartFormParser)
+    for chunk in _chunks(body, size):
+        parser.feed(chunk)
+    model = parser.close()
+    assert model.get_attribute_value('name') == 'a\r\nb'
+    assert model.get_attribute_value('qty') == 3
+    assert model.get_attribute_value('body') is None
+    assert stream.getvalue() == b'--XyZ is not a delimiter'
+
+
+def test_multipart_body_must_be_complete_and_within_limits():
+    body = _multipart(b'b', [(b'name', b'a')])
+    parser = MultipartFormParser(Upload, 'b')
+    parser.feed(body[:-6])
+    with pytest.raises(ValueError):
+        parser.close()
+    with pytest.raises(ValueError):
+        MultipartFormParser.parse(Upload, [body], 'b', max_body_size=10)
+
+
+def test_create_rejects_an_unsupported_content_type():
+    assert isinstance(FormParser.create(Upload,
+        'application/x-www-form-urlencoded; charset=utf-8'),
+        URLEncodedFormParser)
+    with pytest.raises(ValueError):
+        FormParser.create(Upload, 'application/json')
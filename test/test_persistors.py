@@ -0,0 +1,335 @@
+import os
+import sqlite3
+
+import pytest
+
+from formulaic import (
+    BooleanAttribute,
+    CachingPersistor,
+    Deferred,
+    DictionaryAttribute,
+    IntegerAttribute,
+    Model,
+    SQLitePersistor,
+    ShardedSQLitePersistor,
+    StringAttribute,
+)
+
+
+class Flag(Model):
+    id = IntegerAttribute()
+    flag = BooleanAttribute()
+    name = StringAttribute()
+
+
+class Tenanted(Model):
+    tenant_id = IntegerAttribute()
+    id = IntegerAttribute()
+    name = StringAttribute()
+
+
+def _persistor(tmpdir, model_class, **kwargs):
+    persistor = SQLitePersistor(os.path.join(str(tmpdir), 'test.db'),
+        model_class.__name__, attribute_metadata=model_class.attribute_metadata,
+        **kwargs)
+    persistor.create_table(model_class.attribute_metadata)
+    return persistor
+
+
+def test_persist_round_trips_bool_none_and_quotes(tmpdir):
+    persistor = _persistor(tmpdir, Flag, key_attribute_name='id')
+    for id, flag, name in (
+        (1, False, "it's"),
+        (2, True, None),
+        (3, None, '\'"; DROP TABLE Flag; --'),
+    ):
+        model = Flag(id=id, flag=flag, name=name, persistor=persistor)
+        assert model.persist()
+        loaded = Flag.load(persistor, id=id)
+        assert loaded.get_attribute_value('flag') is flag
+        assert loaded.get_attribute_value('name') == name
+    assert persistor.count(flag=False) == 1
+    assert persistor.count(flag=None) == 1
+
+
+def test_persist_and_persist_many_store_the_same_representation(tmpdir):
+    persistor = _persistor(tmpdir, Flag, key_attribute_name='id')
+    persistor.persist({'id': 1, 'flag': False, 'name': 'a'})
+    persistor.persist_many([{'id': 2, 'flag': False, 'name': 'b'}])
+    assert persistor.count(flag=False) == 2
+    assert persistor.count_by('flag') == {0: 2}
+
+
+def test_update_is_parameterized(tmpdir):
+    persistor = _persistor(tmpdir, Flag, key_attribute_name='id')
+    persistor.SUPPORTS_UPSERT = False
+    persistor.persist({'id': 1, 'flag': True, 'name': 'a'})
+    assert persistor.persist({'id': 1, 'flag': False,
+        'name': "o'brien"}) == {'id': 1}
+    assert persistor.load({'id': 1}) == {'id': 1, 'flag': 0,
+        'name': "o'brien"}
+
+
+@pytest.mark.parametrize('supports_upsert', [True, False])
+def test_persist_and_persist_many_upsert_with_and_without_upsert_support(
+    tmpdir,
+    supports_upsert
+):
+    persistor = _persistor(tmpdir, Tenanted,
+        key_attribute_names=('tenant_id', 'id'))
+    persistor.SUPPORTS_UPSERT = supports_upsert
+    assert persistor.persist({'tenant_id': 1, 'id': 1, 'name': 'a'}) == {
+        'tenant_id': 1, 'id': 1}
+    assert persistor.persist({'tenant_id': 1, 'id': 1, 'name': 'b'}) == {
+        'tenant_id': 1, 'id': 1}
+    assert persistor.persist({'tenant_id': 1, 'id': 1}) == {'tenant_id': 1,
+        'id': 1}
+    assert persistor.persist_many([
+        {'tenant_id': 1, 'id': 1, 'name': 'c'},
+        {'tenant_id': 1, 'id': 2, 'name': 'd'},
+        {'tenant_id': 1, 'id': 3},
+    ]) == [{'tenant_id': 1, 'id': id} for id in (1, 2, 3)]
+    assert persistor.count() == 3
+    assert [persistor.load({'tenant_id': 1, 'id': id})['name'] for id in
+        (1, 2, 3)] == ['c', 'd', None]
+
+
+def test_persist_upserts_a_composite_key_with_a_falsy_component(tmpdir):
+    persistor = _persistor(tmpdir, Tenanted,
+        key_attribute_names=('tenant_id', 'id'))
+    model = Tenanted(tenant_id=0, id=5, name='a', persistor=persistor)
+    assert model.persist()
+    model.name = 'b'
+    assert model.persist()
+    assert persistor.count() == 1
+    assert Tenanted.load(persistor, tenant_id=0, id=5).get_attribute_value(
+        'name') == 'b'
+
+
+def test_sharded_stream_merges_the_shards_in_key_order(tmpdir):
+    persistor = ShardedSQLitePersistor(
+        [os.path.join(str(tmpdir), 'shard%d.db' % index) for index in
+            range(3)],
+        'Flag', key_attribute_name='id',
+        attribute_metadata=Flag.attribute_metadata)
+    persistor.create_table(Flag.attribute_metadata)
+    persistor.persist_many({'id': id, 'flag': id % 2 == 0, 'name': str(id)}
+        for id in range(50))
+    persistor.commit()
+    assert len(set(persistor.shard_index({'id': id}) for id in range(50))) == 3
+    rows = list(persistor.stream(['name', 'flag'], chunk_size=4))
+    assert [row['name'] for row in rows] == [str(id) for id in range(50)]
+    assert rows[0] == {'name': '0', 'flag': True}
+    stream = persistor.stream(['id'], chunk_size=2)
+    assert [next(stream)['id'] for _ in range(3)] == [0, 1, 2]
+    stream.close()
+
+
+def _sharded(tmpdir, prefix, count, **kwargs):
+    persistor = ShardedSQLitePersistor(
+        [os.path.join(str(tmpdir), '%s%d.db' % (prefix, index)) for index in
+            range(count)],
+        'Flag', attribute_metadata=Flag.attribute_metadata, **kwargs)
+    persistor.create_table(Flag.attribute_metadata)
+    return persistor
+
+
+def test_sharded_persistor_rejects_a_keyless_table(tmpdir):
+    with pytest.raises(ValueError):
+        ShardedSQLitePersistor([os.path.join(str(tmpdir), 'shard.db')],
+            'Flag')
+    persistor = _sharded(tmpdir, 'shard', 2, key_attribute_name='id')
+    with pytest.raises(ValueError):
+        persistor.persist_many([{'id': 1}, {'name': 'a'}])
+
+
+def test_sharded_thread_writer_leaves_the_writes_pending(tmpdir):
+    persistor = _sharded(tmpdir, 'shard', 2, key_attribute_name='id')
+    assert persistor.transaction is persistor
+    persistor.persist_many({'id': id} for id in range(10))
+    persistor.rollback()
+    assert persistor.count() == 0
+    persistor.persist_many({'id': id} for id in range(10))
+    persistor.commit()
+    persistor.close()
+    assert persistor.count() == 10
+
+
+def test_sharded_process_writer_commits_every_write(tmpdir):
+    persistor = _sharded(tmpdir, 'shard', 2, key_attribute_name='id',
+        writer='process')
+    assert persistor.transaction is None
+    persistor.persist({'id': 0, 'name': 'a'})
+    # the shards are written by other processes (which would be locked out by
+    # a pending write)
+    assert persistor.persist_many({'id': id, 'name': str(id)} for id in
+        range(10)) == [{'id': id} for id in range(10)]
+    persistor.rollback()
+    assert [row['name'] for row in persistor.stream(['name'])] == [
+        str(id) for id in range(10)]
+
+
+def test_reshard_copies_and_reroutes_every_row(tmpdir):
+    persistor = _sharded(tmpdir, 'shard', 2, key_attribute_name='id')
+    persistor.persist_many({'id': id, 'flag': id % 2 == 0, 'name': str(id)}
+        for id in range(20))
+    persistor.commit()
+    resharded = persistor.reshard(
+        [os.path.join(str(tmpdir), 'reshard%d.db' % index) for index in
+            range(3)],
+        Flag.attribute_metadata, chunk_size=7)
+    resharded.close()
+    assert list(resharded.stream(['id', 'flag', 'name'])) == list(
+        persistor.stream(['id', 'flag', 'name']))
+    for index, shard in enumerate(resharded.shards):
+        ids = [row['id'] for row in shard.stream(['id'])]
+        assert ids
+        assert all(resharded.shard_index({'id': id}) == index for id in ids)
+    assert persistor.count() == 20
+
+
+def test_page_seeks_the_composite_key(tmpdir):
+    persistor = _persistor(tmpdir, Tenanted,
+        key_attribute_names=('tenant_id', 'id'))
+    persistor.persist_many({'tenant_id': tenant_id, 'id': id, 'name': str(id)}
+        for tenant_id in range(2) for id in range(5))
+    page = persistor.page(['name'], limit=3)
+    assert [(row['tenant_id'], row['id']) for row in page] == [(0, 0), (0, 1),
+        (0, 2)]
+    assert page[0] == {'tenant_id': 0, 'id': 0, 'name': '0'}
+    page = persistor.page(['name'], after=page[-1], limit=4)
+    assert [(row['tenant_id'], row['id']) for row in page] == [(0, 3), (0, 4),
+        (1, 0), (1, 1)]
+    page = persistor.page(after={'tenant_id': 1, 'id': 1}, limit=2,
+        tenant_id=1, id__ne=3)
+    assert [row['id'] for row in page] == [2, 4]
+    assert persistor.page(after=page[-1], tenant_id=1) == []
+    persistor.commit()
+    with pytest.raises(ValueError):
+        _persistor(tmpdir, Flag).page()
+
+
+def test_sharded_page_merges_the_pages_of_the_shards(tmpdir):
+    persistor = _sharded(tmpdir, 'shard', 3, key_attribute_name='id')
+    persistor.persist_many({'id': id, 'name': str(id)} for id in range(20))
+    assert [row['id'] for row in persistor.page(['name'], after={'id': 4},
+        limit=5)] == [5, 6, 7, 8, 9]
+    assert persistor.page(['name'], limit=1, id=7) == [{'id': 7, 'name': '7'}]
+
+
+class Document(Model):
+    id = IntegerAttribute()
+    body = DictionaryAttribute()
+    flag = BooleanAttribute()
+
+
+def test_caching_persistor_caches_column_values(tmpdir):
+    persistor = CachingPersistor(_persistor(tmpdir, Document,
+        key_attribute_name='id'))
+    model = Document(id=1, body={'tags': ['a']}, flag=False,
+        persistor=persistor)
+    assert model.persist()
+    assert persistor.load({'id': 1}) is not None
+    model.get_attribute_value('body')['tags'].append('b')
+    first = Document.load(persistor, id=1)
+    second = Document.load(persistor, id=1)
+    assert persistor.hit_count == 2
+    assert first.get_attribute_value('body') == {'tags': ['a']}
+    assert first.get_attribute_value('flag') is False
+    first.get_attribute_value('body')['tags'].append('c')
+    assert second.get_attribute_value('body') == {'tags': ['a']}
+
+    model = Document(id=1, body={'tags': ['d']}, flag=True,
+        persistor=persistor)
+    assert model.persist()
+    model.get_attribute_value('body')['tags'].append('e')
+    loaded = Document.load(persistor, id=1)
+    assert persistor.hit_count == 3
+    assert loaded.get_attribute_value('body') == {'tags': ['d']}
+    assert loaded.get_attribute_value('flag') is True
+
+
+def test_caching_persistor_ignores_a_failed_write(tmpdir):
+    class FailingPersistor(SQLitePersistor):
+        def persist(self, attributes):
+            return None
+
+    failing = FailingPersistor(os.path.join(str(tmpdir), 'test.db'),
+        'Document', key_attribute_name='id',
+        attribute_metadata=Document.attribute_metadata)
+    failing.create_table(Document.attribute_metadata)
+    failing.connection.execute(
+        "INSERT INTO Document (id, body) VALUES (1, '{}')")
+    persistor = CachingPersistor(failing)
+    assert persistor.load({'id': 1}) is not None
+    assert persistor.persist({'id': 1, 'body': {'a': 1}}) is None
+    assert Document.load(persistor, id=1).get_attribute_value('body') == {}
+    assert persistor.hit_count == 1
+
+
+def test_loaded_attribute_data_is_resolved(tmpdir):
+    persistor = _persistor(tmpdir, Document, key_attribute_name='id')
+    assert Document(id=1, body={'a': 1}, flag=True,
+        persistor=persistor).persist()
+    loaded = Document.load(persistor, id=1)
+    assert isinstance(loaded.stored_attribute_data['body'], Deferred)
+    assert isinstance(loaded.stored_merged_attribute_data['body'], Deferred)
+    assert loaded.merged_attribute_data['body'] == {'a': 1}
+    loaded = Document.load(persistor, id=1)
+    assert loaded.attribute_data == {'id': 1, 'body': {'a': 1}, 'flag': True}
+    assert not any(isinstance(attribute_value, Deferred) for attribute_value
+        in loaded.stored_attribute_data.values())
+    loaded.flag = False
+    assert loaded.persist()
+    assert Document.load(persistor, id=1).attribute_data == {'id': 1,
+        'body': {'a': 1}, 'flag': False}
+
+
+class Indexed(Model):
+    id = IntegerAttribute()
+    email = StringAttribute(unique=True)
+    city = StringAttribute(index=True)
+    name = StringAttribute()
+
+
+def _index_names(persistor):
+    return sorted(row[0] for row in persistor.connection.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND "
+        "tbl_name = 'Indexed' AND sql IS NOT NULL"))
+
+
+def test_create_table_creates_the_secondary_indexes(tmpdir):
+    persistor = _persistor(tmpdir, Indexed, key_attribute_name='id')
+    assert _index_names(persistor) == ['IndexedCityIndex',
+        'IndexedEmailIndex']
+    persistor.persist({'id': 1, 'email': 'a@b', 'city': 'x'})
+    with pytest.raises(sqlite3.IntegrityError):
+        persistor.persist({'id': 2, 'email': 'a@b', 'city': 'y'})
+    # creating them again is a no-op
+    persistor.create_table(Indexed.attribute_metadata)
+    assert _index_names(persistor) == ['IndexedCityIndex',
+        'IndexedEmailIndex']
+
+
+def test_bulk_load_drops_and_rebuilds_the_indexes(tmpdir):
+    persistor = _persistor(tmpdir, Indexed, key_attribute_name='id')
+    with persistor.bulk_load(Indexed.attribute_metadata) as loader:
+        assert loader is persistor
+        assert _index_names(persistor) == []
+        loader.persist_many({'id': id, 'email': str(id), 'city': 'x'}
+            for id in range(10))
+    assert _index_names(persistor) == ['IndexedCityIndex',
+        'IndexedEmailIndex']
+    assert persistor.count(city='x') == 10
+
+
+def test_bulk_load_rolls_back_and_rebuilds_the_indexes_on_error(tmpdir):
+    persistor = _persistor(tmpdir, Indexed, key_attribute_name='id')
+    persistor.connection.commit()
+    with pytest.raises(RuntimeError):
+        with persistor.bulk_load(Indexed.attribute_metadata) as loader:
+            loader.persist_many([{'id': 1, 'email': 'a', 'city': 'x'}])
+            raise RuntimeError
+    assert persistor.count() == 0
+    assert _index_names(persistor) == ['IndexedCityIndex',
+        'IndexedEmailIndex']
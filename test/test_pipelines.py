@@ -0,0 +1,86 @@
+import io
+import json
+import os
+
+from formulaic import (
+    IntegerAttribute,
+    Model,
+    Pipeline,
+    SQLitePersistor,
+    ShardedSQLitePersistor,
+    StringAttribute,
+)
+
+
+class Contact(Model):
+    id = IntegerAttribute()
+    full_name = StringAttribute()
+    age = IntegerAttribute()
+
+
+def _persistor(tmpdir, file_name='test.db'):
+    persistor = SQLitePersistor(os.path.join(str(tmpdir), file_name),
+        'Contact', key_attribute_name='id',
+        attribute_metadata=Contact.attribute_metadata)
+    persistor.create_table(Contact.attribute_metadata)
+    return persistor
+
+
+def test_import_csv_maps_columns_and_rejects_invalid_records(tmpdir):
+    persistor = _persistor(tmpdir)
+    rejected, progress = [], []
+    pipeline = Pipeline(Contact, persistor, chunk_size=2,
+        rejects=lambda record, errors: rejected.append((record, errors)),
+        progress=lambda stats: progress.append(stats.read_count))
+    stats = pipeline.import_csv(io.StringIO(
+        u'id,FullName,age,ignored\n'
+        u'1,Ann,30,x\n'
+        u'2,Bob,old,x\n'
+        u'3,,41,x\n'))
+    assert (stats.read_count, stats.written_count, stats.rejected_count) == \
+        (3, 2, 1)
+    assert progress == [2, 3]
+    assert rejected[0][0]['id'] == '2'
+    assert list(rejected[0][1]) == ['age']
+    # the rows are committed
+    reader = _persistor(tmpdir)
+    assert reader.load({'id': 1}) == {'id': 1, 'full_name': 'Ann', 'age': 30}
+    assert reader.load({'id': 3}) == {'id': 3, 'full_name': None, 'age': 41}
+
+
+def test_ndjson_and_csv_round_trip(tmpdir):
+    source = _persistor(tmpdir, 'source.db')
+    stats = Pipeline(Contact, source).import_ndjson(io.StringIO(
+        u'{"id": 2, "full_name": "B", "age": 2}\n\n'
+        u'{"id": 1, "FullName": "A", "age": null}\n'))
+    assert stats.written_count == 2
+    ndjson = io.StringIO()
+    assert Pipeline(Contact, source).export_ndjson(ndjson).written_count == 2
+    assert [json.loads(line) for line in ndjson.getvalue().splitlines()] == [
+        {'id': 1, 'full_name': 'A', 'age': None},
+        {'id': 2, 'full_name': 'B', 'age': 2},
+    ]
+    csv_file = io.StringIO()
+    Pipeline(Contact, source).export_csv(csv_file)
+    csv_file.seek(0)
+    target = _persistor(tmpdir, 'target.db')
+    assert Pipeline(Contact, target).import_csv(csv_file).written_count == 2
+    assert list(target.stream(['id', 'full_name', 'age'])) == [
+        {'id': 1, 'full_name': 'A', 'age': None},
+        {'id': 2, 'full_name': 'B', 'age': 2},
+    ]
+
+
+def test_import_into_a_sharded_persistor(tmpdir):
+    persistor = ShardedSQLitePersistor(
+        [os.path.join(str(tmpdir), 'shard%d.db' % index) for index in
+            range(2)],
+        'Contact', key_attribute_name='id',
+        attribute_metadata=Contact.attribute_metadata)
+    persistor.create_table(Contact.attribute_metadata)
+    stats = Pipeline(Contact, persistor, chunk_size=3).import_records(
+        {'id': id, 'FullName': str(id)} for id in range(10))
+    assert stats.written_count == 10
+    persistor.close()
+    assert [row['full_name'] for row in persistor.stream(['full_name'])] == [
+        str(id) for id in range(10)]
@@ -0,0 +1,126 @@
+import os
+import sqlite3
+
+import pytest
+
+from formulaic import (
+    CachingPersistor,
+    IntegerAttribute,
+    Model,
+    Session,
+    SQLitePersistor,
+    ShardedSQLitePersistor,
+    StringAttribute,
+    ValidationError,
+    WriterProcess,
+)
+
+
+class Item(Model):
+    id = IntegerAttribute()
+    name = StringAttribute(required=True)
+
+
+class Tag(Model):
+    id = IntegerAttribute()
+    name = StringAttribute()
+
+
+def _persistor(database_file_path, model_class, connection=None):
+    persistor = SQLitePersistor(database_file_path, model_class.__name__,
+        key_attribute_name='id', connection=connection,
+        attribute_metadata=model_class.attribute_metadata)
+    persistor.create_table(model_class.attribute_metadata)
+    persistor.commit()
+    return persistor
+
+
+def _names(database_file_path, table_name):
+    connection = sqlite3.connect(database_file_path)
+    try:
+        return sorted(row[0] for row in connection.execute(
+            'SELECT Name FROM %s' % table_name))
+    finally:
+        connection.close()
+
+
+def test_commit_groups_the_writes_per_transaction(tmpdir):
+    database_file_path = os.path.join(str(tmpdir), 'test.db')
+    items = _persistor(database_file_path, Item)
+    tags = _persistor(database_file_path, Tag, items.connection)
+    item = Item(id=1, name='a', persistor=items)
+    session = Session([item, Item(name='b', persistor=items),
+        Tag(id=1, name='t', persistor=tags)])
+    stats = session.flush()
+    assert (stats.inserted_count, stats.group_count,
+        stats.connection_count) == (3, 2, 1)
+    assert _names(database_file_path, 'Item') == []
+    session.commit()
+    assert _names(database_file_path, 'Item') == ['a', 'b']
+    assert _names(database_file_path, 'Tag') == ['t']
+    assert session.dirty == []
+    item.name = 'c'
+    stats = session.commit()
+    assert (stats.inserted_count, stats.updated_count) == (0, 1)
+    assert _names(database_file_path, 'Item') == ['b', 'c']
+
+
+def test_an_invalid_model_fails_the_flush_before_any_write(tmpdir):
+    database_file_path = os.path.join(str(tmpdir), 'test.db')
+    items = _persistor(database_file_path, Item)
+    session = Session([Item(id=1, name='a', persistor=items),
+        Item(id=2, persistor=items)])
+    with pytest.raises(ValidationError):
+        session.commit()
+    assert _names(database_file_path, 'Item') == []
+
+
+def test_a_failed_write_rolls_back_every_transaction(tmpdir):
+    database_file_path = os.path.join(str(tmpdir), 'test.db')
+    items = _persistor(database_file_path, Item)
+    tags = _persistor(os.path.join(str(tmpdir), 'tags.db'), Tag)
+    tags.connection.execute('DROP TABLE Tag')
+    item = Item(id=1, name='a', persistor=items)
+    session = Session([item, Tag(id=1, name='t', persistor=tags)])
+    with pytest.raises(sqlite3.OperationalError):
+        session.commit()
+    assert not item.persisted
+    items.commit()
+    assert _names(database_file_path, 'Item') == []
+
+
+def test_commit_with_sharded_caching_and_writer_persistors(tmpdir):
+    sharded = ShardedSQLitePersistor(
+        [os.path.join(str(tmpdir), 'shard%d.db' % index) for index in
+            range(2)],
+        'Item', key_attribute_name='id',
+        attribute_metadata=Item.attribute_metadata)
+    sharded.create_table(Item.attribute_metadata)
+    caching = CachingPersistor(_persistor(os.path.join(str(tmpdir),
+        'cached.db'), Item))
+    writer_file_path = os.path.join(str(tmpdir), 'writer.db')
+    _persistor(writer_file_path, Item).connection.close()
+    with WriterProcess(writer_file_path) as writer:
+        written = writer.persistor('Item', key_attribute_name='id')
+        session = Session(
+            [Item(id=id, name=str(id), persistor=sharded) for id in range(4)] +
+            [Item(id=1, name='c', persistor=caching),
+                Item(id=1, name='w', persistor=written)])
+        stats = session.commit()
+        assert stats.inserted_count == 6
+        assert stats.connection_count == 2
+        written.close()
+    assert [row['name'] for row in sharded.stream(['name'])] == [
+        '0', '1', '2', '3']
+    assert _names(os.path.join(str(tmpdir), 'cached.db'), 'Item') == ['c']
+    assert _names(writer_file_path, 'Item') == ['w']
+
+
+def test_rollback_drops_the_rows_cached_by_the_flush(tmpdir):
+    caching = CachingPersistor(_persistor(os.path.join(str(tmpdir),
+        'test.db'), Item))
+    session = Session([Item(id=1, name='a', persistor=caching)])
+    session.flush()
+    assert caching.load({'id': 1}) is not None
+    session.rollback()
+    assert caching.load({'id': 1}) is None
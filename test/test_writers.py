@@ -0,0 +1,93 @@
+import os
+import pickle
+import time
+
+import pytest
+
+from multiprocessing.connection import Client
+
+from formulaic import (
+    DictionaryAttribute,
+    IntegerAttribute,
+    Model,
+    SQLitePersistor,
+    WriterProcess,
+)
+
+
+class Document(Model):
+    id = IntegerAttribute()
+    body = DictionaryAttribute()
+
+
+def _writer(tmpdir, **kwargs):
+    database_file_path = os.path.join(str(tmpdir), 'test.db')
+    persistor = SQLitePersistor(database_file_path, 'Document',
+        key_attribute_name='id', attribute_metadata=Document.attribute_metadata)
+    persistor.create_table(Document.attribute_metadata)
+    persistor.connection.commit()
+    persistor.connection.close()
+    return WriterProcess(database_file_path, **kwargs)
+
+
+def test_writer_persistor_encodes_and_decodes_with_the_codecs(tmpdir):
+    with _writer(tmpdir) as writer:
+        persistor = writer.persistor('Document', key_attribute_name='id',
+            attribute_metadata=Document.attribute_metadata)
+        try:
+            model = Document(id=1, body={'tags': ['a'], 'n': 1},
+                persistor=persistor)
+            assert model.persist()
+            assert persistor.persist_many([{'id': 2, 'body': {}}]) == [
+                {'id': 2}]
+            loaded = Document.load(persistor, id=1)
+            assert loaded.get_attribute_value('body') == {'tags': ['a'],
+                'n': 1}
+            assert Document.load(persistor, id=2).get_attribute_value(
+                'body') == {}
+            # the `Codec(s)` survive the trip to another process
+            copy = pickle.loads(pickle.dumps(persistor))
+            assert copy.attribute_metadata is None
+            assert Document.load(copy, id=1).get_attribute_value(
+                'body') == {'tags': ['a'], 'n': 1}
+            copy.close()
+        finally:
+            persistor.close()
+    reader = SQLitePersistor(os.path.join(str(tmpdir), 'test.db'),
+        'Document', key_attribute_name='id',
+        attribute_metadata=Document.attribute_metadata)
+    # the writer stored the encoded (JSON) value
+    assert Document.load(reader, id=1).get_attribute_value('body') == {
+        'tags': ['a'], 'n': 1}
+    reader.connection.close()
+
+
+@pytest.mark.parametrize('batch_size', [1, 3])
+def test_the_operations_queued_behind_a_stop_fail(tmpdir, batch_size):
+    writer = _writer(tmpdir, batch_size=batch_size, batch_timeout=0.5)
+    writer.start()
+    persistors = [writer.persistor('Document', key_attribute_name='id') for
+        _ in range(2)]
+    # the connections are opened (lazily) before the writer stops listening
+    assert [persistor.load({'id': 0}) for persistor in persistors] == [
+        None, None]
+    connection = Client(writer.address, authkey=writer.authkey)
+    try:
+        connection.send(('stop', None, None, None, None))
+        # the stop is received (by the reader thread of a new connection)
+        # before the operations are sent
+        time.sleep(0.2)
+        # in the batch of the stop (or queued behind it), never applied
+        for id, persistor in enumerate(persistors):
+            with pytest.raises(RuntimeError):
+                persistor.persist({'id': id})
+        assert connection.recv() == ('ok', None)
+    finally:
+        connection.close()
+        for persistor in persistors:
+            persistor.close()
+    writer.process.join()
+    reader = SQLitePersistor(writer.database_file_path, 'Document',
+        key_attribute_name='id')
+    assert reader.count() == 0
+    reader.connection.close()